@@ -4,4 +4,11 @@ set -o errexit
 set -o nounset
 set -o pipefail
 
+# Prometheus multiprocess mode: samples from every worker process are shared
+# through this directory, which must start out empty.
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+  rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+  mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
 exec watchfiles --filter python celery.__main__.main --args '-A core.celery_app worker --loglevel=info'
\ No newline at end of file
@@ -11,6 +11,13 @@ HOST=${HOST:-0.0.0.0}
 PORT=${PORT:-8000}
 DEV_RELOAD=${DEV_RELOAD:-1}
 
+# Prometheus multiprocess mode: samples from every worker process are shared
+# through this directory, which must start out empty.
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+  rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+  mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
 echo "Starting uvicorn (module=${APP_MODULE})"
 
 if [ "${DEV_RELOAD}" = "1" ]; then
@@ -0,0 +1,13 @@
+import secrets
+
+from fastapi import Header, HTTPException, status
+
+from core.settings import settings
+
+
+async def require_admin_token(x_admin_token: str = Header(default="")) -> None:
+    """Allow the request only if it carries the configured admin token."""
+    if not settings.ADMIN_API_TOKEN or not secrets.compare_digest(
+        x_admin_token, settings.ADMIN_API_TOKEN
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
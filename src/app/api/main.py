@@ -1,6 +1,10 @@
 from fastapi import APIRouter
 
+from api.routes.admin import admin_router
 from api.routes.home import home_router
+from api.routes.ledger import ledger_router
 
 api_router = APIRouter()
-api_router.include_router(home_router)
\ No newline at end of file
+api_router.include_router(home_router)
+api_router.include_router(admin_router)
+api_router.include_router(ledger_router)
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import HTMLResponse
+
+from api.deps import require_admin_token
+from auth.utils import password_hashing_pool
+from core.db import get_pool_status
+from core.logger import log_queue
+from core.profiling import profile_store
+from core.replicas import replica_router
+
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+@admin_router.get("/db/pool")
+async def read_db_pool_status():
+    return get_pool_status()
+
+@admin_router.get("/db/replicas")
+async def read_db_replica_status():
+    return replica_router.status()
+
+@admin_router.get("/logging")
+async def read_logging_status():
+    return {"async": log_queue is not None, **(log_queue.stats() if log_queue else {})}
+
+@admin_router.get("/password-hashing")
+async def read_password_hashing_status():
+    return password_hashing_pool.stats()
+
+
+@admin_router.get("/profiles")
+async def list_profiles():
+    return await profile_store.recent()
+
+@admin_router.get("/profiles/{profile_id}")
+async def read_profile(profile_id: str):
+    summary = await profile_store.get(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return summary
+
+@admin_router.get("/profiles/{profile_id}/flamegraph", response_class=HTMLResponse)
+async def read_profile_flamegraph(profile_id: str):
+    html = await profile_store.get_html(profile_id)
+    if html is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return HTMLResponse(html)
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+from core.health import ServiceStatus, health_checker
+
+health_router = APIRouter(tags=["health"])
+
+@health_router.get("/livez")
+async def livez():
+    return {"status": "alive"}
+
+@health_router.get("/startupz")
+async def startupz(request: Request):
+    if not health_checker.started:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "starting"})
+    return {"status": "started", "timings": getattr(request.app.state, "startup_report", None)}
+
+@health_router.get("/readyz")
+async def readyz():
+    ready, reason = health_checker.readiness()
+    if not ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "not_ready", "reason": reason},
+        )
+    return {"status": "ready"}
+
+@health_router.get("/health")
+async def health():
+    snapshot = health_checker.get_snapshot()
+    if snapshot is None:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": ServiceStatus.STARTING},
+        )
+    status_code = status.HTTP_200_OK if snapshot["status"] == ServiceStatus.HEALTHY else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=status_code, content=snapshot)
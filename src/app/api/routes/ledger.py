@@ -0,0 +1,116 @@
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.deps import require_admin_token
+from core.db import get_db_dependency
+from core.replicas import get_read_db, get_read_db_dependency
+from core.settings import settings
+from ledger.schema import (
+    BalanceReadSchema,
+    JournalEntryCreateSchema,
+    JournalEntryReadSchema,
+    LedgerAccountCreateSchema,
+    LedgerAccountReadSchema,
+    PostingHistoryPageSchema,
+    PostingReadSchema,
+    StatementFormatSchema,
+    TransferBatchCreateSchema,
+    TransferCreateSchema,
+    TransferResultSchema,
+    TransferStatusSchema,
+)
+from ledger.services import balance_shard_service, ledger_service, posting_history_service, transfer_service
+from ledger.services.history import to_csv, to_ndjson
+
+# Postings move money, so the ledger is an internal API until user auth exists.
+ledger_router = APIRouter(prefix="/ledger", dependencies=[Depends(require_admin_token)])
+
+@ledger_router.post("/accounts", response_model=LedgerAccountReadSchema, status_code=status.HTTP_201_CREATED)
+async def create_account(data: LedgerAccountCreateSchema, session: AsyncSession = Depends(get_db_dependency)):
+    account = await ledger_service.open_account(session, data)
+    await session.commit()
+    return account
+
+@ledger_router.get("/accounts/{account_id}", response_model=LedgerAccountReadSchema)
+async def read_account(account_id: uuid.UUID, session: AsyncSession = Depends(get_db_dependency)):
+    return await ledger_service.get_account(session, account_id)
+
+@ledger_router.get("/accounts/{account_id}/balance", response_model=BalanceReadSchema)
+async def read_balance(account_id: uuid.UUID, session: AsyncSession = Depends(get_db_dependency)):
+    return await ledger_service.get_balance(session, account_id)
+
+@ledger_router.get("/accounts/{account_id}/postings", response_model=PostingHistoryPageSchema)
+async def read_postings(
+    account_id: uuid.UUID,
+    limit: int = Query(default=settings.LEDGER_HISTORY_PAGE_SIZE, ge=1, le=settings.LEDGER_HISTORY_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_db_dependency),
+):
+    """Return the account's postings newest first, one keyset page at a time."""
+    account = await ledger_service.get_account(session, account_id)
+    return await posting_history_service.page(session, account, limit=limit, cursor=cursor)
+
+@ledger_router.get("/accounts/{account_id}/statement")
+async def export_statement(
+    account_id: uuid.UUID,
+    format: StatementFormatSchema = StatementFormatSchema.CSV,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    session: AsyncSession = Depends(get_read_db_dependency),
+):
+    """Stream every posting of the account, oldest first, as CSV or NDJSON."""
+    account = await ledger_service.get_account(session, account_id)
+
+    async def postings():
+        # The response outlives the request's session, so the export reads on its own.
+        async with get_read_db() as export_session:
+            async for chunk in posting_history_service.stream(export_session, account, since=since, until=until):
+                yield chunk
+
+    if format == StatementFormatSchema.NDJSON:
+        return StreamingResponse(to_ndjson(postings()), media_type="application/x-ndjson")
+    return StreamingResponse(
+        to_csv(postings()),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="statement-{account_id}.csv"'},
+    )
+
+@ledger_router.post("/accounts/{account_id}/roll-up", response_model=BalanceReadSchema)
+async def roll_up_balance(account_id: uuid.UUID, session: AsyncSession = Depends(get_db_dependency)):
+    """Fold a hot account's balance shards into its main balance now."""
+    await ledger_service.get_account(session, account_id)
+    await balance_shard_service.roll_up(session, account_id)
+    await session.commit()
+    return await ledger_service.get_balance(session, account_id)
+
+@ledger_router.post("/entries", response_model=JournalEntryReadSchema, status_code=status.HTTP_201_CREATED)
+async def create_entry(data: JournalEntryCreateSchema, session: AsyncSession = Depends(get_db_dependency)):
+    entry, postings = await ledger_service.post_entry(session, data)
+    await session.commit()
+    return JournalEntryReadSchema(
+        postings=[PostingReadSchema.model_validate(posting) for posting in postings],
+        **entry.model_dump(),
+    )
+
+@ledger_router.post("/transfers", response_model=TransferResultSchema, status_code=status.HTTP_201_CREATED)
+async def create_transfer(
+    data: TransferCreateSchema,
+    response: Response,
+    session: AsyncSession = Depends(get_db_dependency),
+):
+    result = await transfer_service.transfer(session, data)
+    if result.status == TransferStatusSchema.DUPLICATE:
+        response.status_code = status.HTTP_200_OK
+    return result
+
+@ledger_router.post("/transfers/batch", response_model=list[TransferResultSchema])
+async def create_transfer_batch(data: TransferBatchCreateSchema, session: AsyncSession = Depends(get_db_dependency)):
+    """Post up to LEDGER_TRANSFER_BATCH_MAX_SIZE transfers in one transaction.
+
+    Each transfer gets its own result; rejected ones are reported, not raised.
+    """
+    return await transfer_service.transfer_batch(session, data.transfers)
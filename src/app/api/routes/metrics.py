@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from core.celery_metrics import CeleryQueueCollector
+from core.metrics import build_registry
+
+metrics_router = APIRouter(tags=["metrics"])
+
+_queue_collector = CeleryQueueCollector()
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def read_metrics():
+    # Sync endpoint: the queue depth lookup talks to the broker with blocking I/O.
+    registry = build_registry()
+    output = generate_latest(registry) + generate_latest(_queue_collector.registry)
+    return Response(content=output, media_type=CONTENT_TYPE_LATEST)
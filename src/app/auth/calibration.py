@@ -0,0 +1,108 @@
+"""Benchmark the host and pick Argon2 parameters for a target verify latency.
+
+Run ``python -m auth.calibration --target-ms 250`` once on representative
+hardware and put the printed settings in the shared environment. Every API
+process must hash with the same parameters; calibrating per process gives
+each one different, noisy results.
+"""
+import argparse
+import os
+import statistics
+import time
+from dataclasses import dataclass
+
+from argon2 import PasswordHasher
+
+# OWASP minimum for Argon2id; calibration never goes below this.
+MIN_MEMORY_COST = 19456  # KiB
+MAX_TIME_COST = 10
+
+
+@dataclass(frozen=True)
+class Argon2Parameters:
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    verify_ms: float = 0.0
+
+    def as_env(self) -> dict[str, str]:
+        return {
+            "ARGON2_TIME_COST": str(self.time_cost),
+            "ARGON2_MEMORY_COST": str(self.memory_cost),
+            "ARGON2_PARALLELISM": str(self.parallelism),
+        }
+
+
+def measure_verify_ms(
+    time_cost: int, memory_cost: int, parallelism: int, samples: int = 3
+) -> float:
+    """Return the median time in milliseconds to verify a password."""
+    hasher = PasswordHasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    hashed = hasher.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify(hashed, "calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_argon2(
+    target_ms: float,
+    max_memory_cost: int,
+    parallelism: int | None = None,
+    samples: int = 3,
+) -> Argon2Parameters:
+    """Pick the strongest parameters whose verify time stays within ``target_ms``.
+
+    Memory is preferred over passes: the largest memory cost (halving down
+    from ``max_memory_cost``) that fits one pass is chosen first, then the
+    time cost is raised as far as the latency budget allows.
+    """
+    parallelism = parallelism or min(os.cpu_count() or 1, 4)
+    memory_cost = max(max_memory_cost, MIN_MEMORY_COST)
+
+    elapsed = measure_verify_ms(1, memory_cost, parallelism, samples)
+    while elapsed > target_ms and memory_cost // 2 >= MIN_MEMORY_COST:
+        memory_cost //= 2
+        elapsed = measure_verify_ms(1, memory_cost, parallelism, samples)
+
+    time_cost = 1
+    while time_cost < MAX_TIME_COST:
+        candidate = measure_verify_ms(time_cost + 1, memory_cost, parallelism, samples)
+        if candidate > target_ms:
+            break
+        time_cost += 1
+        elapsed = candidate
+
+    return Argon2Parameters(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        verify_ms=round(elapsed, 2),
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--max-memory", type=int, default=131072, help="KiB")
+    parser.add_argument("--parallelism", type=int, default=None)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    params = calibrate_argon2(
+        target_ms=args.target_ms,
+        max_memory_cost=args.max_memory,
+        parallelism=args.parallelism,
+        samples=args.samples,
+    )
+    print(f"# verify takes ~{params.verify_ms} ms on this host")
+    for key, value in params.as_env().items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from .lockout import LoginLockoutService, lockout_service
+from .onboarding import UserImportPipeline
+from .otp import OTPService, otp_service
+from .password import verify_user_password
+from .username import UsernameGenerator, username_generator
\ No newline at end of file
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+from redis.asyncio import Redis
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from auth.models import User
+from auth.schema import AccountStatusSchema
+from core.logger import get_logger
+from core.redis import get_redis
+from core.settings import settings
+
+logger = get_logger()
+
+
+class LoginLockoutService:
+    """Track failed logins in Redis and lock accounts after too many attempts.
+
+    Failed attempts are counted with an atomic INCR/EXPIRE, so a burst of
+    bad credentials never contends on the ``user`` row. Postgres is only
+    written when an account transitions to locked or back to active.
+    """
+
+    def __init__(self, redis: Redis | None = None):
+        self._redis = redis
+
+    @property
+    def redis(self) -> Redis:
+        return self._redis or get_redis()
+
+    @staticmethod
+    def _attempts_key(user: User) -> str:
+        return f"auth:lockout:attempts:{user.id}"
+
+    @staticmethod
+    def _locked_key(user: User) -> str:
+        return f"auth:lockout:locked:{user.id}"
+
+    async def is_locked(self, user: User) -> bool:
+        """Check whether the user is currently locked out."""
+        if await self.redis.exists(self._locked_key(user)):
+            return True
+        # Fall back to the row in case Redis lost its state mid-lockout.
+        if user.account_status == AccountStatusSchema.LOCKED and user.last_failed_login:
+            lockout_ends = user.last_failed_login + timedelta(minutes=settings.LOCKOUT_DURATION_MINUTES)
+            return datetime.now(timezone.utc) < lockout_ends
+        return False
+
+    async def register_failed_attempt(self, session: AsyncSession, user: User) -> bool:
+        """Record a failed login and lock the account once the limit is reached.
+
+        Args:
+            session (AsyncSession): Session used to persist the lock transition.
+            user (User): The user whose login failed.
+        Returns:
+            bool: True if the account is locked after this attempt.
+        """
+        if await self.redis.exists(self._locked_key(user)):
+            return True
+
+        attempts_key = self._attempts_key(user)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(attempts_key)
+            pipe.expire(attempts_key, settings.LOGIN_ATTEMPTS_WINDOW_MINUTES * 60, nx=True)
+            attempts, _ = await pipe.execute()
+
+        if attempts < settings.LOGIN_ATTEMPTS_LIMIT:
+            return False
+
+        # Only the caller that creates the lock key writes the row, so
+        # concurrent failures past the limit produce a single UPDATE.
+        acquired = await self.redis.set(
+            self._locked_key(user),
+            attempts,
+            ex=settings.LOCKOUT_DURATION_MINUTES * 60,
+            nx=True,
+        )
+        await self.redis.delete(attempts_key)
+        if acquired:
+            user.account_status = AccountStatusSchema.LOCKED
+            user.failed_login_attempts = min(attempts, 32767)
+            user.last_failed_login = datetime.now(timezone.utc)
+            session.add(user)
+            await session.commit()
+            logger.warning(f"User {user.id} locked out after {attempts} failed login attempts")
+        return True
+
+    async def register_successful_login(self, session: AsyncSession, user: User) -> None:
+        """Clear failed attempts and unlock the account if its lockout has expired.
+
+        A correct password does not lift an active lockout; callers are
+        expected to reject the login while ``is_locked`` is True.
+        """
+        if await self.is_locked(user):
+            return
+        await self.redis.delete(self._attempts_key(user))
+        if user.account_status == AccountStatusSchema.LOCKED or user.failed_login_attempts:
+            await self._reset_user(session, user)
+
+    async def unlock(self, session: AsyncSession, user: User) -> None:
+        """Lift a lockout immediately, e.g. from an administrator action."""
+        await self.redis.delete(self._attempts_key(user))
+        await self._reset_user(session, user)
+
+    async def _reset_user(self, session: AsyncSession, user: User) -> None:
+        # Clear the Redis lock with the row so is_locked agrees with it.
+        await self.redis.delete(self._locked_key(user))
+        if user.account_status == AccountStatusSchema.LOCKED:
+            user.account_status = AccountStatusSchema.ACTIVE
+            logger.info(f"User {user.id} unlocked")
+        user.failed_login_attempts = 0
+        session.add(user)
+        await session.commit()
+
+
+lockout_service = LoginLockoutService()
@@ -0,0 +1,282 @@
+"""Bulk user import from CSV or JSONL files.
+
+Rows are validated with ``UserCreateSchema`` in chunks, passwords are hashed
+in parallel on a dedicated pool and each chunk is written with a single
+``COPY`` into ``user``. A checkpoint file records progress after every chunk
+so an interrupted import can be resumed, and rejected rows are written to an
+error report next to the source file.
+
+Usage: ``python -m auth.services.onboarding customers.csv --resume``
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+from dataclasses import asdict, dataclass
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlmodel import col, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from auth.models import User
+from auth.schema import UserCreateSchema
+from auth.services.username import UsernameGenerator
+from auth.utils import PasswordHashingPool, hash_password
+from core.domain.exceptions import InvalidPasswordException
+from core.logger import get_logger
+
+logger = get_logger()
+
+USER_COLUMNS = [column.name for column in User.__table__.columns]  # type: ignore[attr-defined]
+
+
+@dataclass
+class ImportCheckpoint:
+    source: str
+    rows_done: int = 0
+    chunks_done: int = 0
+    imported: int = 0
+    rejected: int = 0
+
+    @classmethod
+    def load(cls, path: Path, source: str) -> "ImportCheckpoint":
+        if not path.exists():
+            return cls(source=source)
+        data = json.loads(path.read_text())
+        if data.get("source") != source:
+            raise ValueError(f"Checkpoint {path} belongs to {data.get('source')}, not {source}")
+        return cls(**data)
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(asdict(self)))
+        os.replace(tmp_path, path)
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    rejected: int = 0
+    chunks: int = 0
+
+
+def iter_rows(path: Path) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(line_number, row)`` pairs from a CSV or JSONL file."""
+    with path.open(newline="", encoding="utf-8") as handle:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                # Empty CSV cells mean "not provided", not an empty string.
+                yield reader.line_num, {k: v for k, v in row.items() if v not in ("", None)}
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield line_number, json.loads(line)
+
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def validate_rows(
+    rows: list[tuple[int, dict[str, Any]]],
+) -> tuple[list[tuple[int, UserCreateSchema]], list[dict[str, Any]]]:
+    """Split a chunk into validated schemas and per-row error entries."""
+    valid, errors = [], []
+    for line_number, row in rows:
+        try:
+            valid.append((line_number, UserCreateSchema.model_validate(row)))
+        except ValidationError as e:
+            errors.append({"line": line_number, "errors": e.errors(include_url=False, include_input=False)})
+        except InvalidPasswordException as e:
+            errors.append({"line": line_number, "errors": [{"msg": str(e)}]})
+    return valid, errors
+
+
+def _copy_value(value: Any) -> Any:
+    # Postgres enum types are created from member names, not values.
+    return value.name if isinstance(value, Enum) else value
+
+
+class UserImportPipeline:
+    """Stream users from a file into the database chunk by chunk."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        chunk_size: int = 1000,
+        hash_workers: int | None = None,
+        username_generator: UsernameGenerator | None = None,
+    ):
+        self.session = session
+        self.chunk_size = chunk_size
+        self.hashing_pool = PasswordHashingPool(
+            max_workers=hash_workers or os.cpu_count() or 1,
+            max_queue=chunk_size,
+            name="import",
+        )
+        self.username_generator = username_generator or UsernameGenerator(pool_size=chunk_size)
+        self._seen_emails: set[str] = set()
+        self._seen_id_nos: set[int] = set()
+        self._seen_usernames: set[str] = set()
+
+    async def _reject_duplicates(
+        self, valid: list[tuple[int, UserCreateSchema]]
+    ) -> tuple[list[tuple[int, UserCreateSchema]], list[dict[str, Any]]]:
+        """Drop rows that collide with each other, earlier chunks or existing users."""
+        emails = [schema.email for _, schema in valid]
+        id_nos = [schema.id_no for _, schema in valid]
+        usernames = [schema.username for _, schema in valid if schema.username]
+        result = await self.session.exec(
+            select(User.email, User.id_no, User.username).where(
+                or_(
+                    col(User.email).in_(emails),
+                    col(User.id_no).in_(id_nos),
+                    col(User.username).in_(usernames),
+                )
+            )
+        )
+        for email, id_no, username in result.all():
+            self._seen_emails.add(email)
+            self._seen_id_nos.add(id_no)
+            if username:
+                self._seen_usernames.add(username)
+
+        # Rows of this chunk are only remembered across chunks once it commits.
+        chunk_emails: set[str] = set()
+        chunk_id_nos: set[int] = set()
+        chunk_usernames: set[str] = set()
+        accepted, errors = [], []
+        for line_number, schema in valid:
+            duplicate = (
+                "email" if schema.email in self._seen_emails or schema.email in chunk_emails
+                else "id_no" if schema.id_no in self._seen_id_nos or schema.id_no in chunk_id_nos
+                else "username" if schema.username and (
+                    schema.username in self._seen_usernames or schema.username in chunk_usernames
+                )
+                else None
+            )
+            if duplicate:
+                errors.append({"line": line_number, "errors": [{"loc": [duplicate], "msg": "already exists"}]})
+                continue
+            chunk_emails.add(schema.email)
+            chunk_id_nos.add(schema.id_no)
+            if schema.username:
+                chunk_usernames.add(schema.username)
+            accepted.append((line_number, schema))
+        return accepted, errors
+
+    def _remember(self, valid: list[tuple[int, UserCreateSchema]]) -> None:
+        """Record a committed chunk's keys so later chunks reject repeats."""
+        for _, schema in valid:
+            self._seen_emails.add(schema.email)
+            self._seen_id_nos.add(schema.id_no)
+            if schema.username:
+                self._seen_usernames.add(schema.username)
+
+    async def _build_records(self, valid: list[tuple[int, UserCreateSchema]]) -> list[tuple]:
+        hashes = await asyncio.gather(
+            *(self.hashing_pool.run(hash_password, schema.password) for _, schema in valid)
+        )
+        missing = sum(1 for _, schema in valid if not schema.username)
+        usernames = iter(await self.username_generator.take(self.session, missing)) if missing else iter(())
+
+        records = []
+        for (_, schema), hashed_password in zip(valid, hashes):
+            user = User(
+                **schema.model_dump(exclude={"password", "confirm_password", "username"}),
+                username=schema.username or next(usernames),
+                hashed_password=hashed_password,
+            )
+            records.append(tuple(_copy_value(getattr(user, column)) for column in USER_COLUMNS))
+        return records
+
+    async def _copy_records(self, records: list[tuple]) -> None:
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            "user", records=records, columns=USER_COLUMNS
+        )
+
+    async def import_chunk(self, rows: list[tuple[int, dict[str, Any]]]) -> tuple[int, list[dict[str, Any]]]:
+        """Validate, hash and COPY one chunk; returns (imported, errors)."""
+        valid, errors = validate_rows(rows)
+        if valid:
+            valid, duplicate_errors = await self._reject_duplicates(valid)
+            errors.extend(duplicate_errors)
+        if not valid:
+            return 0, errors
+
+        records = await self._build_records(valid)
+        try:
+            await self._copy_records(records)
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Bulk import chunk failed: {e}")
+            errors.extend({"line": line_number, "errors": [{"msg": str(e)}]} for line_number, _ in valid)
+            return 0, errors
+        self._remember(valid)
+        return len(records), errors
+
+    async def run(self, path: Path, resume: bool = False) -> ImportReport:
+        """Import ``path``, resuming from its checkpoint file when requested."""
+        checkpoint_path = path.with_name(path.name + ".checkpoint.json")
+        errors_path = path.with_name(path.name + ".errors.jsonl")
+        checkpoint = (
+            ImportCheckpoint.load(checkpoint_path, str(path.resolve()))
+            if resume
+            else ImportCheckpoint(source=str(path.resolve()))
+        )
+        report = ImportReport(imported=checkpoint.imported, rejected=checkpoint.rejected)
+
+        rows = islice(iter_rows(path), checkpoint.rows_done, None)
+        try:
+            with errors_path.open("a" if resume else "w", encoding="utf-8") as errors_file:
+                for chunk in chunked(rows, self.chunk_size):
+                    imported, errors = await self.import_chunk(chunk)
+                    for error in errors:
+                        error["chunk"] = checkpoint.chunks_done
+                        errors_file.write(json.dumps(error, default=str) + "\n")
+                    errors_file.flush()
+
+                    checkpoint.rows_done += len(chunk)
+                    checkpoint.chunks_done += 1
+                    checkpoint.imported += imported
+                    checkpoint.rejected += len(errors)
+                    checkpoint.save(checkpoint_path)
+
+                    report.imported += imported
+                    report.rejected += len(errors)
+                    report.chunks += 1
+                    logger.info(
+                        f"Imported chunk {checkpoint.chunks_done}: {imported} users, {len(errors)} rejected"
+                    )
+        finally:
+            self.hashing_pool.shutdown()
+        return report
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from core.db import get_db
+
+    async with get_db() as session:
+        pipeline = UserImportPipeline(session, chunk_size=args.chunk_size, hash_workers=args.workers)
+        report = await pipeline.run(Path(args.path), resume=args.resume)
+    print(f"imported={report.imported} rejected={report.rejected} chunks={report.chunks}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or JSONL.")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--resume", action="store_true")
+    asyncio.run(_main(parser.parse_args()))
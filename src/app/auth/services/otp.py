@@ -0,0 +1,111 @@
+import hashlib
+import hmac
+
+from redis.asyncio import Redis
+
+from auth.models import User
+from auth.utils import generate_random_otp
+from core.domain.exceptions import OTPRateLimitException
+from core.logger import get_logger
+from core.redis import get_redis
+from core.settings import settings
+
+logger = get_logger()
+
+
+class OTPService:
+    """Issue and verify one-time passwords without writing to the user row.
+
+    Codes are generated with ``secrets``, stored only as an HMAC digest with
+    a native Redis TTL, compared in constant time and consumed on first
+    successful use. Issue and verify events go to the audit log.
+    """
+
+    def __init__(self, redis: Redis | None = None):
+        self._redis = redis
+
+    @property
+    def redis(self) -> Redis:
+        return self._redis or get_redis()
+
+    @staticmethod
+    def _code_key(user: User) -> str:
+        return f"auth:otp:code:{user.id}"
+
+    @staticmethod
+    def _attempts_key(user: User) -> str:
+        return f"auth:otp:attempts:{user.id}"
+
+    @staticmethod
+    def _issued_key(user: User) -> str:
+        return f"auth:otp:issued:{user.id}"
+
+    @staticmethod
+    def _digest(user: User, code: str) -> str:
+        message = f"{user.id}:{code}".encode()
+        return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+    async def issue(self, user: User) -> str:
+        """Generate a new OTP for the user, replacing any outstanding code.
+
+        Args:
+            user (User): The user the code is issued to.
+        Returns:
+            str: The plain code, to be delivered out of band.
+        Raises:
+            OTPRateLimitException: If the user requested too many codes recently.
+        """
+        issued_key = self._issued_key(user)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(issued_key)
+            pipe.expire(issued_key, settings.OTP_ISSUE_WINDOW_MINUTES * 60, nx=True)
+            issued, _ = await pipe.execute()
+
+        if issued > settings.OTP_ISSUE_LIMIT:
+            logger.bind(audit=True).warning(f"OTP issue rate limit hit for user {user.id}")
+            raise OTPRateLimitException()
+
+        code = generate_random_otp()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._code_key(user), self._digest(user, code), ex=settings.OTP_EXPIRE_MINUTES * 60)
+            pipe.delete(self._attempts_key(user))
+            await pipe.execute()
+
+        logger.bind(audit=True).info(f"OTP issued for user {user.id}")
+        return code
+
+    async def verify(self, user: User, code: str) -> bool:
+        """Check a submitted OTP, consuming it on success.
+
+        After ``OTP_MAX_VERIFY_ATTEMPTS`` wrong guesses the outstanding code
+        is discarded and a new one must be issued.
+        """
+        code_key = self._code_key(user)
+        stored = await self.redis.get(code_key)
+        if stored is None:
+            return False
+
+        attempts_key = self._attempts_key(user)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(attempts_key)
+            pipe.expire(attempts_key, settings.OTP_EXPIRE_MINUTES * 60, nx=True)
+            attempts, _ = await pipe.execute()
+
+        if attempts > settings.OTP_MAX_VERIFY_ATTEMPTS:
+            await self.redis.delete(code_key, attempts_key)
+            logger.bind(audit=True).warning(f"OTP discarded after {attempts - 1} failed attempts for user {user.id}")
+            return False
+
+        if not hmac.compare_digest(stored, self._digest(user, code)):
+            logger.bind(audit=True).info(f"OTP verification failed for user {user.id}")
+            return False
+
+        # Deleting is the consume step: only one concurrent verifier wins.
+        if not await self.redis.delete(code_key):
+            return False
+        await self.redis.delete(attempts_key)
+        logger.bind(audit=True).info(f"OTP verified for user {user.id}")
+        return True
+
+
+otp_service = OTPService()
@@ -0,0 +1,40 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from auth.models import User
+from auth.utils import hash_password_async, password_needs_rehash, verify_password_async
+from core.domain.exceptions import PasswordHashingBusyException
+from core.logger import get_logger
+
+logger = get_logger()
+
+
+async def verify_user_password(
+    session: AsyncSession, user: User, plain_password: str
+) -> bool:
+    """Verify a user's password and transparently upgrade an outdated hash.
+
+    When the stored hash is weaker than the currently configured Argon2
+    parameters, the password is re-hashed and committed so that deployments
+    converge on stronger parameters as users log in.
+
+    Args:
+        session (AsyncSession): Session used to persist the upgraded hash.
+        user (User): The user attempting to log in.
+        plain_password (str): The password supplied by the user.
+    Returns:
+        bool: True if the password matches, False otherwise.
+    """
+    if not await verify_password_async(plain_password, user.hashed_password):
+        return False
+
+    if password_needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await hash_password_async(plain_password)
+            session.add(user)
+            await session.commit()
+            logger.info(f"Upgraded password hash parameters for user {user.id}")
+        except PasswordHashingBusyException:
+            # The login itself succeeded; the upgrade is retried next time.
+            logger.warning(f"Skipped password rehash for user {user.id}: hashing pool busy")
+
+    return True
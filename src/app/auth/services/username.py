@@ -0,0 +1,64 @@
+import asyncio
+from collections import deque
+
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from auth.models import User
+from auth.utils import generate_username
+from core.settings import settings
+
+
+class UsernameGenerator:
+    """Assign usernames from a per-process pool of pre-checked candidates.
+
+    Candidates are generated in batches and checked against ``user`` with a
+    single query, so assigning a username is a pop from the local pool and
+    the database is only consulted once per ``pool_size`` users.
+    """
+
+    def __init__(self, pool_size: int | None = None):
+        self.pool_size = pool_size or settings.USERNAME_POOL_SIZE
+        self._pool: deque[str] = deque()
+        self._reserved: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    async def _available_candidates(self, session: AsyncSession, count: int) -> list[str]:
+        candidates: set[str] = set()
+        while len(candidates) < count:
+            candidate = generate_username()
+            if candidate not in self._reserved:
+                candidates.add(candidate)
+
+        result = await session.exec(
+            select(User.username).where(col(User.username).in_(candidates))
+        )
+        taken = set(result.all())
+        return [candidate for candidate in candidates if candidate not in taken]
+
+    async def refill(self, session: AsyncSession, count: int | None = None) -> None:
+        """Top the pool up with at least ``count`` names known to be free."""
+        count = count or self.pool_size
+        while len(self._pool) < count:
+            for username in await self._available_candidates(session, count - len(self._pool)):
+                self._pool.append(username)
+                self._reserved.add(username)
+
+    async def take(self, session: AsyncSession, count: int) -> list[str]:
+        """Draw ``count`` unique usernames, refilling the pool as needed."""
+        async with self._lock:
+            if len(self._pool) < count:
+                await self.refill(session, max(count, self.pool_size))
+            usernames = [self._pool.popleft() for _ in range(count)]
+            self._reserved.difference_update(usernames)
+            return usernames
+
+    async def next(self, session: AsyncSession) -> str:
+        """Draw a single unused username."""
+        return (await self.take(session, 1))[0]
+
+
+username_generator = UsernameGenerator()
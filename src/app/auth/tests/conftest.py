@@ -5,7 +5,9 @@ from pathlib import Path
 # Add the parent directory to the path so we can import from auth
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import fakeredis
 import pytest
+import pytest_asyncio
 from datetime import datetime, timezone
 from sqlmodel import Session, SQLModel, create_engine
 from sqlalchemy.pool import StaticPool
@@ -34,6 +36,57 @@ def session_fixture(engine):
         yield session
 
 
+class RecordingSession:
+    """Minimal stand-in for AsyncSession that records writes."""
+
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    async def commit(self):
+        self.commits += 1
+
+
+class AsyncSessionAdapter:
+    """Expose a synchronous Session through the awaitable AsyncSession API."""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def exec(self, statement):
+        return self._session.exec(statement)
+
+    async def commit(self):
+        self._session.commit()
+
+    async def rollback(self):
+        self._session.rollback()
+
+
+@pytest.fixture
+def async_session(session):
+    """Fixture providing the SQLite session behind an async interface."""
+    return AsyncSessionAdapter(session)
+
+
+@pytest.fixture
+def recording_session():
+    """Fixture providing an async session double that counts commits."""
+    return RecordingSession()
+
+
+@pytest_asyncio.fixture
+async def redis_client():
+    """Fixture providing an isolated in-memory async Redis client."""
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.flushall()
+    await client.aclose()
+
+
 @pytest.fixture
 def sample_user_data():
     """Fixture providing sample user data for tests."""
@@ -0,0 +1,196 @@
+"""Tests for the bulk user import pipeline."""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from auth
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import csv
+import json
+
+import pytest
+from sqlalchemy import insert
+from sqlmodel import select
+
+from auth.models import User
+from auth.services.onboarding import (
+    USER_COLUMNS,
+    ImportCheckpoint,
+    UserImportPipeline,
+    iter_rows,
+    validate_rows,
+)
+from auth.utils import configure_password_hasher, verify_password
+
+
+def make_row(index: int, **overrides):
+    row = {
+        "email": f"customer{index}@example.com",
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "id_no": 1000 + index,
+        "security_question": "mothers_maiden_name",
+        "security_answer": "Smith",
+        "password": "Password123!",
+        "confirm_password": "Password123!",
+    }
+    row.update(overrides)
+    return row
+
+
+def write_jsonl(path: Path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return path
+
+
+class CapturingPipeline(UserImportPipeline):
+    """Pipeline that captures COPY records instead of talking to Postgres."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.copied = []
+
+    async def _copy_records(self, records):
+        self.copied.extend(records)
+
+
+class SQLitePipeline(UserImportPipeline):
+    """Pipeline that writes chunks into the test database in place of COPY.
+
+    Chunks whose number is in ``fail_chunks`` raise after their rows are
+    written, so the transaction has to be rolled back.
+    """
+
+    def __init__(self, *args, fail_chunks=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_chunks = set(fail_chunks)
+        self.chunk_number = 0
+
+    async def _copy_records(self, records):
+        self.chunk_number += 1
+        await self.session.exec(
+            insert(User).values([dict(zip(USER_COLUMNS, record)) for record in records])
+        )
+        if self.chunk_number in self.fail_chunks:
+            raise RuntimeError("COPY failed")
+
+
+@pytest.fixture(autouse=True)
+def fast_hasher():
+    """Use cheap Argon2 parameters so imports stay fast in tests."""
+    configure_password_hasher(time_cost=1, memory_cost=8192, parallelism=1)
+    yield
+    configure_password_hasher()
+
+
+class TestIterRows:
+    """Tests for iter_rows."""
+
+    def test_csv_drops_empty_cells(self, tmp_path):
+        """Test that empty CSV cells are treated as missing values."""
+        path = tmp_path / "users.csv"
+        with path.open("w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=["email", "middle_name"])
+            writer.writeheader()
+            writer.writerow({"email": "a@example.com", "middle_name": ""})
+
+        rows = list(iter_rows(path))
+
+        assert rows == [(2, {"email": "a@example.com"})]
+
+    def test_jsonl_skips_blank_lines(self, tmp_path):
+        """Test that JSONL rows keep their line numbers and skip blanks."""
+        path = tmp_path / "users.jsonl"
+        path.write_text('{"a": 1}\n\n{"a": 2}\n')
+
+        assert list(iter_rows(path)) == [(1, {"a": 1}), (3, {"a": 2})]
+
+
+class TestValidateRows:
+    """Tests for validate_rows."""
+
+    def test_invalid_rows_are_reported_by_line(self):
+        """Test that bad rows are reported and good rows are kept."""
+        rows = [
+            (1, make_row(1)),
+            (2, make_row(2, email="not-an-email")),
+            (3, make_row(3, confirm_password="Mismatch123!")),
+        ]
+
+        valid, errors = validate_rows(rows)
+
+        assert [line for line, _ in valid] == [1]
+        assert [error["line"] for error in errors] == [2, 3]
+
+
+class TestUserImportPipeline:
+    """Tests for UserImportPipeline."""
+
+    @pytest.mark.asyncio
+    async def test_imports_valid_rows_and_reports_errors(self, tmp_path, async_session):
+        """Test that valid rows become COPY records and bad rows go to the report."""
+        path = write_jsonl(tmp_path / "users.jsonl", [
+            make_row(1),
+            make_row(2, email="bad"),
+            make_row(3),
+            make_row(4, id_no=1001),
+        ])
+        pipeline = CapturingPipeline(async_session, chunk_size=2)
+
+        report = await pipeline.run(path)
+
+        assert report.imported == 2
+        assert report.rejected == 2
+        assert report.chunks == 2
+        errors = [json.loads(line) for line in (tmp_path / "users.jsonl.errors.jsonl").read_text().splitlines()]
+        assert [error["line"] for error in errors] == [2, 4]
+
+        record = dict(zip(USER_COLUMNS, pipeline.copied[0]))
+        assert record["email"] == "customer1@example.com"
+        assert record["security_question"] == "MOTHERS_MAIDEN_NAME"
+        assert record["username"]
+        assert verify_password("Password123!", record["hashed_password"])
+
+    @pytest.mark.asyncio
+    async def test_existing_users_are_rejected(self, tmp_path, async_session, create_test_user):
+        """Test that rows colliding with stored users are not copied."""
+        create_test_user(email="customer1@example.com", id_no=1)
+        path = write_jsonl(tmp_path / "users.jsonl", [make_row(1), make_row(2)])
+        pipeline = CapturingPipeline(async_session)
+
+        report = await pipeline.run(path)
+
+        assert report.imported == 1
+        assert report.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_chunks(self, tmp_path, async_session):
+        """Test that a resumed import continues after the checkpoint."""
+        path = write_jsonl(tmp_path / "users.jsonl", [make_row(i) for i in range(1, 6)])
+        checkpoint_path = tmp_path / "users.jsonl.checkpoint.json"
+        ImportCheckpoint(source=str(path.resolve()), rows_done=3, chunks_done=1, imported=3).save(checkpoint_path)
+        pipeline = CapturingPipeline(async_session, chunk_size=3)
+
+        report = await pipeline.run(path, resume=True)
+
+        assert [dict(zip(USER_COLUMNS, r))["id_no"] for r in pipeline.copied] == [1004, 1005]
+        assert report.imported == 5
+        assert json.loads(checkpoint_path.read_text())["rows_done"] == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_does_not_block_its_rows(self, tmp_path, async_session):
+        """Test that rows of a rolled-back chunk can still be imported later."""
+        path = write_jsonl(tmp_path / "users.jsonl", [
+            make_row(1, username="first"),
+            make_row(2),
+            make_row(1, username="first"),
+            make_row(2, email="customer2@example.com"),
+        ])
+        pipeline = SQLitePipeline(async_session, chunk_size=2, fail_chunks={1})
+
+        report = await pipeline.run(path)
+
+        assert report.imported == 2
+        assert report.rejected == 2
+        stored = (await async_session.exec(select(User.email, User.id_no).order_by(User.id_no))).all()
+        assert stored == [("customer1@example.com", 1001), ("customer2@example.com", 1002)]
@@ -0,0 +1,258 @@
+"""Tests for authentication services."""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from auth
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+from auth.calibration import MIN_MEMORY_COST, calibrate_argon2
+from auth.schema import AccountStatusSchema
+from auth.services import LoginLockoutService, OTPService, UsernameGenerator, verify_user_password
+from auth.utils import configure_password_hasher, hash_password, verify_password
+from core.domain.exceptions import OTPRateLimitException
+from core.settings import settings
+
+
+class TestVerifyUserPassword:
+    """Tests for verify_user_password."""
+
+    def teardown_method(self):
+        configure_password_hasher()
+
+    @pytest.mark.asyncio
+    async def test_wrong_password_does_not_write(self, customer_user, recording_session):
+        """Test that a failed verification never touches the session."""
+        customer_user.hashed_password = hash_password("CorrectPassword123!")
+        session = recording_session
+
+        assert await verify_user_password(session, customer_user, "Wrong123!") is False
+        assert session.commits == 0
+
+    @pytest.mark.asyncio
+    async def test_up_to_date_hash_is_not_rewritten(self, customer_user, recording_session):
+        """Test that a current hash is left untouched on login."""
+        hashed = hash_password("CorrectPassword123!")
+        customer_user.hashed_password = hashed
+        session = recording_session
+
+        assert await verify_user_password(session, customer_user, "CorrectPassword123!") is True
+        assert customer_user.hashed_password == hashed
+        assert session.commits == 0
+
+    @pytest.mark.asyncio
+    async def test_outdated_hash_is_upgraded_on_login(self, customer_user, recording_session):
+        """Test that a hash weaker than the settings is replaced after a successful login."""
+        configure_password_hasher(time_cost=1, memory_cost=MIN_MEMORY_COST, parallelism=1)
+        old_hash = hash_password("CorrectPassword123!")
+        customer_user.hashed_password = old_hash
+        configure_password_hasher()
+        session = recording_session
+
+        assert await verify_user_password(session, customer_user, "CorrectPassword123!") is True
+        assert customer_user.hashed_password != old_hash
+        assert "t=3" in customer_user.hashed_password
+        assert verify_password("CorrectPassword123!", customer_user.hashed_password)
+        assert session.commits == 1
+
+
+class TestCalibrateArgon2:
+    """Tests for calibrate_argon2."""
+
+    def test_never_goes_below_minimum_cost(self):
+        """Test that an unreachable target still yields the minimum parameters."""
+        params = calibrate_argon2(target_ms=0.001, max_memory_cost=MIN_MEMORY_COST, parallelism=1, samples=1)
+
+        assert params.time_cost == 1
+        assert params.memory_cost == MIN_MEMORY_COST
+        assert params.parallelism == 1
+
+    def test_as_env_keys(self):
+        """Test that calibrated parameters map onto settings names."""
+        params = calibrate_argon2(target_ms=0.001, max_memory_cost=MIN_MEMORY_COST, parallelism=1, samples=1)
+
+        assert set(params.as_env()) == {"ARGON2_TIME_COST", "ARGON2_MEMORY_COST", "ARGON2_PARALLELISM"}
+
+
+class TestLoginLockoutService:
+    """Tests for LoginLockoutService."""
+
+    @pytest.mark.asyncio
+    async def test_attempts_below_limit_do_not_write(self, customer_user, recording_session, redis_client):
+        """Test that failures under the limit are counted in Redis only."""
+        service = LoginLockoutService(redis_client)
+
+        with patch("auth.services.lockout.settings.LOGIN_ATTEMPTS_LIMIT", 3):
+            assert await service.register_failed_attempt(recording_session, customer_user) is False
+            assert await service.register_failed_attempt(recording_session, customer_user) is False
+
+        assert recording_session.commits == 0
+        assert await redis_client.get(f"auth:lockout:attempts:{customer_user.id}") == "2"
+        assert await redis_client.ttl(f"auth:lockout:attempts:{customer_user.id}") > 0
+
+    @pytest.mark.asyncio
+    async def test_reaching_limit_locks_once(self, customer_user, recording_session, redis_client):
+        """Test that reaching the limit writes the lock transition exactly once."""
+        service = LoginLockoutService(redis_client)
+
+        with patch("auth.services.lockout.settings.LOGIN_ATTEMPTS_LIMIT", 2):
+            results = [
+                await service.register_failed_attempt(recording_session, customer_user)
+                for _ in range(5)
+            ]
+
+        assert results == [False, True, True, True, True]
+        assert recording_session.commits == 1
+        assert customer_user.account_status == AccountStatusSchema.LOCKED
+        assert customer_user.failed_login_attempts == 2
+        assert customer_user.last_failed_login is not None
+        assert await service.is_locked(customer_user) is True
+
+    @pytest.mark.asyncio
+    async def test_successful_login_without_failures_does_not_write(self, customer_user, recording_session, redis_client):
+        """Test that a clean login leaves the user row alone."""
+        service = LoginLockoutService(redis_client)
+
+        await service.register_successful_login(recording_session, customer_user)
+
+        assert recording_session.commits == 0
+
+    @pytest.mark.asyncio
+    async def test_successful_login_during_lockout_keeps_lock(self, customer_user, recording_session, redis_client):
+        """Test that a correct password does not lift an active lockout."""
+        service = LoginLockoutService(redis_client)
+        with patch("auth.services.lockout.settings.LOGIN_ATTEMPTS_LIMIT", 1):
+            await service.register_failed_attempt(recording_session, customer_user)
+
+        await service.register_successful_login(recording_session, customer_user)
+
+        assert recording_session.commits == 1
+        assert customer_user.account_status == AccountStatusSchema.LOCKED
+        assert await service.is_locked(customer_user) is True
+
+    @pytest.mark.asyncio
+    async def test_successful_login_after_lockout_expires_unlocks(self, customer_user, recording_session, redis_client):
+        """Test that the first login after the lockout ends reactivates the user."""
+        service = LoginLockoutService(redis_client)
+        with patch("auth.services.lockout.settings.LOGIN_ATTEMPTS_LIMIT", 1):
+            await service.register_failed_attempt(recording_session, customer_user)
+        await redis_client.delete(f"auth:lockout:locked:{customer_user.id}")
+        customer_user.last_failed_login -= timedelta(minutes=settings.LOCKOUT_DURATION_MINUTES + 1)
+
+        await service.register_successful_login(recording_session, customer_user)
+
+        assert customer_user.account_status == AccountStatusSchema.ACTIVE
+        assert customer_user.failed_login_attempts == 0
+        assert await service.is_locked(customer_user) is False
+
+    @pytest.mark.asyncio
+    async def test_unlock_restores_account(self, customer_user, recording_session, redis_client):
+        """Test that unlock clears Redis state and reactivates the user."""
+        service = LoginLockoutService(redis_client)
+        with patch("auth.services.lockout.settings.LOGIN_ATTEMPTS_LIMIT", 1):
+            await service.register_failed_attempt(recording_session, customer_user)
+
+        await service.unlock(recording_session, customer_user)
+
+        assert customer_user.account_status == AccountStatusSchema.ACTIVE
+        assert customer_user.failed_login_attempts == 0
+        assert await service.is_locked(customer_user) is False
+
+
+class TestOTPService:
+    """Tests for OTPService."""
+
+    @pytest.mark.asyncio
+    async def test_issue_stores_digest_with_ttl(self, customer_user, redis_client):
+        """Test that only a digest of the code is stored, with an expiry."""
+        service = OTPService(redis_client)
+
+        code = await service.issue(customer_user)
+        stored = await redis_client.get(f"auth:otp:code:{customer_user.id}")
+
+        assert len(code) == 6 and code.isdigit()
+        assert stored is not None and code not in stored
+        assert await redis_client.ttl(f"auth:otp:code:{customer_user.id}") > 0
+
+    @pytest.mark.asyncio
+    async def test_verify_consumes_code(self, customer_user, redis_client):
+        """Test that a valid code verifies exactly once."""
+        service = OTPService(redis_client)
+        code = await service.issue(customer_user)
+
+        assert await service.verify(customer_user, code) is True
+        assert await service.verify(customer_user, code) is False
+
+    @pytest.mark.asyncio
+    async def test_wrong_code_is_rejected(self, customer_user, redis_client):
+        """Test that a wrong code fails without consuming the real one."""
+        service = OTPService(redis_client)
+        code = await service.issue(customer_user)
+        wrong = "000000" if code != "000000" else "111111"
+
+        assert await service.verify(customer_user, wrong) is False
+        assert await service.verify(customer_user, code) is True
+
+    @pytest.mark.asyncio
+    async def test_code_discarded_after_max_attempts(self, customer_user, redis_client):
+        """Test that too many wrong guesses invalidate the outstanding code."""
+        service = OTPService(redis_client)
+        code = await service.issue(customer_user)
+        wrong = "000000" if code != "000000" else "111111"
+
+        with patch("auth.services.otp.settings.OTP_MAX_VERIFY_ATTEMPTS", 2):
+            for _ in range(2):
+                assert await service.verify(customer_user, wrong) is False
+            assert await service.verify(customer_user, code) is False
+
+    @pytest.mark.asyncio
+    async def test_issue_is_rate_limited(self, customer_user, redis_client):
+        """Test that issuing beyond the per-user limit raises."""
+        service = OTPService(redis_client)
+
+        with patch("auth.services.otp.settings.OTP_ISSUE_LIMIT", 2):
+            await service.issue(customer_user)
+            await service.issue(customer_user)
+            with pytest.raises(OTPRateLimitException):
+                await service.issue(customer_user)
+
+
+class TestUsernameGenerator:
+    """Tests for UsernameGenerator."""
+
+    @pytest.mark.asyncio
+    async def test_take_returns_unique_usernames(self, async_session):
+        """Test that a batch draw yields distinct usernames."""
+        generator = UsernameGenerator(pool_size=20)
+
+        usernames = await generator.take(async_session, 50)
+
+        assert len(usernames) == 50
+        assert len(set(usernames)) == 50
+
+    @pytest.mark.asyncio
+    async def test_existing_usernames_are_skipped(self, async_session, create_test_user):
+        """Test that names already stored in the user table are never handed out."""
+        create_test_user(username="TAKEN-000001")
+        candidates = iter(["TAKEN-000001", "FREE-0000001", "FREE-0000002"])
+        generator = UsernameGenerator(pool_size=2)
+
+        with patch("auth.services.username.generate_username", lambda: next(candidates)):
+            usernames = await generator.take(async_session, 2)
+
+        assert sorted(usernames) == ["FREE-0000001", "FREE-0000002"]
+
+    @pytest.mark.asyncio
+    async def test_pool_serves_without_new_queries(self, async_session):
+        """Test that names are served from the pool after a refill."""
+        generator = UsernameGenerator(pool_size=10)
+        await generator.refill(async_session)
+
+        with patch.object(async_session, "exec", side_effect=AssertionError("unexpected query")):
+            for _ in range(10):
+                await generator.next(async_session)
+
+        assert len(generator) == 0
@@ -5,18 +5,27 @@ from pathlib import Path
 # Add the parent directory to the path so we can import from auth
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import asyncio
 import pytest
 import string
+import threading
 from unittest.mock import patch, MagicMock
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
+from prometheus_client import REGISTRY
 
 from auth.utils import (
+    PasswordHashingPool,
+    configure_password_hasher,
     generate_random_otp,
     hash_password,
+    hash_password_async,
+    password_needs_rehash,
     verify_password,
+    verify_password_async,
     generate_username
 )
+from core.domain.exceptions import PasswordHashingBusyException
 
 
 class TestGenerateRandomOTP:
@@ -207,3 +216,130 @@ class TestGenerateUsername:
             mock_settings.SITE_NAME = site_name
             username = generate_username()
             assert username.startswith(expected_prefix)
+
+
+class TestAsyncPasswordHashing:
+    """Tests for hash_password_async and verify_password_async."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_async(self):
+        """Test that async hashing round-trips through async verification."""
+        hashed = await hash_password_async("AsyncPassword123!")
+
+        assert hashed.startswith("$argon2")
+        assert await verify_password_async("AsyncPassword123!", hashed) is True
+        assert await verify_password_async("WrongPassword456!", hashed) is False
+
+    @pytest.mark.asyncio
+    async def test_async_hash_verifies_with_sync_api(self):
+        """Test that hashes produced on the pool are compatible with verify_password."""
+        hashed = await hash_password_async("AsyncPassword123!")
+        assert verify_password("AsyncPassword123!", hashed) is True
+
+
+class TestPasswordHashingPool:
+    """Tests for the bounded PasswordHashingPool."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self):
+        """Test that calls beyond workers + queue are rejected."""
+        pool = PasswordHashingPool(max_workers=1, max_queue=0)
+        release = threading.Event()
+        try:
+            blocked = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0)
+
+            with pytest.raises(PasswordHashingBusyException):
+                await pool.run(lambda: None)
+
+            release.set()
+            await blocked
+            assert pool.stats()["rejected"] == 1
+        finally:
+            release.set()
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_stats_report_queue_depth(self):
+        """Test that queued calls are reported separately from active ones."""
+        pool = PasswordHashingPool(max_workers=1, max_queue=2)
+        release = threading.Event()
+        try:
+            tasks = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(3)]
+            await asyncio.sleep(0)
+
+            stats = pool.stats()
+            assert stats["in_flight"] == 3
+            assert stats["active"] == 1
+            assert stats["queued"] == 2
+
+            release.set()
+            await asyncio.gather(*tasks)
+            stats = pool.stats()
+            assert stats["in_flight"] == 0
+            assert stats["completed"] == 3
+        finally:
+            release.set()
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_is_exported(self):
+        """Test that in-flight, queued and rejected calls reach Prometheus."""
+        pool = PasswordHashingPool(max_workers=1, max_queue=1, name="metrics-test")
+        labels = {"pool": "metrics-test"}
+        release = threading.Event()
+        try:
+            tasks = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(PasswordHashingBusyException):
+                await pool.run(lambda: None)
+
+            assert REGISTRY.get_sample_value("password_hash_in_flight", labels) == 2
+            assert REGISTRY.get_sample_value("password_hash_queued", labels) == 1
+            assert REGISTRY.get_sample_value("password_hash_rejected_total", labels) == 1
+
+            release.set()
+            await asyncio.gather(*tasks)
+            assert REGISTRY.get_sample_value("password_hash_in_flight", labels) == 0
+            assert REGISTRY.get_sample_value("password_hash_queued", labels) == 0
+        finally:
+            release.set()
+            pool.shutdown()
+
+
+class TestPasswordRehash:
+    """Tests for configure_password_hasher and password_needs_rehash."""
+
+    def teardown_method(self):
+        configure_password_hasher()
+
+    def test_current_hash_does_not_need_rehash(self):
+        """Test that a hash made with the active parameters is up to date."""
+        hashed = hash_password("TestPassword123!")
+        assert password_needs_rehash(hashed) is False
+
+    def test_weaker_hash_needs_rehash(self):
+        """Test that raising the parameters flags weaker existing hashes for upgrade."""
+        configure_password_hasher(time_cost=1, memory_cost=19456, parallelism=1)
+        hashed = hash_password("TestPassword123!")
+        configure_password_hasher()
+
+        assert password_needs_rehash(hashed) is True
+        # Old hashes must keep verifying after the parameters change
+        assert verify_password("TestPassword123!", hashed) is True
+        assert password_needs_rehash(hash_password("TestPassword123!")) is False
+
+    def test_stronger_hash_is_kept(self):
+        """Test that a hash at least as strong as the settings is not rewritten."""
+        hashed = hash_password("TestPassword123!")
+        configure_password_hasher(time_cost=1, memory_cost=19456, parallelism=1)
+
+        assert password_needs_rehash(hashed) is False
+
+    def test_different_parallelism_is_kept(self):
+        """Test that processes differing only in parallelism do not flip hashes."""
+        configure_password_hasher(parallelism=1)
+        hashed = hash_password("TestPassword123!")
+        configure_password_hasher(parallelism=2)
+
+        assert password_needs_rehash(hashed) is False
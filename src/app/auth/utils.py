@@ -1,15 +1,138 @@
-import random 
+import asyncio
+import secrets
 import string
-from argon2 import PasswordHasher
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from argon2 import PasswordHasher, extract_parameters
 from argon2.exceptions import VerifyMismatchError
+from argon2.low_level import ARGON2_VERSION
 
+from core.domain.exceptions import PasswordHashingBusyException
+from core.metrics import PASSWORD_HASH_IN_FLIGHT, PASSWORD_HASH_QUEUED, PASSWORD_HASH_REJECTED_TOTAL
 from core.settings import settings
 
-_ph = PasswordHasher()
+T = TypeVar("T")
+
+
+def build_password_hasher(
+    time_cost: int | None = None,
+    memory_cost: int | None = None,
+    parallelism: int | None = None,
+) -> PasswordHasher:
+    """Build a PasswordHasher, falling back to settings then library defaults."""
+    params = {
+        "time_cost": time_cost or settings.ARGON2_TIME_COST,
+        "memory_cost": memory_cost or settings.ARGON2_MEMORY_COST,
+        "parallelism": parallelism or settings.ARGON2_PARALLELISM,
+    }
+    return PasswordHasher(**{k: v for k, v in params.items() if v})
+
+
+_ph = build_password_hasher()
+
+
+def configure_password_hasher(
+    time_cost: int | None = None,
+    memory_cost: int | None = None,
+    parallelism: int | None = None,
+) -> None:
+    """Replace the active Argon2 parameters used for new hashes."""
+    global _ph
+    _ph = build_password_hasher(time_cost, memory_cost, parallelism)
+
+
+class PasswordHashingPool:
+    """Bounded thread pool that runs Argon2 operations off the event loop.
+
+    Argon2 releases the GIL, so up to ``max_workers`` hashes run in parallel.
+    At most ``max_queue`` further calls may wait for a free worker; anything
+    beyond that is rejected with ``PasswordHashingBusyException`` so a login
+    burst sheds load instead of queueing unbounded work. In-flight, queued
+    and rejected operations are exported to Prometheus under ``name``.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str = "default"):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.name = name
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="argon2",
+                )
+            return self._executor
+
+    def _publish(self) -> None:
+        PASSWORD_HASH_IN_FLIGHT.labels(pool=self.name).set(self._in_flight)
+        PASSWORD_HASH_QUEUED.labels(pool=self.name).set(max(0, self._in_flight - self.max_workers))
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                PASSWORD_HASH_REJECTED_TOTAL.labels(pool=self.name).inc()
+                raise PasswordHashingBusyException()
+            self._in_flight += 1
+            self._publish()
+
+    def _release(self, _future: Any = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._publish()
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` on the pool and await its result."""
+        self._acquire()
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._release()
+            raise
+        # Released from the worker side so a cancelled caller cannot free a
+        # slot while its hash is still occupying a thread.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, int]:
+        """Return a snapshot of pool utilisation and queue depth."""
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": in_flight,
+                "active": min(in_flight, self.max_workers),
+                "queued": max(0, in_flight - self.max_workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+password_hashing_pool = PasswordHashingPool(
+    max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
 
 def generate_random_otp(length: int = 6) -> str:
     """Generate a random numeric OTP of specified length."""
-    return ''.join(random.choices(string.digits, k=length))
+    return ''.join(secrets.choice(string.digits) for _ in range(length))
 
 def hash_password(password: str) -> str:
     """Hash a password using Argon2."""
@@ -21,12 +144,39 @@ def verify_password( plain_password: str, hashed_password: str) -> bool:
         return _ph.verify(hashed_password, plain_password)
     except VerifyMismatchError:
         return False
-    
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash is weaker than the configured Argon2 parameters.
+
+    Only a weaker hash is upgraded. A hash that is at least as strong is
+    kept even if its parameters differ, so processes with different
+    settings, e.g. during a rollout, do not rewrite each other's hashes
+    on every login.
+    """
+    stored = extract_parameters(hashed_password)
+    return (
+        stored.type != _ph.type
+        or stored.version < ARGON2_VERSION
+        or stored.time_cost < _ph.time_cost
+        or stored.memory_cost < _ph.memory_cost
+        or stored.hash_len < _ph.hash_len
+        or stored.salt_len < _ph.salt_len
+    )
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password using Argon2 without blocking the event loop."""
+    return await password_hashing_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop."""
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
 def generate_username() -> str:
     """Generate a random username."""
     site_name = settings.SITE_NAME
     words = site_name.split()
     prefix = ''.join(word[0] for word in words).upper()
     remaining_length = 12 - len(prefix) -1
-    suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=remaining_length))
-    return f"{prefix}-{suffix}"
\ No newline at end of file
+    alphabet = string.ascii_uppercase + string.digits
+    suffix = ''.join(secrets.choice(alphabet) for _ in range(remaining_length))
+    return f"{prefix}-{suffix}"
@@ -0,0 +1,26 @@
+"""Benchmark configuration.
+
+Benchmarks are excluded from the unit test run; invoke them explicitly:
+
+    pytest benchmarks --benchmark-storage=benchmarks/baselines --benchmark-compare --benchmark-compare-fail=mean:20%
+
+``make benchmark`` in the repository root does the same, recording the
+baselines first if this machine has none. Baselines are not committed:
+timings recorded on other hardware would not be comparable.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the app directory to the path so we can import from core
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# A file-backed SQLite database stands in for Postgres, so the suite runs
+# offline; point BENCHMARK_DATABASE_URL at a real database to override it.
+os.environ["DATABASE_URL"] = os.environ.get(
+    "BENCHMARK_DATABASE_URL",
+    f"sqlite+aiosqlite:///{Path(tempfile.gettempdir()) / 'benchmark.db'}",
+)
+os.environ.setdefault("ADMIN_API_TOKEN", "benchmark-admin-token")
+os.environ.setdefault("PROJECT_NAME", "benchmark")
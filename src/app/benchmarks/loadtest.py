@@ -0,0 +1,278 @@
+"""In-process load harness for the routes under ``api_router``.
+
+Requests go through ``httpx.ASGITransport`` straight into the app, so no
+server, network or lifespan is involved and results reflect the
+application code itself. Besides the parameterless GET routes, ledger
+reads of a seeded account exercise the database. Redis-backed routes use
+fakeredis. Each route's p95
+latency and throughput are compared against ``baselines/load.json``,
+which is recorded locally by ``--save-baseline``; timings from other
+hardware are not comparable, so it is not committed. Record and check
+with the same ``--requests`` and ``--concurrency``, which default to
+what ``test_load.py`` uses.
+
+Usage:
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --save-baseline
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "load.json"
+DEFAULT_REQUESTS = 1000
+DEFAULT_CONCURRENCY = 50
+DEFAULT_TOLERANCE = 0.5
+# Slowdowns below this many milliseconds per request are scheduler noise on sub-millisecond routes.
+MIN_DELTA_MS = 2.0
+
+# Fixed ids keep the seeded routes, and so their baseline entries, stable between runs.
+CASH_ACCOUNT_ID = uuid.uuid5(uuid.NAMESPACE_URL, "benchmarks/ledger/cash")
+CUSTOMER_ACCOUNT_ID = uuid.uuid5(uuid.NAMESPACE_URL, "benchmarks/ledger/customer")
+SEEDED_ENTRIES = 500
+
+
+@dataclass
+class LoadResult:
+    route: str
+    requests: int
+    errors: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def default_routes() -> list[str]:
+    """Return every parameterless GET route of ``api_router``, without the API prefix."""
+    from api.main import api_router
+
+    return sorted(
+        route.path
+        for route in api_router.routes
+        if isinstance(route, APIRoute) and "GET" in route.methods and "{" not in route.path
+    )
+
+
+def seeded_routes() -> list[str]:
+    """Return the database-backed routes that read the rows written by ``seed_database``."""
+    account = f"/ledger/accounts/{CUSTOMER_ACCOUNT_ID}"
+    return [account, f"{account}/balance", f"{account}/postings"]
+
+
+async def seed_database(entries: int = SEEDED_ENTRIES) -> None:
+    """Create the schema and a customer account holding ``entries`` deposits.
+
+    Existing tables and rows are left alone, so a database named by
+    BENCHMARK_DATABASE_URL only gets the benchmark accounts once.
+    """
+    from core.db import dispose_engine
+    from core.model_registry import load_models
+
+    load_models()
+    try:
+        await _seed(entries)
+    finally:
+        # Pooled connections belong to this event loop; the load may run on another.
+        await dispose_engine()
+
+
+async def _seed(entries: int) -> None:
+    from sqlmodel import SQLModel
+
+    from core.db import get_db, get_engine
+    from ledger.models import AccountBalance, LedgerAccount
+    from ledger.schema import AccountTypeSchema, JournalEntryCreateSchema, PostingCreateSchema
+    from ledger.services import ledger_service
+
+    async with get_engine().begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    async with get_db() as session:
+        if await session.get(LedgerAccount, CUSTOMER_ACCOUNT_ID) is None:
+            for account_id, name, account_type in (
+                (CASH_ACCOUNT_ID, "Benchmark cash", AccountTypeSchema.ASSET),
+                (CUSTOMER_ACCOUNT_ID, "Benchmark customer", AccountTypeSchema.LIABILITY),
+            ):
+                session.add(LedgerAccount(id=account_id, name=name, currency="KES", account_type=account_type))
+                session.add(AccountBalance(account_id=account_id))
+            await session.flush()
+            for index in range(entries):
+                await ledger_service.post_entry(session, JournalEntryCreateSchema(
+                    description=f"Deposit {index}",
+                    postings=[
+                        PostingCreateSchema(account_id=CASH_ACCOUNT_ID, amount=100 + index),
+                        PostingCreateSchema(account_id=CUSTOMER_ACCOUNT_ID, amount=-(100 + index)),
+                    ],
+                ))
+            await session.commit()
+
+
+def build_app() -> FastAPI:
+    """Create the app with an in-process Redis, as SQLite stands in for Postgres."""
+    import fakeredis
+
+    import core.redis
+    from main import create_app
+
+    core.redis._redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return create_app()
+
+
+def default_headers() -> dict[str, str]:
+    from core.settings import settings
+
+    return {"X-Admin-Token": settings.ADMIN_API_TOKEN} if settings.ADMIN_API_TOKEN else {}
+
+
+async def run_load(
+    app: FastAPI,
+    route: str,
+    total: int = DEFAULT_REQUESTS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    method: str = "GET",
+    headers: dict[str, str] | None = None,
+) -> LoadResult:
+    """Send ``total`` requests to ``route`` with ``concurrency`` in flight.
+
+    ``route`` is relative to ``api_router``; the API prefix is added here so
+    baselines do not depend on ``API_V1_STR``.
+    """
+    from core.settings import settings
+
+    path = f"{settings.API_V1_STR}{route}"
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker() -> None:
+            nonlocal errors
+            for _ in remaining:
+                started_at = time.perf_counter()
+                try:
+                    response = await client.request(method, path, headers=headers)
+                    if response.status_code >= 400:
+                        errors += 1
+                except Exception:
+                    errors += 1
+                latencies.append((time.perf_counter() - started_at) * 1000)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        seconds = time.perf_counter() - started_at
+
+    latencies.sort()
+    return LoadResult(
+        route=route,
+        requests=total,
+        errors=errors,
+        seconds=round(seconds, 3),
+        rps=round(total / seconds, 1) if seconds else 0.0,
+        p50_ms=round(statistics.median(latencies), 3) if latencies else 0.0,
+        p95_ms=round(_percentile(latencies, 0.95), 3),
+        p99_ms=round(_percentile(latencies, 0.99), 3),
+    )
+
+
+def _ms_per_request(rps: float) -> float:
+    return 1000 / rps if rps else float("inf")
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, Any]:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baseline(results: list[LoadResult], path: Path = BASELINE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({r.route: {"p95_ms": r.p95_ms, "rps": r.rps} for r in results}, indent=2) + "\n")
+
+
+def find_regressions(
+    results: list[LoadResult],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_delta_ms: float = MIN_DELTA_MS,
+) -> list[str]:
+    """Describe every route that errored or fell outside ``tolerance`` of its baseline.
+
+    A route only regresses once its p95, or the time per request implied
+    by its throughput, is also ``min_delta_ms`` slower than the baseline.
+    """
+    regressions = []
+    for result in results:
+        if result.errors:
+            regressions.append(f"{result.route}: {result.errors}/{result.requests} requests failed")
+        expected = baseline.get(result.route)
+        if expected is None:
+            continue
+        if (
+            result.p95_ms > expected["p95_ms"] * (1 + tolerance)
+            and result.p95_ms - expected["p95_ms"] >= min_delta_ms
+        ):
+            regressions.append(f"{result.route}: p95 {result.p95_ms} ms vs baseline {expected['p95_ms']} ms")
+        if (
+            result.rps < expected["rps"] * (1 - tolerance)
+            and _ms_per_request(result.rps) - _ms_per_request(expected["rps"]) >= min_delta_ms
+        ):
+            regressions.append(f"{result.route}: {result.rps} req/s vs baseline {expected['rps']} req/s")
+    return regressions
+
+
+async def _main(args: argparse.Namespace) -> int:
+    from core.db import dispose_engine
+
+    # httpx logs every request at INFO, which would dominate the timings.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    await seed_database()
+    app = build_app()
+    headers = default_headers()
+    try:
+        results = [
+            await run_load(app, route, total=args.requests, concurrency=args.concurrency, headers=headers)
+            for route in (args.routes or default_routes() + seeded_routes())
+        ]
+    finally:
+        await dispose_engine()
+    for result in results:
+        print(json.dumps(asdict(result)))
+
+    if args.save_baseline:
+        save_baseline(results)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+    regressions = find_regressions(results, load_baseline(), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    import benchmarks.conftest  # noqa: F401  (offline database and admin token defaults)
+
+    parser = argparse.ArgumentParser(description="Load test API routes in-process.")
+    parser.add_argument("routes", nargs="*", help="api_router paths to load; defaults to its parameterless GET routes and the seeded ledger reads")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,62 @@
+"""Micro-benchmarks for password hashing and user (de)serialisation."""
+import pytest
+
+from auth.models import User
+from auth.schema import SecurityQuestionsSchema, UserCreateSchema, UserReadSchema
+from auth.utils import hash_password, verify_password
+
+PASSWORD = "Str0ng!Passw0rd"
+
+USER_PAYLOAD = {
+    "email": "bench@example.com",
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "id_no": 424242,
+    "password": PASSWORD,
+    "confirm_password": PASSWORD,
+    "security_question": SecurityQuestionsSchema.MOTHERS_MAIDEN_NAME,
+    "security_answer": "Byron",
+}
+
+
+@pytest.fixture(scope="module")
+def hashed_password():
+    return hash_password(PASSWORD)
+
+
+@pytest.fixture(scope="module")
+def user(hashed_password):
+    schema = UserCreateSchema.model_validate(USER_PAYLOAD)
+    return User(
+        **schema.model_dump(exclude={"password", "confirm_password", "username"}),
+        username="BENCH-000001",
+        hashed_password=hashed_password,
+    )
+
+
+class TestPasswordBenchmarks:
+    """Argon2 cost with the configured parameters."""
+
+    def test_hash_password(self, benchmark):
+        result = benchmark.pedantic(hash_password, args=(PASSWORD,), rounds=10, iterations=1)
+        assert result.startswith("$argon2")
+
+    def test_verify_password(self, benchmark, hashed_password):
+        result = benchmark.pedantic(verify_password, args=(PASSWORD, hashed_password), rounds=10, iterations=1)
+        assert result is True
+
+
+class TestUserSchemaBenchmarks:
+    """Pydantic validation and serialisation of users."""
+
+    def test_validate_user_create(self, benchmark):
+        schema = benchmark(UserCreateSchema.model_validate, USER_PAYLOAD)
+        assert schema.email == USER_PAYLOAD["email"]
+
+    def test_serialise_user_read(self, benchmark, user):
+        data = benchmark(lambda: UserReadSchema.model_validate(user, from_attributes=True).model_dump(mode="json"))
+        assert data["full_name"].startswith("Ada")
+
+    def test_dump_user_model(self, benchmark, user):
+        data = benchmark(user.model_dump, mode="json")
+        assert data["username"] == "BENCH-000001"
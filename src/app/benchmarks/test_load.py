@@ -0,0 +1,70 @@
+"""Load the API routes in-process and compare against the stored baseline."""
+import asyncio
+import logging
+import os
+
+import pytest
+import pytest_asyncio
+
+from benchmarks.loadtest import (
+    DEFAULT_TOLERANCE,
+    LoadResult,
+    build_app,
+    default_headers,
+    default_routes,
+    find_regressions,
+    load_baseline,
+    run_load,
+    seed_database,
+    seeded_routes,
+)
+
+TOLERANCE = float(os.environ.get("BENCHMARK_LOAD_TOLERANCE", DEFAULT_TOLERANCE))
+
+
+@pytest.fixture(scope="module")
+def app():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(seed_database())
+    return build_app()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def fresh_connections():
+    """Drop pooled connections after each test, since every test runs on its own event loop."""
+    from core.db import dispose_engine
+
+    yield
+    await dispose_engine()
+
+
+class TestRouteLoad:
+    """Latency and throughput of the parameterless GET routes and the seeded ledger reads."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("route", default_routes() + seeded_routes())
+    async def test_route_within_baseline(self, app, route):
+        result = await run_load(app, route, headers=default_headers())
+
+        assert find_regressions([result], load_baseline(), TOLERANCE) == []
+
+
+class TestFindRegressions:
+    """Regression thresholds applied to load results."""
+
+    def test_slower_p95_and_lower_throughput_are_reported(self):
+        result = LoadResult("/home/", 100, 0, 1.0, rps=100.0, p50_ms=1.0, p95_ms=3.0, p99_ms=4.0)
+
+        regressions = find_regressions([result], {"/home/": {"p95_ms": 1.0, "rps": 1000.0}}, tolerance=0.5)
+
+        assert len(regressions) == 2
+
+    def test_small_absolute_slowdowns_are_ignored(self):
+        result = LoadResult("/admin/logging", 100, 0, 1.0, rps=1500.0, p50_ms=0.5, p95_ms=0.8, p99_ms=1.0)
+
+        assert find_regressions([result], {"/admin/logging": {"p95_ms": 0.5, "rps": 4000.0}}) == []
+
+    def test_errors_are_always_regressions(self):
+        result = LoadResult("/new/", 100, 3, 1.0, rps=1000.0, p50_ms=1.0, p95_ms=1.0, p99_ms=1.0)
+
+        assert find_regressions([result], {}) == ["/new/: 3/100 requests failed"]
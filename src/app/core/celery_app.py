@@ -1,10 +1,22 @@
+import time
+from typing import Any
+
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+    worker_ready,
+)
+from core.logger import request_id_var, task_id_var, trace_id_var
+from core.metrics import CELERY_TASK_QUEUE_SECONDS, CELERY_TASK_SECONDS, build_registry, mark_process_dead
 from core.settings import settings
 
 celery_app = Celery(
     "worker",
     broker=f"amqp://{settings.RABBITMQ_USER}:{settings.RABBITMQ_PASSWORD}@{settings.RABBITMQ_HOST}:{settings.RABBITMQ_PORT}//",
-    backend=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}",
+    backend=settings.REDIS_URL,
 )
 
 celery_app.conf.update(
@@ -31,10 +43,85 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
     worker_log_format="[%(asctime)s: %(levelname)s/%(processName)s] %(message)s",
     worker_task_log_format="[%(asctime)s: %(levelname)s/%(processName)s][%(task_name)s %(task_id)s] %(message)s",   
+    beat_schedule={
+        "roll-up-ledger-balance-shards": {
+            "task": "roll_up_balance_shards_task",
+            "schedule": settings.LEDGER_SHARD_ROLLUP_SECONDS,
+        },
+    },
 )
 
 celery_app.autodiscover_tasks(
-    packages=["core.emails"],
+    packages=["core.emails", "ledger"],
     related_name="tasks",
     force=True,
-)
\ No newline at end of file
+)
+
+@before_task_publish.connect
+def propagate_log_context(headers: dict | None = None, **kwargs) -> None:
+    """Carry the publishing request's correlation ids and publish time in the task headers."""
+    if headers is None:
+        return
+    headers.setdefault("published_at", time.time())
+    for key, var in (("request_id", request_id_var), ("trace_id", trace_id_var)):
+        value = var.get()
+        if value is not None:
+            headers.setdefault(key, value)
+
+
+_task_context_tokens: dict[str, tuple] = {}
+
+
+@task_prerun.connect
+def bind_task_log_context(task_id: str | None = None, task: Any = None, **kwargs) -> None:
+    request = getattr(task, "request", None)
+    _task_context_tokens[task_id or ""] = (
+        request_id_var.set(getattr(request, "request_id", None)),
+        trace_id_var.set(getattr(request, "trace_id", None)),
+        task_id_var.set(task_id),
+    )
+
+
+@task_postrun.connect
+def unbind_task_log_context(task_id: str | None = None, **kwargs) -> None:
+    tokens = _task_context_tokens.pop(task_id or "", None)
+    if tokens is None:
+        return
+    for var, token in zip((request_id_var, trace_id_var, task_id_var), tokens):
+        try:
+            var.reset(token)
+        except ValueError:
+            var.set(None)
+
+
+_task_started_at: dict[str, float] = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id: str | None = None, task: Any = None, **kwargs) -> None:
+    _task_started_at[task_id or ""] = time.perf_counter()
+    published_at = getattr(getattr(task, "request", None), "published_at", None)
+    if published_at is not None:
+        CELERY_TASK_QUEUE_SECONDS.labels(task=task.name).observe(max(0.0, time.time() - published_at))
+
+
+@task_postrun.connect
+def observe_task_duration(task_id: str | None = None, task: Any = None, state: str | None = None, **kwargs) -> None:
+    started_at = _task_started_at.pop(task_id or "", None)
+    if started_at is not None:
+        CELERY_TASK_SECONDS.labels(task=getattr(task, "name", "unknown"), state=state or "UNKNOWN").observe(
+            time.perf_counter() - started_at
+        )
+
+
+@worker_ready.connect
+def start_metrics_server(**kwargs) -> None:
+    if settings.CELERY_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        start_http_server(settings.CELERY_METRICS_PORT, registry=build_registry())
+
+
+@worker_process_shutdown.connect
+def release_process_metrics(pid: int | None = None, **kwargs) -> None:
+    mark_process_dead(pid)
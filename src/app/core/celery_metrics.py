@@ -0,0 +1,65 @@
+import threading
+import time
+from typing import Iterable
+
+from prometheus_client import CollectorRegistry
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from core.celery_app import celery_app
+from core.logger import get_logger
+from core.settings import settings
+
+logger = get_logger()
+
+
+class CeleryQueueCollector(Collector):
+    """Report the number of ready messages in each Celery queue.
+
+    Depth is read with a passive ``queue.declare`` on the broker, so it is
+    the same for every API process and is not aggregated across them. The
+    lookup blocks, so results are cached for ``cache_seconds`` to keep
+    frequent scrapes from hammering the broker.
+    """
+
+    def __init__(self, queues: list[str] | None = None, cache_seconds: float | None = None):
+        self.queues = queues or [celery_app.conf.task_default_queue]
+        self.cache_seconds = (
+            settings.CELERY_QUEUE_METRICS_CACHE_SECONDS if cache_seconds is None else cache_seconds
+        )
+        self._lock = threading.Lock()
+        self._cached: dict[str, int] = {}
+        self._cached_at = 0.0
+        self.registry = CollectorRegistry(auto_describe=False)
+        self.registry.register(self)
+
+    def _read_depths(self) -> dict[str, int]:
+        depths = {}
+        with celery_app.connection_for_read() as connection:
+            connection.ensure_connection(max_retries=1, timeout=2)
+            channel = connection.default_channel
+            for queue in self.queues:
+                try:
+                    _, message_count, _ = channel.queue_declare(queue=queue, passive=True)
+                    depths[queue] = message_count
+                except Exception as e:
+                    logger.warning(f"Could not read depth of queue {queue}: {e}")
+                    channel = connection.channel()
+        return depths
+
+    def depths(self) -> dict[str, int]:
+        with self._lock:
+            if time.monotonic() - self._cached_at >= self.cache_seconds:
+                try:
+                    self._cached = self._read_depths()
+                except Exception as e:
+                    logger.warning(f"Celery queue depth unavailable: {e}")
+                    self._cached = {}
+                self._cached_at = time.monotonic()
+            return dict(self._cached)
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        family = GaugeMetricFamily("celery_queue_length", "Messages waiting in a Celery queue.", labels=["queue"])
+        for queue, depth in self.depths().items():
+            family.add_metric([queue], depth)
+        yield family
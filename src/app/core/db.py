@@ -1,95 +1,405 @@
 import asyncio
-from contextlib import asynccontextmanager
-from multiprocessing import pool
-from typing import AsyncGenerator
+import time
+import uuid
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator
+from sqlmodel import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import text
-from sqlalchemy.pool import AsyncAdaptedQueuePool
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy import event, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from core.settings import settings
 from core.logger import get_logger
+from core.metrics import (
+    DB_CHECKOUT_WAIT_SECONDS,
+    DB_POOL_CONNECTIONS,
+    DB_QUERY_SECONDS,
+    DB_SESSION_ERRORS_TOTAL,
+    DB_SESSION_STATEMENTS,
+    DB_SLOW_TRANSACTIONS_TOTAL,
+    DB_TRANSACTION_SECONDS,
+)
 from core.model_registry import load_models
 
 logger = get_logger()
 
-engine = create_async_engine(
-    settings.DATABASE_URL, 
-    poolclass=AsyncAdaptedQueuePool, 
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,
-    echo=False
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+
+def resolve_pool_sizing(
+    max_connections: int,
+    reserved_connections: int,
+    workers: int,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+) -> tuple[int, int]:
+    """Return ``(pool_size, max_overflow)`` for one worker process.
+
+    The Postgres ``max_connections`` budget, minus connections reserved for
+    Celery, migrations and admin sessions, is split evenly across uvicorn
+    workers. Explicit values win but are logged when they overshoot it.
+    """
+    budget = max(1, (max_connections - reserved_connections) // max(1, workers))
+    resolved_size = pool_size if pool_size is not None else min(DEFAULT_POOL_SIZE, budget)
+    resolved_overflow = (
+        max_overflow
+        if max_overflow is not None
+        else max(0, min(DEFAULT_MAX_OVERFLOW, budget - resolved_size))
+    )
+    if resolved_size + resolved_overflow > budget:
+        logger.warning(
+            f"Connection pool ({resolved_size} + {resolved_overflow} overflow) exceeds the "
+            f"per-worker budget of {budget} connections across {workers} workers"
+        )
+    return resolved_size, resolved_overflow
+
+
+pool_size, max_overflow = resolve_pool_sizing(
+    settings.DB_MAX_CONNECTIONS,
+    settings.DB_RESERVED_CONNECTIONS,
+    settings.WEB_CONCURRENCY,
+    settings.DB_POOL_SIZE,
+    settings.DB_MAX_OVERFLOW,
 )
-async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
+
+@dataclass
+class SessionStats:
+    statements: int = 0
+
+
+_session_stats: ContextVar[SessionStats | None] = ContextVar("db_session_stats", default=None)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _session_stats.get()
+    if stats is not None:
+        stats.statements += 1
+
+
+# Set while a request is being profiled; every statement's timing is appended.
+captured_queries: ContextVar[list[dict[str, Any]] | None] = ContextVar("captured_queries", default=None)
+
+_QUERY_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "COPY", "BEGIN", "COMMIT", "ROLLBACK"}
+
+
+def _query_operation(statement: str) -> str:
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return operation if operation in _QUERY_OPERATIONS else "OTHER"
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _observe_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("query_started_at")
+    if started:
+        elapsed = time.perf_counter() - started.pop()
+        DB_QUERY_SECONDS.labels(operation=_query_operation(statement)).observe(elapsed)
+        queries = captured_queries.get()
+        if queries is not None:
+            queries.append({"statement": statement[:500], "ms": round(elapsed * 1000, 3)})
+
+
+def _discard_query_timer(exception_context) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+
+def _instrument_pool(name: str, pool: QueuePool) -> None:
+    """Keep the ``db_pool_connections`` gauges in step with pool events.
+
+    Counts are tracked from the events themselves: inside ``checkin`` and
+    ``close`` listeners the pool's own counters are not updated yet.
+    """
+    counts = {"open": 0, "checked_out": 0}
+
+    def publish() -> None:
+        DB_POOL_CONNECTIONS.labels(engine=name, state="checked_out").set(counts["checked_out"])
+        DB_POOL_CONNECTIONS.labels(engine=name, state="checked_in").set(counts["open"] - counts["checked_out"])
+        DB_POOL_CONNECTIONS.labels(engine=name, state="overflow").set(max(0, counts["open"] - pool.size()))
+
+    def adjust(open_delta: int, checked_out_delta: int):
+        def listener(*args: Any) -> None:
+            counts["open"] += open_delta
+            counts["checked_out"] += checked_out_delta
+            publish()
+        return listener
+
+    event.listen(pool, "connect", adjust(1, 0))
+    event.listen(pool, "close", adjust(-1, 0))
+    event.listen(pool, "detach", adjust(-1, -1))
+    event.listen(pool, "checkout", adjust(0, 1))
+    event.listen(pool, "checkin", adjust(0, -1))
+    publish()
+
+
+def _pgbouncer_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def build_engine(url: str, name: str = "primary") -> AsyncEngine:
+    """Create an instrumented async engine using the configured pool options.
+
+    In PgBouncer mode the application keeps no pool of its own (PgBouncer
+    is the pool) and asyncpg's prepared statement caches are disabled, since
+    in transaction pooling consecutive statements may land on different
+    server connections. Statement names are made unique for the same reason.
+    """
+    if settings.DB_PGBOUNCER_MODE:
+        new_engine = create_async_engine(
+            url,
+            poolclass=NullPool,
+            connect_args={
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _pgbouncer_statement_name,
+            },
+            echo=False,
+        )
+    else:
+        new_engine = create_async_engine(
+            url, 
+            poolclass=AsyncAdaptedQueuePool, 
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            echo=False
+        )
+    event.listen(new_engine.sync_engine, "before_cursor_execute", _count_statement)
+    event.listen(new_engine.sync_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(new_engine.sync_engine, "after_cursor_execute", _observe_query)
+    event.listen(new_engine.sync_engine, "handle_error", _discard_query_timer)
+    if isinstance(new_engine.pool, QueuePool):
+        _instrument_pool(name, new_engine.pool)
+    return new_engine
+
+
+_engine: AsyncEngine | None = None
+_async_session: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_engine() -> AsyncEngine:
+    """Return the primary engine, creating it on first use.
+
+    Building the engine imports the asyncpg dialect, so processes that
+    never touch the database (e.g. Celery workers sending mail) skip it.
+    """
+    global _engine
+    if _engine is None:
+        _engine = build_engine(settings.DATABASE_URL)
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection if the engine was ever created."""
+    if _engine is not None:
+        await _engine.dispose()
+
+
+class InstrumentedSession(Session):
+    """Sync session class behind ``AsyncSession`` that times each transaction."""
+
+
+@event.listens_for(InstrumentedSession, "after_begin")
+def _on_transaction_begin(session, transaction, connection) -> None:
+    session.info.setdefault("transaction_started_at", time.perf_counter())
+
+
+@event.listens_for(InstrumentedSession, "after_transaction_end")
+def _on_transaction_end(session, transaction) -> None:
+    if transaction.parent is not None:
+        return
+    started_at = session.info.pop("transaction_started_at", None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+    DB_TRANSACTION_SECONDS.observe(elapsed)
+    if elapsed * 1000 >= settings.DB_SLOW_TRANSACTION_MS:
+        DB_SLOW_TRANSACTIONS_TOTAL.inc()
+        stats = _session_stats.get()
+        logger.warning(
+            f"Slow database transaction: {elapsed * 1000:.1f} ms, "
+            f"{stats.statements if stats else 'unknown'} statements in session"
+        )
+
+
+def build_sessionmaker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind,
+        expire_on_commit=False,
+        class_=AsyncSession,
+        sync_session_class=InstrumentedSession,
+    )
+
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global _async_session
+    if _async_session is None:
+        _async_session = build_sessionmaker(get_engine())
+    return _async_session
+
+
+def __getattr__(name: str) -> Any:
+    # ``engine`` and ``async_session`` used to be module globals.
+    if name == "engine":
+        return get_engine()
+    if name == "async_session":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @asynccontextmanager
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session() as session:
-        try:
-            yield session
-        except Exception as e:
-            logger.error(f"Database session error: {e}")
-            if session:
+async def session_scope(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[AsyncSession, None]:
+    """Provide a session with rollback on error and usage metrics."""
+    stats = SessionStats()
+    token = _session_stats.set(stats)
+    requested_at = time.perf_counter()
+    try:
+        async with session_factory() as session:
+            try:
+                await session.connection()
+                DB_CHECKOUT_WAIT_SECONDS.observe(time.perf_counter() - requested_at)
+                yield session
+            except Exception as e:
+                DB_SESSION_ERRORS_TOTAL.inc()
+                logger.error(f"Database session error: {e}")
                 try:
                     await session.rollback()
                     logger.info("Database session rollback successful")
                 except Exception as e:
                     logger.error(f"Database session rollback error: {e}")
-            raise
-        finally:
-            try:
-                await session.close()
-                logger.debug("Database session closed successfully")
-            except Exception as e:
-                logger.error(f"Database session close error: {e}")
                 raise
+    finally:
+        DB_SESSION_STATEMENTS.observe(stats.statements)
+        try:
+            _session_stats.reset(token)
+        except ValueError:
+            # Exited from a different context than it was entered in.
+            _session_stats.set(None)
+
+
+def get_db() -> AbstractAsyncContextManager[AsyncSession]:
+    """Provide a session on the primary database."""
+    return session_scope(get_sessionmaker())
 
 
 async def get_db_dependency() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session() as session:
+    async with get_db() as session:
+        yield session
+
+def get_pool_status() -> dict[str, Any]:
+    """Return live connection counts for the engine's pool."""
+    pool = get_engine().pool
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__, "pgbouncer_mode": settings.DB_PGBOUNCER_MODE}
+    return {
+        "pool_class": type(pool).__name__,
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": max_overflow,
+        "timeout": pool.timeout(),
+    }
+
+
+async def validate_idle_connections() -> int:
+    """Ping each idle pooled connection once; returns how many were replaced.
+
+    A cheaper alternative to ``pool_pre_ping`` which pings on every checkout:
+    connections are checked out one at a time, and because the queue pool is
+    FIFO each iteration lands on a different idle connection. Connections
+    that fail are invalidated by SQLAlchemy and reopened on next use.
+    """
+    engine = get_engine()
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    replaced = 0
+    for _ in range(engine.pool.checkedin()):
         try:
-            yield session
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
         except Exception as e:
-            logger.error(f"Database session error: {e}")
-            if session:
-                try:
-                    await session.rollback()
-                    logger.info("Database session rollback successful")
-                except Exception as e:
-                    logger.error(f"Database session rollback error: {e}")
-            raise
-        finally:
-            try:
-                await session.close()
-                logger.debug("Database session closed successfully")
-            except Exception as e:
-                logger.error(f"Database session close error: {e}")
+            replaced += 1
+            logger.warning(f"Discarded stale pooled connection: {e}")
+    return replaced
+
+
+async def run_pool_validation(interval: float) -> None:
+    """Background loop that validates idle connections every ``interval`` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await validate_idle_connections()
+        except Exception as e:
+            logger.error(f"Connection pool validation failed: {e}")
+
+
+async def wait_for_db(
+    max_tries: int = settings.DB_CONNECT_RETRIES,
+    retry_delay: float = settings.DB_CONNECT_RETRY_DELAY_SECONDS,
+) -> None:
+    """Run ``SELECT 1`` until the database answers, backing off exponentially."""
+    engine = get_engine()
+    for attempt in range(max_tries):
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            logger.info("Database connection established successfully")
+            return
+        except Exception as e:
+            logger.error(f"Database connection attempt {attempt + 1} failed: {e}")
+            if attempt < max_tries - 1:
+                delay = retry_delay * 2 ** attempt
+                logger.warning(f"Retrying in {delay} seconds...")
+                await asyncio.sleep(delay)
+            else:
+                logger.critical("All database connection attempts failed")
                 raise
 
+
+async def prewarm_pool(connections: int = settings.DB_POOL_MIN_CONNECTIONS) -> int:
+    """Open up to ``connections`` pooled connections concurrently.
+
+    The connections are returned to the pool straight away, so the first
+    requests after a cold start skip the TCP, TLS and auth round trips.
+    Returns how many connections were opened.
+    """
+    engine = get_engine()
+    if not isinstance(engine.pool, QueuePool):
+        return 0
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return 0
+
+    async with AsyncExitStack() as stack:
+        results = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+            return_exceptions=True,
+        )
+    failures = [r for r in results if isinstance(r, BaseException)]
+    for failure in failures:
+        logger.warning(f"Failed to pre-open pooled connection: {failure}")
+    return connections - len(failures)
+
+
 async def init_db() -> None:
     try:
         load_models()
         logger.info("Model registry loaded successfully")
-        
-        max_tries = 3
-        retry_delay = 5  # seconds
-
-        for attempt in range(max_tries):
-            try:
-                async with engine.begin() as conn:
-                    await conn.execute(text("SELECT 1"))
-                logger.info("Database connection established successfully")
-                break
-            except Exception as e:
-                logger.error(f"Database connection attempt {attempt + 1} failed: {e}")
-                if attempt < max_tries - 1:
-                    logger.warning(f"Retrying in {retry_delay} seconds...")
-                    await asyncio.sleep(retry_delay * (attempt + 1))
-                else:
-                    logger.critical("All database connection attempts failed")
-                    raise
+        await wait_for_db()
     except Exception as e:
         logger.critical(f"Database initialization failed: {e}")
-        raise
\ No newline at end of file
+        raise
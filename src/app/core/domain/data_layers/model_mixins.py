@@ -3,43 +3,41 @@ import uuid
 from datetime import datetime, timezone
 from sqlalchemy import func, text
 from sqlalchemy.dialects import postgresql as pg
-from sqlmodel import Field, Column, SQLModel
+from sqlmodel import Field, SQLModel
+
+# Columns are described with sa_type/sa_column_kwargs rather than a shared
+# sa_column, so every table built from a mixin gets its own Column object.
 
 
 class BaseModelMixin(SQLModel):
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
-        sa_column=Column(
-            pg.UUID(as_uuid=True),
-            primary_key=True,
-        ),
+        primary_key=True,
+        sa_type=pg.UUID(as_uuid=True),
     )
 
 
-class TimestampMixin:
+class CreatedAtMixin:
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(
-            pg.TIMESTAMP(timezone=True),
-            nullable=False,
-            server_default=text("CURRENT_TIMESTAMP"),
-        ),
+        sa_type=pg.TIMESTAMP(timezone=True),
+        nullable=False,
+        sa_column_kwargs={"server_default": text("CURRENT_TIMESTAMP")},
     )
+
+
+class TimestampMixin(CreatedAtMixin):
     updated_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
-        sa_column=Column(
-            pg.TIMESTAMP(timezone=True),
-            nullable=False,
-            onupdate=func.current_timestamp(),
-        ),
+        sa_type=pg.TIMESTAMP(timezone=True),
+        nullable=False,
+        sa_column_kwargs={"onupdate": func.current_timestamp()},
     )
     
 
 class SoftDeletedMixin:
     deleted_at: datetime | None = Field(
         default=None,
-        sa_column=Column(
-            pg.TIMESTAMP(timezone=True),
-            nullable=True,
-        ),
-    )
\ No newline at end of file
+        sa_type=pg.TIMESTAMP(timezone=True),
+        nullable=True,
+    )
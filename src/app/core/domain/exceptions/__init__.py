@@ -1 +1,8 @@
-from .invalid_password import InvalidPasswordException
\ No newline at end of file
+from .idempotency_key_conflict import IdempotencyKeyConflictException
+from .insufficient_funds import InsufficientFundsException
+from .invalid_cursor import InvalidCursorException
+from .invalid_journal_entry import InvalidJournalEntryException
+from .invalid_password import InvalidPasswordException
+from .ledger_account_not_found import LedgerAccountNotFoundException
+from .otp_rate_limited import OTPRateLimitException
+from .password_hashing_busy import PasswordHashingBusyException
@@ -0,0 +1,11 @@
+from http import HTTPStatus
+
+
+class IdempotencyKeyConflictException(Exception):
+    """Exception raised when an idempotency key is reused for a different request."""
+    http_status: int = HTTPStatus.CONFLICT
+    action: str = "Use a new idempotency key for a different request."
+
+    def __init__(self, message: str = "Idempotency key already used for a different request."):
+        self.message = message
+        super().__init__(self.message)
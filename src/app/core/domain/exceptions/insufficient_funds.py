@@ -0,0 +1,11 @@
+from http import HTTPStatus
+
+
+class InsufficientFundsException(Exception):
+    """Exception raised when a posting would overdraw a ledger account."""
+    http_status: int = HTTPStatus.UNPROCESSABLE_ENTITY
+    action: str = "Reduce the amount or fund the account first."
+
+    def __init__(self, message: str = "Insufficient funds."):
+        self.message = message
+        super().__init__(self.message)
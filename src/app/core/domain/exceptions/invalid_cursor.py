@@ -0,0 +1,11 @@
+from http import HTTPStatus
+
+
+class InvalidCursorException(Exception):
+    """Exception raised when a pagination cursor cannot be decoded."""
+    http_status: int = HTTPStatus.BAD_REQUEST
+    action: str = "Use the next_cursor value from the previous page, or omit it to start over."
+
+    def __init__(self, message: str = "Invalid pagination cursor."):
+        self.message = message
+        super().__init__(self.message)
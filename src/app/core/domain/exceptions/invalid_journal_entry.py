@@ -0,0 +1,11 @@
+from http import HTTPStatus
+
+
+class InvalidJournalEntryException(Exception):
+    """Exception raised when a journal entry cannot be posted as submitted."""
+    http_status: int = HTTPStatus.UNPROCESSABLE_ENTITY
+    action: str = "Check that the postings balance and target open accounts in one currency."
+
+    def __init__(self, message: str = "Invalid journal entry."):
+        self.message = message
+        super().__init__(self.message)
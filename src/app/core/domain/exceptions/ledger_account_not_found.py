@@ -0,0 +1,11 @@
+from http import HTTPStatus
+
+
+class LedgerAccountNotFoundException(Exception):
+    """Exception raised when a ledger account does not exist."""
+    http_status: int = HTTPStatus.NOT_FOUND
+    action: str = "Check the account id."
+
+    def __init__(self, message: str = "Ledger account not found."):
+        self.message = message
+        super().__init__(self.message)
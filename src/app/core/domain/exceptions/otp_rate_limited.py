@@ -0,0 +1,11 @@
+from http import HTTPStatus
+
+
+class OTPRateLimitException(Exception):
+    """Exception raised when too many OTPs are requested for a user."""
+    http_status: int = HTTPStatus.TOO_MANY_REQUESTS
+    action: str = "Please wait before requesting a new code."
+
+    def __init__(self, message: str = "Too many one-time passwords requested."):
+        self.message = message
+        super().__init__(self.message)
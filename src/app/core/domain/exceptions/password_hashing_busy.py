@@ -0,0 +1,11 @@
+from http import HTTPStatus
+
+
+class PasswordHashingBusyException(Exception):
+    """Exception raised when the password hashing pool is saturated."""
+    http_status: int = HTTPStatus.SERVICE_UNAVAILABLE
+    action: str = "Please try again in a few moments."
+
+    def __init__(self, message: str = "The server is busy processing other credentials."):
+        self.message = message
+        super().__init__(self.message)
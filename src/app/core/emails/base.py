@@ -1,15 +1,23 @@
-from typing import List
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from functools import lru_cache
+from typing import TYPE_CHECKING, List
 from core.logger import get_logger
 from core.emails.config import TEMPLATE_FOLDER_PATH
 from core.emails.tasks import send_email_task
 
+if TYPE_CHECKING:
+    from jinja2 import Environment
+
 logger = get_logger()
 
-email_env = Environment(
-    loader=FileSystemLoader(TEMPLATE_FOLDER_PATH),
-    autoescape=True,
-)
+@lru_cache(maxsize=1)
+def get_email_env() -> "Environment":
+    """Create the Jinja environment on first render; workers never need it."""
+    from jinja2 import Environment, FileSystemLoader
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_FOLDER_PATH),
+        autoescape=True,
+    )
 
 class EmailTemplate:
     template_name: str
@@ -36,6 +44,7 @@ class EmailTemplate:
             if not cls.template_name or not cls.template_name_plain:
                 raise ValueError("Template names must be defined.")
             
+            email_env = get_email_env()
             html_template = email_env.get_template(cls.template_name)
             plain_template = email_env.get_template(cls.template_name_plain)
 
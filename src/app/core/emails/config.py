@@ -1,22 +1,31 @@
+from functools import lru_cache
 from pathlib import Path
-from fastapi_mail import ConnectionConfig, FastMail
-from pydantic import SecretStr
+from typing import TYPE_CHECKING
+
 from core.settings import settings
 
+if TYPE_CHECKING:
+    from fastapi_mail import FastMail
+
 TEMPLATE_FOLDER_PATH = Path(__file__).parent / "templates"
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_FROM,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
-    MAIL_PASSWORD=SecretStr(""),
-    MAIL_PORT=settings.SMTP_PORT,
-    MAIL_SERVER=settings.SMTP_HOST,
-    MAIL_SSL_TLS=False,
-    MAIL_STARTTLS=False,
-    USE_CREDENTIALS=False,
-    VALIDATE_CERTS=False,
-    TEMPLATE_FOLDER=TEMPLATE_FOLDER_PATH,
-)
+@lru_cache(maxsize=1)
+def get_mail_client() -> "FastMail":
+    """Build the FastMail client on first use, so importing tasks stays cheap."""
+    from fastapi_mail import ConnectionConfig, FastMail
+    from pydantic import SecretStr
 
-fm = FastMail(conf)
\ No newline at end of file
+    conf = ConnectionConfig(
+        MAIL_USERNAME=settings.MAIL_FROM,
+        MAIL_FROM=settings.MAIL_FROM,
+        MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
+        MAIL_PASSWORD=SecretStr(""),
+        MAIL_PORT=settings.SMTP_PORT,
+        MAIL_SERVER=settings.SMTP_HOST,
+        MAIL_SSL_TLS=False,
+        MAIL_STARTTLS=False,
+        USE_CREDENTIALS=False,
+        VALIDATE_CERTS=False,
+        TEMPLATE_FOLDER=TEMPLATE_FOLDER_PATH,
+    )
+    return FastMail(conf)
@@ -1,9 +1,8 @@
 import asyncio
 
-from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum, NameEmail
 from core.celery_app import celery_app
 from core.logger import get_logger
-from core.emails.config import fm
+from core.emails.config import get_mail_client
 
 logger = get_logger()
 
@@ -35,6 +34,8 @@ def send_email_task(
     Returns:
         bool: True if the email was sent successfully, False otherwise.
     """
+    from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum, NameEmail
+
     try:
         message = MessageSchema(
             subject=subject,
@@ -46,7 +47,7 @@ def send_email_task(
         )
 
         loop = asyncio.get_event_loop()
-        loop.run_until_complete(fm.send_message(message))
+        loop.run_until_complete(get_mail_client().send_message(message))
         logger.info(f"Email sent to {recipients} with subject '{subject}'")
         return True
     except Exception as e:
@@ -1,12 +1,37 @@
 from functools import wraps
+from typing import Mapping
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from core.domain.exceptions import InvalidPasswordException
+from core.domain.exceptions import (
+    IdempotencyKeyConflictException,
+    InsufficientFundsException,
+    InvalidCursorException,
+    InvalidJournalEntryException,
+    InvalidPasswordException,
+    LedgerAccountNotFoundException,
+    OTPRateLimitException,
+    PasswordHashingBusyException,
+)
 from core.logger import get_logger
+from core.settings import settings
 
 logger = get_logger()
 
+def redact_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    """Mask credential headers and truncate long values before logging."""
+    redacted = {name.lower() for name in settings.LOG_REDACTED_HEADERS}
+    limit = settings.LOG_MAX_HEADER_LENGTH
+    safe = {}
+    for name, value in headers.items():
+        if name.lower() in redacted:
+            safe[name] = "[REDACTED]"
+        elif len(value) > limit:
+            safe[name] = value[:limit] + "...[truncated]"
+        else:
+            safe[name] = value
+    return safe
+
 def log_exception_decorator(func):
     @wraps(func)
     async def wrapper(request: Request, exc: Exception, *args, **kwargs):
@@ -14,7 +39,7 @@ def log_exception_decorator(func):
             "request": {
                 "method": request.method,
                 "url": str(request.url),
-                "headers": dict(request.headers),
+                "headers": redact_headers(request.headers),
                 "client": request.client.host if request.client else None,
             }
         })
@@ -37,3 +62,88 @@ def register_exception_handlers(app: FastAPI) -> None:
                 "action": exc.action if exc.action else "Please provide a valid password."
             },
         )
+
+    @app.exception_handler(PasswordHashingBusyException)
+    @log_exception_decorator
+    async def password_hashing_busy_exception_handler(request: Request, exc: PasswordHashingBusyException):
+        return JSONResponse(
+            status_code=exc.http_status,
+            content={
+                "status": "error",
+                "message": str(exc),
+                "action": exc.action,
+            },
+            headers={"Retry-After": "1"},
+        )
+
+    @app.exception_handler(OTPRateLimitException)
+    @log_exception_decorator
+    async def otp_rate_limit_exception_handler(request: Request, exc: OTPRateLimitException):
+        return JSONResponse(
+            status_code=exc.http_status,
+            content={
+                "status": "error",
+                "message": str(exc),
+                "action": exc.action,
+            },
+        )
+
+    @app.exception_handler(LedgerAccountNotFoundException)
+    @log_exception_decorator
+    async def ledger_account_not_found_exception_handler(request: Request, exc: LedgerAccountNotFoundException):
+        return JSONResponse(
+            status_code=exc.http_status,
+            content={
+                "status": "error",
+                "message": str(exc),
+                "action": exc.action,
+            },
+        )
+
+    @app.exception_handler(InvalidJournalEntryException)
+    @log_exception_decorator
+    async def invalid_journal_entry_exception_handler(request: Request, exc: InvalidJournalEntryException):
+        return JSONResponse(
+            status_code=exc.http_status,
+            content={
+                "status": "error",
+                "message": str(exc),
+                "action": exc.action,
+            },
+        )
+
+    @app.exception_handler(InsufficientFundsException)
+    @log_exception_decorator
+    async def insufficient_funds_exception_handler(request: Request, exc: InsufficientFundsException):
+        return JSONResponse(
+            status_code=exc.http_status,
+            content={
+                "status": "error",
+                "message": str(exc),
+                "action": exc.action,
+            },
+        )
+
+    @app.exception_handler(IdempotencyKeyConflictException)
+    @log_exception_decorator
+    async def idempotency_key_conflict_exception_handler(request: Request, exc: IdempotencyKeyConflictException):
+        return JSONResponse(
+            status_code=exc.http_status,
+            content={
+                "status": "error",
+                "message": str(exc),
+                "action": exc.action,
+            },
+        )
+
+    @app.exception_handler(InvalidCursorException)
+    @log_exception_decorator
+    async def invalid_cursor_exception_handler(request: Request, exc: InvalidCursorException):
+        return JSONResponse(
+            status_code=exc.http_status,
+            content={
+                "status": "error",
+                "message": str(exc),
+                "action": exc.action,
+            },
+        )
@@ -1,4 +1,5 @@
 import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Awaitable, Callable, Dict, Optional
@@ -6,8 +7,10 @@ from typing import Any, Awaitable, Callable, Dict, Optional
 from sqlalchemy import text
 
 from core.celery_app import celery_app
-from core.db import async_session
+from core.db import get_sessionmaker
 from core.logger import get_logger
+from core.redis import get_redis
+from core.settings import settings
 
 logger = get_logger()
 
@@ -21,6 +24,14 @@ class ServiceStatus(str, Enum):
 
 
 class HealthCheck:
+    """Probe registered services and serve their status from a snapshot.
+
+    The dependency graph is resolved once into topological waves. Each
+    refresh cycle probes every service at most once, a wave at a time, and
+    marks services whose dependencies are not healthy as degraded without
+    probing them. Readers get the last snapshot without triggering probes
+    whenever a background refresh task is running.
+    """
 
     def __init__(self):
         self._services: Dict[str, ServiceStatus] = {}
@@ -31,10 +42,19 @@ class HealthCheck:
         self._max_retries: Dict[str, int] = {}
         self._lock = asyncio.Lock()
         self._dependencies: Dict[str, set[str]] = {}
+        self._waves: Optional[list[list[str]]] = None
 
         self._cache_duration: timedelta = timedelta(seconds=25)
         self._cached_status: Optional[Dict[str, Any]] = None
         self._last_check_time: Optional[datetime] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._cycle_lock = asyncio.Lock()
+        self._probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="health-probe")
+        self._broker_probe: Optional[Future] = None
+        self._worker_ping: Optional[Future] = None
+        self._critical: set[str] = set()
+        self.started = False
+        self.draining = False
 
     async def validate_dependencies(
         self, service_name: str, depends_on: list[str]
@@ -56,26 +76,57 @@ class HealthCheck:
         retry_delay: float = 1.0,
         max_retries: int = 3,
         depends_on: list[str] | None = None,
+        critical: bool = True,
     ) -> None:
+        if depends_on:
+            await self.validate_dependencies(service_name, depends_on)
+
         self._services[service_name] = ServiceStatus.STARTING
         self._check_functions[service_name] = check_function
         self._timeouts[service_name] = timeout
         self._retry_delays[service_name] = retry_delay
         self._max_retries[service_name] = max_retries
         self._last_check[service_name] = datetime.now(timezone.utc)
+        self._waves = None
+        if critical:
+            self._critical.add(service_name)
+        else:
+            self._critical.discard(service_name)
 
         if depends_on:
-            await self.validate_dependencies(service_name, depends_on)
             self._dependencies[service_name] = set(depends_on)
             logger.info(
                 f"Service '{service_name}' registered with dependencies: {depends_on}"
             )
 
+    def resolve_waves(self) -> list[list[str]]:
+        """Group services into waves where each wave only depends on earlier ones."""
+        if self._waves is not None:
+            return self._waves
+
+        remaining = {
+            service: set(self._dependencies.get(service, set()))
+            for service in self._services
+        }
+        waves: list[list[str]] = []
+        while remaining:
+            ready = sorted(service for service, deps in remaining.items() if not deps)
+            if not ready:
+                raise ValueError(
+                    f"Circular health check dependencies between: {sorted(remaining)}"
+                )
+            waves.append(ready)
+            for service in ready:
+                del remaining[service]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        self._waves = waves
+        return waves
+
     async def check_database(self) -> bool:
         try:
-            # TODO: load models
-            # TODO: add logger info
-            async with async_session() as session:
+            async with get_sessionmaker()() as session:
                 await session.execute(text("SELECT 1"))
                 await session.commit()
 
@@ -87,28 +138,55 @@ class HealthCheck:
 
     async def check_redis(self) -> bool:
         try:
-            redis_client = celery_app.backend.client
-            redis_client.ping()
+            await get_redis().ping()
             self._last_check["redis"] = datetime.now(timezone.utc)
             return True
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
             return False
 
-    async def check_celery(self) -> bool:
+    @staticmethod
+    def _connect_broker(timeout: float) -> None:
+        # Leaving the block sends Connection.Close and waits for Close-Ok,
+        # so RabbitMQ sees a clean disconnect rather than a dropped socket.
+        with celery_app.connection_for_write(connect_timeout=timeout) as connection:
+            connection.connect()
+
+    async def check_broker(self, timeout: float = 2.0) -> bool:
+        """Check that RabbitMQ accepts an AMQP connection.
+
+        kombu's I/O is blocking, so the connection is opened and closed on
+        the probe executor, and concurrent callers share one in-flight probe.
+        """
+        if self._broker_probe is None or self._broker_probe.done():
+            self._broker_probe = self._probe_executor.submit(self._connect_broker, timeout)
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.shield(asyncio.wrap_future(self._broker_probe))
+            return True
+        except Exception as e:
+            logger.error(f"Broker health check failed: {e!r}")
+            return False
+
+    async def _ping_workers(self, timeout: float) -> dict | None:
+        # control.inspect() is blocking kombu I/O. It runs on a small
+        # dedicated executor and concurrent callers share one in-flight
+        # ping, so a slow broker can neither stall the loop nor pile up
+        # threads; the inspect timeout bounds how long a thread is held.
+        if self._worker_ping is None or self._worker_ping.done():
+            self._worker_ping = self._probe_executor.submit(
+                lambda: celery_app.control.inspect(timeout=timeout).ping()
+            )
+        return await asyncio.shield(asyncio.wrap_future(self._worker_ping))
+
+    async def check_celery(self, timeout: float = 1.0) -> bool:
         try:
-            inspect = celery_app.control.inspect()
-            workers = inspect.ping()
+            if not await self.check_broker():
+                return False
 
+            workers = await self._ping_workers(timeout)
             if not workers:
-                conn = celery_app.connection()
-                try:
-                    conn.ensure_connection(max_retries=3)
-                    logger.warning("No celery workers found, but Rabbitmq is reachable")
-                    self._last_check["celery"] = datetime.now(timezone.utc)
-                    return True
-                finally:
-                    conn.close()
+                logger.warning("No celery workers found, but Rabbitmq is reachable")
 
             self._last_check["celery"] = datetime.now(timezone.utc)
             return True
@@ -116,116 +194,174 @@ class HealthCheck:
             logger.error(f"Celery health check failed: {e}")
             return False
 
-    async def check_service_health(
-        self, service_name: str, max_retries: int = 3
-    ) -> ServiceStatus:
-        if service_name in self._dependencies:
-            for dep in self._dependencies[service_name]:
-                dep_status = await self.check_service_health(dep)
-
-                if dep_status != ServiceStatus.HEALTHY:
-                    logger.error(
-                        f"Dependency {dep} not healthy for service {service_name}"
-                    )
-                    return ServiceStatus.DEGRADED
-
-        if service_name not in self._check_functions:
-            raise ValueError(f"Unknown service: {service_name}")
-        
+    async def _probe(self, service_name: str) -> ServiceStatus:
+        """Run one service's check with its timeout and retry policy."""
         check_func = self._check_functions[service_name]
         timeout = self._timeouts.get(service_name, 5.0)
         max_retries = self._max_retries[service_name]
         retry_delay = self._retry_delays[service_name]
-
-        metrics = {"attempts": 0, "total_delay": 0.0, "last_error": None}
+        last_error = None
 
         for attempt in range(max_retries):
-            metrics["attempts"] += 1
             try:
                 async with asyncio.timeout(timeout):
                     is_healthy = await check_func()
 
-                    if is_healthy:
-                        async with self._lock:
-                            self._services[service_name] = ServiceStatus.HEALTHY
-                            self._last_check[service_name] = datetime.now()
-
-                            if attempt > 0:
-                                logger.info(
-                                    f"Service {service_name} recovered after {metrics['attempts']} attempts"
-                                )
-                        return ServiceStatus.HEALTHY
-
-                    async with self._lock:
-                        self._services[service_name] = ServiceStatus.DEGRADED
-
+                if is_healthy:
+                    self._services[service_name] = ServiceStatus.HEALTHY
+                    self._last_check[service_name] = datetime.now(timezone.utc)
+                    if attempt > 0:
+                        logger.info(
+                            f"Service {service_name} recovered after {attempt + 1} attempts"
+                        )
+                    return ServiceStatus.HEALTHY
+
+                self._services[service_name] = ServiceStatus.DEGRADED
+                last_error = "check reported unhealthy"
             except asyncio.TimeoutError:
-                metrics["last_error"] = f"Timout after {timeout}s"
-                if attempt == max_retries - 1:
-                    logger.warning(
-                        f"Health check timeout for {service_name} after all retries"
-                    )
+                last_error = f"Timeout after {timeout}s"
             except Exception as e:
-                metrics["last_error"] = str(e)
-                if attempt == max_retries - 1:
-                    logger.error(f"Health check failed for {service_name}: {e}")
+                last_error = str(e)
 
-            metrics["total_delay"] += retry_delay
-            await asyncio.sleep(retry_delay)
-
-        async with self._lock:
-            self._services[service_name] = ServiceStatus.UNHEALTHY
-            logger.error(
-                f"Service {service_name} unhealthy after {max_retries} attempts: {metrics['last_error']}"
-            )
+            if attempt < max_retries - 1:
+                await asyncio.sleep(retry_delay)
 
+        self._services[service_name] = ServiceStatus.UNHEALTHY
+        self._last_check[service_name] = datetime.now(timezone.utc)
+        logger.error(
+            f"Service {service_name} unhealthy after {max_retries} attempts: {last_error}"
+        )
         return ServiceStatus.UNHEALTHY
 
+    async def check_service_health(self, service_name: str) -> ServiceStatus:
+        """Probe a single service, using its dependencies' last known status."""
+        if service_name not in self._check_functions:
+            raise ValueError(f"Unknown service: {service_name}")
+
+        for dep in self._dependencies.get(service_name, set()):
+            if self._services.get(dep) != ServiceStatus.HEALTHY:
+                logger.error(f"Dependency {dep} not healthy for service {service_name}")
+                self._services[service_name] = ServiceStatus.DEGRADED
+                return ServiceStatus.DEGRADED
+
+        return await self._probe(service_name)
+
+    async def run_cycle(self) -> Dict[str, Any]:
+        """Probe every service once, wave by wave, and publish a new snapshot."""
+        async with self._cycle_lock:
+            results: Dict[str, ServiceStatus | BaseException] = {}
+            for wave in self.resolve_waves():
+                to_probe = []
+                for service in wave:
+                    deps = self._dependencies.get(service, set())
+                    if any(results.get(dep) != ServiceStatus.HEALTHY for dep in deps):
+                        self._services[service] = ServiceStatus.DEGRADED
+                        results[service] = ServiceStatus.DEGRADED
+                    else:
+                        to_probe.append(service)
+
+                outcomes = await asyncio.gather(
+                    *(self._probe(service) for service in to_probe),
+                    return_exceptions=True,
+                )
+                results.update(zip(to_probe, outcomes))
+
+            current_time = datetime.now(timezone.utc)
+            health_status: Dict[str, Any] = {
+                "status": ServiceStatus.HEALTHY,
+                "timestamp": current_time.isoformat(),
+                "services": {},
+            }
+            for service, result in results.items():
+                entry: Dict[str, Any] = {"last_check": self._last_check[service].isoformat()}
+                if isinstance(result, BaseException):
+                    entry.update(status=ServiceStatus.UNHEALTHY, error=str(result))
+                else:
+                    entry["status"] = result
+                if entry["status"] != ServiceStatus.HEALTHY:
+                    health_status["status"] = ServiceStatus.DEGRADED
+                health_status["services"][service] = entry
+
+            self._cached_status = health_status
+            self._last_check_time = current_time
+            return health_status
+
+    def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Return the last published snapshot without probing anything."""
+        return self._cached_status
+
+    def mark_started(self) -> None:
+        self.started = True
+        self.draining = False
+
+    def mark_draining(self) -> None:
+        self.draining = True
+
+    def readiness(self) -> tuple[bool, str]:
+        """Decide from the snapshot whether this worker should receive traffic.
+
+        Returns:
+            tuple[bool, str]: Whether the worker is ready and why not.
+        """
+        if not self.started:
+            return False, "starting"
+        if self.draining:
+            return False, "draining"
+        snapshot = self._cached_status
+        if snapshot is None:
+            return False, "awaiting first health check"
+        for service in self._critical:
+            status = snapshot["services"].get(service, {}).get("status")
+            if status != ServiceStatus.HEALTHY:
+                return False, f"{service} is {ServiceStatus(status).value if status else 'unknown'}"
+        return True, "ready"
+
     async def check_all_services(self) -> Dict[str, Any]:
+        snapshot = self._cached_status
+        if snapshot is not None and self.is_refreshing:
+            return snapshot
+
         current_time = datetime.now(timezone.utc)
         if (
-            self._cached_status is not None
+            snapshot is not None
             and self._last_check_time is not None
             and (current_time - self._last_check_time) < self._cache_duration
         ):
-            return self._cached_status
+            return snapshot
 
-        async with self._lock:
-            services = list(self._services.keys())
-        tasks = [self.check_service_health(service) for service in services]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        health_status = {
-            "status": ServiceStatus.HEALTHY,
-            "timestamp": current_time.isoformat(),
-            "services": {},
-        }
+        return await self.run_cycle()
 
-        for service, result in zip(services, results):
-            if isinstance(result, Exception):
-                health_status["services"][service] = {
-                    "status": ServiceStatus.UNHEALTHY,
-                    "error": str(result),
-                    "last_check": self._last_check[service].isoformat(),
-                }
-                health_status["status"] = ServiceStatus.DEGRADED
-            else:
-                health_status["services"][service] = {
-                    "status": result,
-                    "last_check": self._last_check[service].isoformat(),
-                }
-                if result != ServiceStatus.HEALTHY:
-                    health_status["status"] = ServiceStatus.DEGRADED
-        self._cached_status = health_status
-        self._last_check_time = current_time
+    @property
+    def is_refreshing(self) -> bool:
+        return self._refresh_task is not None and not self._refresh_task.done()
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logger.error(f"Health check cycle failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = 15.0) -> None:
+        """Refresh the snapshot in the background every ``interval`` seconds."""
+        if not self.is_refreshing:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(interval))
 
-        return health_status
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
 
     async def wait_for_services(self, timeout: float = 30.0) -> bool:
         try:
-            start_time = datetime.now()
-            while (datetime.now() - start_time) < timedelta(seconds=timeout):
-                status = await self.check_all_services()
+            start_time = datetime.now(timezone.utc)
+            while (datetime.now(timezone.utc) - start_time) < timedelta(seconds=timeout):
+                status = await self.run_cycle()
                 if status["status"] == ServiceStatus.HEALTHY:
                     return True
                 await asyncio.sleep(1)
@@ -235,6 +371,7 @@ class HealthCheck:
             return False
 
     async def cleanup(self) -> None:
+        await self.stop()
         async with self._lock:
             self._services.clear()
             self._check_functions.clear()
@@ -242,6 +379,21 @@ class HealthCheck:
             self._timeouts.clear()
             self._retry_delays.clear()
             self._max_retries.clear()
+            self._dependencies.clear()
+            self._critical.clear()
+            self._waves = None
+            self._cached_status = None
+            self._last_check_time = None
+
+
+health_checker = HealthCheck()
 
 
-health_checker = HealthCheck()
\ No newline at end of file
+async def register_services(checker: HealthCheck = health_checker) -> None:
+    """Register the infrastructure the API depends on."""
+    await checker.add_service("database", checker.check_database)
+    await checker.add_service("redis", checker.check_redis)
+    # The API keeps serving without workers; emails just queue up.
+    await checker.add_service(
+        "celery", checker.check_celery, depends_on=["redis"], critical=False
+    )
@@ -0,0 +1,252 @@
+import base64
+import hashlib
+import json
+import re
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.domain.exceptions import IdempotencyKeyConflictException
+from core.logger import get_logger
+from core.metrics import IDEMPOTENCY_REQUESTS_TOTAL
+from core.redis import get_redis
+from core.settings import settings
+
+logger = get_logger()
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+_KEY_PATTERN = re.compile(r"^[\x21-\x7e]{1,255}$")
+# Headers that identify the caller, so two clients cannot share a key.
+_CLIENT_HEADERS = ("authorization", "x-admin-token")
+
+
+def fingerprint(method: str, path: str, query_string: bytes, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query_string, body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def client_scope(headers: dict[str, str]) -> str:
+    credentials = "|".join(headers.get(name, "") for name in _CLIENT_HEADERS)
+    return hashlib.sha256(credentials.encode()).hexdigest()[:16]
+
+
+class IdempotencyStore:
+    """Keep the state of idempotent requests in Redis.
+
+    A key starts as an in-flight lock taken with ``SET NX`` and is replaced
+    by the finished response. The lock expires after
+    ``IDEMPOTENCY_LOCK_SECONDS``, so a crashed worker cannot block a key
+    forever. Responses are kept for ``IDEMPOTENCY_TTL_SECONDS``.
+    """
+
+    def __init__(self, redis: Redis | None = None):
+        self._redis = redis
+
+    @property
+    def redis(self) -> Redis:
+        return self._redis or get_redis()
+
+    @staticmethod
+    def _key(scope: str, idempotency_key: str) -> str:
+        return f"idempotency:{scope}:{idempotency_key}"
+
+    async def get(self, scope: str, idempotency_key: str) -> dict[str, Any] | None:
+        record = await self.redis.get(self._key(scope, idempotency_key))
+        return json.loads(record) if record is not None else None
+
+    async def lock(self, scope: str, idempotency_key: str, request_fingerprint: str) -> bool:
+        """Claim the key for a new request; False if another request holds it."""
+        record = json.dumps({"state": "in_flight", "fingerprint": request_fingerprint})
+        return bool(await self.redis.set(
+            self._key(scope, idempotency_key), record, nx=True, ex=settings.IDEMPOTENCY_LOCK_SECONDS
+        ))
+
+    async def complete(
+        self,
+        scope: str,
+        idempotency_key: str,
+        request_fingerprint: str,
+        status: int,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+    ) -> None:
+        record = {
+            "state": "done",
+            "fingerprint": request_fingerprint,
+            "status": status,
+            "headers": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in headers],
+            "body": base64.b64encode(body).decode(),
+        }
+        await self.redis.set(
+            self._key(scope, idempotency_key), json.dumps(record), ex=settings.IDEMPOTENCY_TTL_SECONDS
+        )
+
+    async def release(self, scope: str, idempotency_key: str) -> None:
+        await self.redis.delete(self._key(scope, idempotency_key))
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _conflict(message: str) -> JSONResponse:
+    exc = IdempotencyKeyConflictException(message)
+    return JSONResponse(
+        status_code=exc.http_status,
+        content={"status": "error", "message": str(exc), "action": exc.action},
+        headers={"Retry-After": "1"},
+    )
+
+
+class IdempotencyMiddleware:
+    """Replay the stored response when a request repeats its ``Idempotency-Key``.
+
+    Applies to ``IDEMPOTENCY_METHODS`` requests that send the header. The
+    first request claims the key and runs normally. Its response is stored
+    unless it is a 5xx or larger than ``IDEMPOTENCY_MAX_RESPONSE_BYTES``.
+    A retry with the same method, path, query and body gets that response
+    back from Redis, marked ``Idempotent-Replayed: true``, and never reaches
+    the route or the database. A retry that arrives while the first request
+    is still running, or that reuses the key for a different request, gets
+    a 409. If Redis is unavailable, requests are served without
+    deduplication.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore = idempotency_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in settings.IDEMPOTENCY_METHODS:
+            await self.app(scope, receive, send)
+            return
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not _KEY_PATTERN.match(idempotency_key):
+            response = JSONResponse(
+                status_code=400,
+                content={
+                    "status": "error",
+                    "message": "Invalid Idempotency-Key header.",
+                    "action": "Send 1 to 255 printable ASCII characters.",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        body, receive = await self._buffer_body(receive)
+        client = client_scope(headers)
+        request_fingerprint = fingerprint(scope["method"], scope["path"], scope["query_string"], body)
+
+        try:
+            claimed = await self.store.lock(client, idempotency_key, request_fingerprint)
+            record = None if claimed else await self.store.get(client, idempotency_key)
+        except RedisError as e:
+            logger.warning(f"Idempotency store unavailable, serving without deduplication: {e}")
+            IDEMPOTENCY_REQUESTS_TOTAL.labels(outcome="unavailable").inc()
+            await self.app(scope, receive, send)
+            return
+
+        if not claimed:
+            await self._respond_to_duplicate(record, request_fingerprint, scope, receive, send)
+            return
+        await self._run_and_store(client, idempotency_key, request_fingerprint, scope, receive, send)
+
+    @staticmethod
+    async def _buffer_body(receive: Receive) -> tuple[bytes, Receive]:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay_receive() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return body, replay_receive
+
+    async def _respond_to_duplicate(
+        self, record: dict[str, Any] | None, request_fingerprint: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if record is None:
+            # The holder finished and released the key between our two calls.
+            IDEMPOTENCY_REQUESTS_TOTAL.labels(outcome="in_flight").inc()
+            await _conflict("A request with this idempotency key was just processed; retry.")(scope, receive, send)
+        elif record["fingerprint"] != request_fingerprint:
+            IDEMPOTENCY_REQUESTS_TOTAL.labels(outcome="mismatch").inc()
+            await _conflict("Idempotency key already used for a different request.")(scope, receive, send)
+        elif record["state"] != "done":
+            IDEMPOTENCY_REQUESTS_TOTAL.labels(outcome="in_flight").inc()
+            await _conflict("A request with this idempotency key is still being processed.")(scope, receive, send)
+        else:
+            IDEMPOTENCY_REQUESTS_TOTAL.labels(outcome="replayed").inc()
+            await send({
+                "type": "http.response.start",
+                "status": record["status"],
+                "headers": [
+                    *((k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]),
+                    (REPLAYED_HEADER.encode(), b"true"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
+
+    async def _run_and_store(
+        self,
+        client: str,
+        idempotency_key: str,
+        request_fingerprint: str,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        status_code = 500
+        response_headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+        size = 0
+        complete = False
+
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status_code, response_headers, size, complete
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                size += len(body)
+                if size <= settings.IDEMPOTENCY_MAX_RESPONSE_BYTES:
+                    chunks.append(body)
+                complete = not message.get("more_body", False)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_capture)
+        finally:
+            storable = complete and status_code < 500 and size <= settings.IDEMPOTENCY_MAX_RESPONSE_BYTES
+            try:
+                if storable:
+                    await self.store.complete(
+                        client, idempotency_key, request_fingerprint, status_code, response_headers, b"".join(chunks)
+                    )
+                else:
+                    await self.store.release(client, idempotency_key)
+            except RedisError as e:
+                logger.error(f"Failed to record idempotent response for key {idempotency_key}: {e}")
+            IDEMPOTENCY_REQUESTS_TOTAL.labels(outcome="stored" if storable else "not_stored").inc()
@@ -0,0 +1,110 @@
+"""Report where import time goes for the app's entry points.
+
+Each entry point is imported in a fresh interpreter under ``-X importtime``,
+and the slowest modules are listed by cumulative and self time. The peak
+RSS of that interpreter is reported too. Entry points use ``module`` or
+``module:callable``; a callable is invoked after import, so app factories
+are measured as well.
+
+Usage: ``python -m core.importtime main:create_app core.celery_app --top 15``
+"""
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+APP_ROOT = Path(__file__).parent.parent
+
+_PROBE = """
+import importlib, json, resource, sys, time
+module_name, _, attr = sys.argv[1].partition(":")
+start = time.perf_counter()
+module = importlib.import_module(module_name)
+if attr:
+    getattr(module, attr)()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    entry_point: str
+    seconds: float
+    max_rss_kb: int
+    timings: list[ImportTiming] = field(default_factory=list)
+
+    def slowest(self, top: int, key: str = "cumulative_us") -> list[ImportTiming]:
+        return sorted(self.timings, key=lambda t: getattr(t, key), reverse=True)[:top]
+
+    def by_package(self) -> dict[str, int]:
+        """Sum self time per top-level package."""
+        totals: dict[str, int] = {}
+        for timing in self.timings:
+            package = timing.module.split(".")[0]
+            totals[package] = totals.get(package, 0) + timing.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse ``-X importtime`` lines from a stderr dump."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def measure(entry_point: str) -> ImportReport:
+    """Import ``entry_point`` in a fresh interpreter and collect timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, entry_point],
+        cwd=APP_ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {entry_point} failed:\n{result.stderr[-2000:]}")
+    summary = json.loads(result.stdout.strip().splitlines()[-1])
+    return ImportReport(
+        entry_point=entry_point,
+        seconds=summary["seconds"],
+        max_rss_kb=summary["max_rss_kb"],
+        timings=parse_importtime(result.stderr),
+    )
+
+
+def format_report(report: ImportReport, top: int) -> str:
+    lines = [
+        f"== {report.entry_point}: {report.seconds * 1000:.0f} ms, "
+        f"{len(report.timings)} modules, max RSS {report.max_rss_kb / 1024:.1f} MiB",
+        f"-- top {top} by cumulative time (ms)",
+    ]
+    lines += [f"{t.cumulative_us / 1000:10.1f}  {t.module}" for t in report.slowest(top)]
+    lines.append(f"-- top {top} packages by self time (ms)")
+    lines += [f"{us / 1000:10.1f}  {package}" for package, us in list(report.by_package().items())[:top]]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report import time for app entry points.")
+    parser.add_argument("entry_points", nargs="*", default=["main:create_app", "core.celery_app"])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for entry_point in args.entry_points:
+        print(format_report(measure(entry_point), args.top))
@@ -1,10 +1,38 @@
+import atexit
 import os
+import queue
+import sys
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable
+
 from loguru import logger
 
+from core.metrics import LOG_QUEUE_OVERFLOWS_TOTAL, LOG_RECORDS_DROPPED_TOTAL
 from core.settings import settings
 
 logger.remove()
 
+# Correlation ids for the current request or Celery task, set by
+# core.middleware and the Celery signal handlers.
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+trace_id_var: ContextVar[str | None] = ContextVar("trace_id", default=None)
+task_id_var: ContextVar[str | None] = ContextVar("task_id", default=None)
+# Whether DEBUG/INFO records of the current request survive sampling.
+log_sampled_var: ContextVar[bool] = ContextVar("log_sampled", default=True)
+
+_CONTEXT_VARS = {"request_id": request_id_var, "trace_id": trace_id_var, "task_id": task_id_var}
+
+
+def _add_context(record: dict[str, Any]) -> None:
+    for key, var in _CONTEXT_VARS.items():
+        value = var.get()
+        if value is not None:
+            record["extra"].setdefault(key, value)
+
+
+logger.configure(patcher=_add_context)
+
 FORMAT = (
     "{time:YYYY-MM-DD HH:mm:ss.SSS} | "
     "{level: <8} | "
@@ -12,28 +40,163 @@ FORMAT = (
     "{message}"
 )
 
-logger.add(
-    os.path.join(settings.LOG_DIR, "debug.log"),
-    serialize=True,
-    # format=FORMAT,
-    level="DEBUG" if settings.ENVIRONMENT == "development" else "INFO",
-    filter=lambda record: record["level"].no <= logger.level("WARNING").no,
-    rotation="10 MB",
-    retention="10 days",
-    compression="zip",
-)
+# Set on the thread that drains the queue, so its replayed records reach the
+# real sinks instead of being queued again. Sinks added elsewhere must use
+# the same filter or they will see every record twice.
+_replaying = threading.local()
 
-logger.add(
-    sink=os.path.join(settings.LOG_DIR, "error.log"),
-    serialize=True,
-    # format=FORMAT,
-    level="ERROR",
-    rotation="10MB",
-    retention="30 days",
-    compression="zip",
-    backtrace=True,
-    diagnose=True,
-)
+
+def _is_replay(record: dict[str, Any]) -> bool:
+    return getattr(_replaying, "active", False)
+
+
+def _replay(record: dict[str, Any]) -> None:
+    logger.patch(lambda r: r.update(record)).log(record["level"].name, record["message"])
+
+
+class LogQueueSink:
+    """Loguru sink that hands records to a background thread.
+
+    The calling coroutine only pays for a ``put_nowait``; serialisation,
+    file I/O, rotation and compression happen on the worker. The queue is
+    bounded: when it is full, records below WARNING are dropped and counted,
+    and WARNING and above wait up to ``block_seconds`` for room before they
+    are dropped as well.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[dict[str, Any]], None],
+        max_size: int,
+        block_seconds: float = 0.1,
+    ):
+        self._emit = emit
+        self.max_size = max_size
+        self.block_seconds = block_seconds
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.overflows = 0
+        self._start()
+        if hasattr(os, "register_at_fork"):
+            # Threads do not survive fork(); prefork Celery children need their own.
+            os.register_at_fork(after_in_child=self._start)
+
+    def _start(self) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_size)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        _replaying.active = True
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            try:
+                self._emit(record)
+            except Exception as e:
+                print(f"Failed to write log record: {e}", file=sys.stderr)
+
+    def write(self, message: Any) -> None:
+        record = message.record
+        try:
+            self._queue.put_nowait(record)
+            return
+        except queue.Full:
+            with self._lock:
+                self.overflows += 1
+            LOG_QUEUE_OVERFLOWS_TOTAL.inc()
+
+        if record["level"].no >= logger.level("WARNING").no:
+            try:
+                self._queue.put(record, timeout=self.block_seconds)
+                return
+            except queue.Full:
+                pass
+        with self._lock:
+            self.dropped += 1
+        LOG_RECORDS_DROPPED_TOTAL.labels(level=record["level"].name).inc()
+
+    def fill_ratio(self) -> float:
+        return self._queue.qsize() / self.max_size if self.max_size > 0 else 0.0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_size": self.max_size,
+                "dropped": self.dropped,
+                "overflows": self.overflows,
+            }
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush queued records and stop the worker thread."""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+
+def _passes_sampling(record: dict[str, Any]) -> bool:
+    """Drop DEBUG/INFO records of unsampled requests while logging is under load."""
+    if log_sampled_var.get() or record["level"].no >= logger.level("WARNING").no:
+        return True
+    if log_queue is None:
+        return False
+    return log_queue.fill_ratio() < settings.LOG_SAMPLE_QUEUE_THRESHOLD
+
+
+log_queue: LogQueueSink | None = None
+# Without the queue the real sinks accept every sampled record.
+_sink_filter: Callable[[dict[str, Any]], bool] = _passes_sampling
+
+if settings.LOG_ASYNC:
+    log_queue = LogQueueSink(_replay, settings.LOG_QUEUE_SIZE, settings.LOG_QUEUE_BLOCK_SECONDS)
+    atexit.register(log_queue.stop)
+    _sink_filter = _is_replay
+    logger.add(
+        log_queue,
+        format="{message}",
+        level="DEBUG" if settings.ENVIRONMENT == "development" else "INFO",
+        filter=lambda record: not _is_replay(record) and _passes_sampling(record),
+    )
+
+if settings.LOG_STDOUT_JSON:
+    logger.add(
+        sys.stdout,
+        serialize=True,
+        level="DEBUG" if settings.ENVIRONMENT == "development" else "INFO",
+        filter=_sink_filter,
+        backtrace=True,
+        diagnose=settings.ENVIRONMENT == "development",
+    )
+else:
+    logger.add(
+        os.path.join(settings.LOG_DIR, "debug.log"),
+        serialize=True,
+        # format=FORMAT,
+        level="DEBUG" if settings.ENVIRONMENT == "development" else "INFO",
+        filter=lambda record: _sink_filter(record) and record["level"].no <= logger.level("WARNING").no,
+        rotation="10 MB",
+        retention="10 days",
+        compression="zip",
+    )
+
+    logger.add(
+        sink=os.path.join(settings.LOG_DIR, "error.log"),
+        serialize=True,
+        # format=FORMAT,
+        level="ERROR",
+        filter=_sink_filter,
+        rotation="10MB",
+        retention="30 days",
+        compression="zip",
+        backtrace=True,
+        # Rendering local variables is slow and leaks values outside development.
+        diagnose=settings.ENVIRONMENT == "development",
+    )
 
 def get_logger():
-    return logger
\ No newline at end of file
+    return logger
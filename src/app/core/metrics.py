@@ -0,0 +1,122 @@
+"""Prometheus metrics shared by the API and Celery processes.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set (it must exist and be emptied before
+the workers start), each process writes its samples there and
+``build_registry`` aggregates them on scrape; gauges declare how
+per-process values are combined.
+"""
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from prometheus_client.registry import REGISTRY
+
+DB_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_connection_checkout_wait_seconds",
+    "Time a session waited to obtain a pooled database connection.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_TRANSACTION_SECONDS = Histogram(
+    "db_transaction_duration_seconds",
+    "Duration of database transactions, from BEGIN to commit or rollback.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_SESSION_STATEMENTS = Histogram(
+    "db_session_statements",
+    "Number of SQL statements executed per database session.",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+DB_SESSION_ERRORS_TOTAL = Counter(
+    "db_session_errors_total",
+    "Database sessions that ended with an exception.",
+)
+DB_SLOW_TRANSACTIONS_TOTAL = Counter(
+    "db_slow_transactions_total",
+    "Transactions slower than DB_SLOW_TRANSACTION_MS.",
+)
+LOG_RECORDS_DROPPED_TOTAL = Counter(
+    "log_records_dropped_total",
+    "Log records discarded because the logging queue was full.",
+    ["level"],
+)
+LOG_QUEUE_OVERFLOWS_TOTAL = Counter(
+    "log_queue_overflows_total",
+    "Times a record found the logging queue full.",
+)
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Argon2 operations running or waiting on a password hashing pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_QUEUED = Gauge(
+    "password_hash_queued",
+    "Argon2 operations waiting for a free password hashing worker.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTED_TOTAL = Counter(
+    "password_hash_rejected_total",
+    "Argon2 operations rejected because the password hashing queue was full.",
+    ["pool"],
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Duration of individual SQL statements by statement type.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled database connections by state.",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+CELERY_TASK_SECONDS = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time by task and final state.",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+CELERY_TASK_QUEUE_SECONDS = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time between publishing a Celery task and a worker starting it.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+IDEMPOTENCY_REQUESTS_TOTAL = Counter(
+    "idempotency_requests_total",
+    "Requests carrying an Idempotency-Key, by how they were handled.",
+    ["outcome"],
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def build_registry() -> CollectorRegistry:
+    """Return the registry to expose, aggregating all processes if enabled."""
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_process_dead(pid: int | None = None) -> None:
+    """Drop a finished process's live gauges from the multiprocess directory."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
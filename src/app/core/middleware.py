@@ -0,0 +1,107 @@
+import random
+import re
+import time
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.logger import log_sampled_var, request_id_var, trace_id_var
+from core.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_PROGRESS
+from core.settings import settings
+
+REQUEST_ID_HEADER = "x-request-id"
+# Client-supplied ids are echoed into logs and headers, so only accept tame ones.
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{8,128}$")
+# W3C trace context: version-traceid-parentid-flags
+_TRACEPARENT_PATTERN = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-[0-9a-f]{16}-[0-9a-f]{2}$")
+
+
+def extract_ids(headers: dict[str, str]) -> tuple[str, str]:
+    """Return ``(request_id, trace_id)`` for a request, generating what is missing."""
+    request_id = headers.get(REQUEST_ID_HEADER, "")
+    if not _REQUEST_ID_PATTERN.match(request_id):
+        request_id = uuid.uuid4().hex
+    match = _TRACEPARENT_PATTERN.match(headers.get("traceparent", ""))
+    trace_id = match.group(1) if match else request_id
+    return request_id, trace_id
+
+
+class RequestContextMiddleware:
+    """Bind a request id and trace id to every log record of a request.
+
+    The ids are taken from ``X-Request-ID`` and ``traceparent`` when the
+    caller sends valid ones, stored in context variables for the logger
+    patcher and Celery publish signal, and the request id is echoed back in
+    the response. The request's log sampling decision is made here too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        request_id, trace_id = extract_ids(headers)
+        tokens = (
+            request_id_var.set(request_id),
+            trace_id_var.set(trace_id),
+            log_sampled_var.set(random.random() < settings.LOG_SAMPLE_RATE),
+        )
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (REQUEST_ID_HEADER.encode(), request_id.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            for var, token in zip((request_id_var, trace_id_var, log_sampled_var), tokens):
+                var.reset(token)
+
+
+class MetricsMiddleware:
+    """Record request latency per route template and in-flight requests.
+
+    Routes are labelled with their path template (``/users/{id}``) once the
+    router has matched them, so metric cardinality stays bounded; requests
+    that match no route share a single ``unmatched`` label.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method=method,
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            ).observe(time.perf_counter() - started_at)
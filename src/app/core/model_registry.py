@@ -1,6 +1,18 @@
+"""Discover and import every app's ``models`` module.
+
+Walking the source tree on every boot is slow on cold containers, so the
+discovered module list is cached in ``model_manifest.json`` next to this
+file. Startup only imports what the manifest lists; regenerate it after
+adding an app with models:
+
+    python -m core.model_registry --write
+"""
+import argparse
 import importlib
+import json
 import os
 import pathlib
+import sys
 
 # from core.logger import get_logger
 import logging
@@ -8,43 +20,71 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ROOT_PATH = pathlib.Path(__file__).parent.parent
+MANIFEST_PATH = pathlib.Path(__file__).with_name("model_manifest.json")
+EXCLUDED_DIRS = {
+    "tests",
+    "migrations",
+    "__pycache__",
+    "venv",
+    ".venv",
+    "env",
+}
+
 def discover_models() -> list[str]:
     models_modules = []
-    root_path = pathlib.Path(__file__).parent.parent
-
-    for root, _, files in os.walk(root_path):
-        if any(part in root for part in [
-            "tests", 
-            "migrations", 
-            "__pycache__",
-            "venv",
-            ".venv",
-            "env",
-            "__pycache__",
-        ]):
-            continue
 
-        if "models.py" in files:
-            rel_path = os.path.relpath(root, root_path)
-            module_path = rel_path.replace(os.path.sep, ".")
+    for root, dirs, files in os.walk(ROOT_PATH):
+        # Prune in place so excluded trees are never descended into.
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS and not d.startswith("."))
 
-            if module_path == ".":
-                full_module_path = "app.models"
+        if "models.py" in files:
+            rel_path = os.path.relpath(root, ROOT_PATH)
+            if rel_path == ".":
+                module_path = "models"
             else:
-                full_module_path = f"app.{module_path}.models"
+                module_path = f"{rel_path.replace(os.path.sep, '.')}.models"
 
-            logger.debug(f"Discovered models file in: {full_module_path}")
+            logger.debug(f"Discovered models file in: {module_path}")
 
-            models_modules.append(full_module_path)
+            models_modules.append(module_path)
     return models_modules
 
-def load_models() -> None:
-    models_modules = discover_models()
+def read_manifest(path: pathlib.Path = MANIFEST_PATH) -> list[str] | None:
+    """Return the cached module list, or None if there is no usable manifest."""
+    try:
+        return json.loads(path.read_text())["modules"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Model manifest {path} unavailable, falling back to discovery: {e}")
+        return None
+
+def write_manifest(path: pathlib.Path = MANIFEST_PATH) -> list[str]:
+    """Rediscover models and write the manifest."""
+    modules = discover_models()
+    path.write_text(json.dumps({"modules": modules}, indent=2) + "\n")
+    return modules
+
+def load_models(use_manifest: bool = True) -> None:
+    models_modules = (read_manifest() if use_manifest else None) or discover_models()
     for module_path in models_modules:
         try:
-            importlib.import_module(module_path.split("app.")[1])
+            importlib.import_module(module_path)
             logger.info(f"Successfully imported models from: {module_path}")
         except ImportError as e:
             logger.error(f"Failed to import models from: {module_path}. Error: {e}")
         except Exception as e:
-            logger.error(f"An unexpected error occurred while importing {module_path}: {e}")
\ No newline at end of file
+            logger.error(f"An unexpected error occurred while importing {module_path}: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the cached model manifest.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--write", action="store_true", help="regenerate the manifest")
+    group.add_argument("--check", action="store_true", help="fail if the manifest is stale")
+    args = parser.parse_args()
+
+    if args.write:
+        print("\n".join(write_manifest()))
+    elif read_manifest() != discover_models():
+        print(f"{MANIFEST_PATH} is stale, run: python -m core.model_registry --write")
+        sys.exit(1)
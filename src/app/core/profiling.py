@@ -0,0 +1,174 @@
+import asyncio
+import json
+import random
+import secrets
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from redis.asyncio import Redis
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.db import captured_queries
+from core.logger import get_logger, request_id_var
+from core.redis import get_redis
+from core.settings import settings
+
+logger = get_logger()
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+
+
+class ProfileStore:
+    """Keep the most recent profiling reports in Redis.
+
+    Reports are shared by every worker process, so the admin route can
+    serve a profile captured by any of them. Each report expires after
+    ``PROFILING_REPORT_TTL_SECONDS`` and the index keeps the newest
+    ``PROFILING_MAX_REPORTS``.
+    """
+
+    INDEX_KEY = "profiling:reports"
+
+    def __init__(self, redis: Redis | None = None):
+        self._redis = redis
+        self._pending: set[asyncio.Task] = set()
+
+    @property
+    def redis(self) -> Redis:
+        return self._redis or get_redis()
+
+    @staticmethod
+    def _summary_key(profile_id: str) -> str:
+        return f"profiling:report:{profile_id}:summary"
+
+    @staticmethod
+    def _html_key(profile_id: str) -> str:
+        return f"profiling:report:{profile_id}:html"
+
+    async def save(self, summary: dict[str, Any], html: str) -> None:
+        profile_id = summary["id"]
+        ttl = settings.PROFILING_REPORT_TTL_SECONDS
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._summary_key(profile_id), json.dumps(summary), ex=ttl)
+            pipe.set(self._html_key(profile_id), html, ex=ttl)
+            pipe.zadd(self.INDEX_KEY, {profile_id: time.time()})
+            pipe.zremrangebyrank(self.INDEX_KEY, 0, -settings.PROFILING_MAX_REPORTS - 1)
+            await pipe.execute()
+
+    def save_in_background(self, summary: dict[str, Any], render_html: Callable[[], str]) -> None:
+        """Render and store a report without holding up the request that produced it.
+
+        Rendering walks the whole call tree, so it runs on a worker thread.
+        """
+        task = asyncio.create_task(self._render_and_save(summary, render_html))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _render_and_save(self, summary: dict[str, Any], render_html: Callable[[], str]) -> None:
+        try:
+            await self.save(summary, await asyncio.to_thread(render_html))
+        except Exception as e:
+            logger.error(f"Failed to store profile {summary['id']}: {e}")
+
+    async def wait_for_saves(self) -> None:
+        """Wait until reports handed to ``save_in_background`` are stored."""
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+    async def recent(self) -> list[dict[str, Any]]:
+        """Return summaries of stored reports, newest first."""
+        profile_ids = await self.redis.zrevrange(self.INDEX_KEY, 0, -1)
+        if not profile_ids:
+            return []
+        summaries = await self.redis.mget([self._summary_key(pid) for pid in profile_ids])
+        return [
+            {k: v for k, v in json.loads(summary).items() if k != "queries"}
+            for summary in summaries
+            if summary is not None
+        ]
+
+    async def get(self, profile_id: str) -> dict[str, Any] | None:
+        summary = await self.redis.get(self._summary_key(profile_id))
+        return json.loads(summary) if summary is not None else None
+
+    async def get_html(self, profile_id: str) -> str | None:
+        return await self.redis.get(self._html_key(profile_id))
+
+
+profile_store = ProfileStore()
+
+
+def _is_admin(token: str) -> bool:
+    return bool(settings.ADMIN_API_TOKEN) and secrets.compare_digest(token, settings.ADMIN_API_TOKEN)
+
+
+class ProfilingMiddleware:
+    """Capture a sampling profile and SQL timings for selected requests.
+
+    A request is profiled when it sends ``X-Profile: 1`` together with a
+    valid ``X-Admin-Token``, or when it falls within
+    ``PROFILING_SAMPLE_RATE``. The report id is returned in
+    ``X-Profile-Id`` and the report is served from ``/admin/profiles``.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+
+    def _should_profile(self, headers: dict[str, str]) -> bool:
+        if headers.get(PROFILE_HEADER) == "1" and _is_admin(headers.get("x-admin-token", "")):
+            return True
+        return random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        if not self._should_profile(headers):
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (PROFILE_ID_HEADER.encode(), profile_id.encode()),
+                ]
+            await send(message)
+
+        queries: list[dict[str, Any]] = []
+        token = captured_queries.set(queries)
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled")
+        started_at = datetime.now(timezone.utc)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session = profiler.stop()
+            captured_queries.reset(token)
+            summary = {
+                "id": profile_id,
+                "request_id": request_id_var.get(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(scope.get("route"), "path", None),
+                "status": status_code,
+                "started_at": started_at.isoformat(),
+                "duration_ms": round(session.duration * 1000, 3),
+                "cpu_ms": round(session.cpu_time * 1000, 3),
+                "sql_count": len(queries),
+                "sql_ms": round(sum(q["ms"] for q in queries), 3),
+                "queries": queries,
+            }
+            self.store.save_in_background(summary, profiler.output_html)
@@ -0,0 +1,20 @@
+from redis.asyncio import Redis
+
+from core.settings import settings
+
+_redis: Redis | None = None
+
+
+def get_redis() -> Redis:
+    """Return the shared async Redis client (same instance as the Celery backend)."""
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.db import build_engine, build_sessionmaker, get_db, session_scope
+from core.logger import get_logger
+from core.settings import settings
+
+logger = get_logger()
+
+# Zero when the replica has replayed everything it received, otherwise the
+# age of the last replayed transaction.
+REPLICATION_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+@dataclass
+class Replica:
+    url: str
+    engine: AsyncEngine = field(repr=False)
+    session_factory: async_sessionmaker[AsyncSession] = field(repr=False)
+    lag_seconds: float | None = None
+    healthy: bool = False
+
+    @property
+    def name(self) -> str:
+        url = make_url(self.url)
+        return f"{url.host}:{url.port or 5432}/{url.database}"
+
+
+class ReplicaRouter:
+    """Pick a read replica for read-only sessions based on replication lag.
+
+    Lag is sampled periodically in the background; sessions are spread
+    round-robin across healthy replicas within ``max_lag_seconds`` and fall
+    back to the primary when none qualify.
+    """
+
+    def __init__(self, urls: list[str], max_lag_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.replicas = []
+        for index, url in enumerate(urls):
+            replica_engine = build_engine(url, name=f"replica-{index}")
+            self.replicas.append(
+                Replica(url=url, engine=replica_engine, session_factory=build_sessionmaker(replica_engine))
+            )
+        self._counter = itertools.count()
+
+    def choose(self) -> Replica | None:
+        eligible = [
+            replica
+            for replica in self.replicas
+            if replica.healthy
+            and replica.lag_seconds is not None
+            and replica.lag_seconds <= self.max_lag_seconds
+        ]
+        if not eligible:
+            return None
+        return eligible[next(self._counter) % len(eligible)]
+
+    async def _measure(self, replica: Replica, timeout: float) -> None:
+        try:
+            async with asyncio.timeout(timeout):
+                async with replica.engine.connect() as conn:
+                    lag = (await conn.execute(REPLICATION_LAG_QUERY)).scalar_one()
+            replica.lag_seconds = float(lag)
+            replica.healthy = True
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(f"Read replica {replica.name} unavailable: {e}")
+            replica.healthy = False
+            replica.lag_seconds = None
+
+    async def refresh(self, timeout: float = 2.0) -> None:
+        await asyncio.gather(*(self._measure(replica, timeout) for replica in self.replicas))
+
+    async def run(self, interval: float) -> None:
+        """Background loop that keeps replica lag up to date."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.refresh()
+
+    def status(self) -> list[dict[str, Any]]:
+        return [
+            {"replica": replica.name, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds}
+            for replica in self.replicas
+        ]
+
+    async def dispose(self) -> None:
+        await asyncio.gather(*(replica.engine.dispose() for replica in self.replicas))
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS, settings.DB_REPLICA_MAX_LAG_SECONDS)
+
+
+@asynccontextmanager
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide a session for read-only work, on a replica when one is fit."""
+    async with AsyncExitStack() as stack:
+        session = None
+        replica = replica_router.choose()
+        if replica is not None:
+            try:
+                session = await stack.enter_async_context(session_scope(replica.session_factory))
+            except Exception as e:
+                replica.healthy = False
+                logger.warning(f"Falling back to primary, replica {replica.name} failed: {e}")
+        if session is None:
+            session = await stack.enter_async_context(get_db())
+        yield session
+
+
+async def get_read_db_dependency() -> AsyncGenerator[AsyncSession, None]:
+    async with get_read_db() as session:
+        yield session
@@ -1,3 +1,4 @@
+import os
 from smtplib import SMTP
 from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -11,8 +12,82 @@ class Settings(BaseSettings):
     PROJECT_DESCRIPTION: str = ""
     API_V1_STR: str = ""
     SITE_NAME: str = ""
+    SECRET_KEY: str = ""
     LOG_DIR: str = ""
+    # sinks run on a background thread fed by a bounded queue; when it is
+    # full, records below WARNING are dropped and the rest wait briefly
+    LOG_ASYNC: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_BLOCK_SECONDS: float = 0.1
+    # write JSON lines to stdout instead of rotating files, e.g. in containers
+    LOG_STDOUT_JSON: bool = False
+    # fraction of requests whose DEBUG/INFO logs are kept once the log queue
+    # is LOG_SAMPLE_QUEUE_THRESHOLD full; warnings and errors are always kept
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_SAMPLE_QUEUE_THRESHOLD: float = 0.5
+    # request headers whose values are never written to logs
+    LOG_REDACTED_HEADERS: list[str] = [
+        "authorization",
+        "cookie",
+        "proxy-authorization",
+        "set-cookie",
+        "x-admin-token",
+        "x-api-key",
+    ]
+    LOG_MAX_HEADER_LENGTH: int = 256
     DATABASE_URL: str = ""
+    DB_SLOW_TRANSACTION_MS: int = 500
+
+    # database connection pool, sized per uvicorn worker from the Postgres
+    # connection budget unless DB_POOL_SIZE / DB_MAX_OVERFLOW are set
+    WEB_CONCURRENCY: int = 1
+    DB_MAX_CONNECTIONS: int = 100
+    DB_RESERVED_CONNECTIONS: int = 10
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_VALIDATION_INTERVAL_SECONDS: int = 60
+    # connections opened at startup, and startup retries with exponential backoff
+    DB_POOL_MIN_CONNECTIONS: int = 1
+    DB_CONNECT_RETRIES: int = 3
+    DB_CONNECT_RETRY_DELAY_SECONDS: float = 0.5
+    # connect through PgBouncer in transaction pooling mode
+    DB_PGBOUNCER_MODE: bool = False
+
+    # Prometheus: Celery workers serve /metrics on this port when non-zero;
+    # prefork workers also need PROMETHEUS_MULTIPROC_DIR to be set
+    CELERY_METRICS_PORT: int = 0
+    CELERY_QUEUE_METRICS_CACHE_SECONDS: float = 15
+
+    # request profiling: admins send X-Profile: 1 with their token, or a
+    # fraction of requests is sampled; reports are kept in Redis
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    PROFILING_MAX_REPORTS: int = 50
+    PROFILING_REPORT_TTL_SECONDS: int = 86400
+
+    # Idempotency-Key handling: completed responses are replayed from Redis
+    # for IDEMPOTENCY_TTL_SECONDS; the in-flight lock must outlive a request
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_METHODS: list[str] = ["POST", "PATCH"]
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    IDEMPOTENCY_MAX_RESPONSE_BYTES: int = 1_048_576
+
+    # read replicas, given as a JSON list of database URLs
+    DATABASE_REPLICA_URLS: list[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS: int = 10
+
+    ADMIN_API_TOKEN: str = ""
+
+    HEALTH_CHECK_INTERVAL_SECONDS: int = 15
+    # time to keep serving after SIGTERM flips /readyz, so load balancers notice;
+    # keep it below the orchestrator's termination grace period
+    SHUTDOWN_DRAIN_SECONDS: float = 0
     MAIL_FROM: str = ""
     MAIL_FROM_NAME: str = ""
     SMTP_HOST: str = "mailpit"
@@ -23,6 +98,10 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
 
+    @property
+    def REDIS_URL(self) -> str:
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
     RABBITMQ_HOST: str = "rabbitmq"
     RABBITMQ_PORT: int = 5672
     RABBITMQ_USER: str = "guest"
@@ -30,9 +109,33 @@ class Settings(BaseSettings):
     
     # login user releated settings
     OTP_EXPIRE_MINUTES: int = 2 if ENVIRONMENT == "development" else 5
+    OTP_ISSUE_LIMIT: int = 3
+    OTP_ISSUE_WINDOW_MINUTES: int = 15
+    OTP_MAX_VERIFY_ATTEMPTS: int = 5
     LOGIN_ATTEMPTS_LIMIT: int = 3
     LOCKOUT_DURATION_MINUTES: int = 2 if ENVIRONMENT == "development" else 5
+    LOGIN_ATTEMPTS_WINDOW_MINUTES: int = 15
     ACTIVATION_EXPIRATION_MINUTES: int = 2 if ENVIRONMENT == "development" else 5
+    USERNAME_POOL_SIZE: int = 100
+
+    # password hashing worker pool
+    PASSWORD_HASH_MAX_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
+    # argon2 parameters, unset values fall back to the argon2-cffi defaults.
+    # Generate once with `python -m auth.calibration` and share across all processes.
+    ARGON2_TIME_COST: int | None = None
+    ARGON2_MEMORY_COST: int | None = None
+    ARGON2_PARALLELISM: int | None = None
+
+    # ledger: transfers submitted together are posted in one transaction
+    LEDGER_TRANSFER_BATCH_MAX_SIZE: int = 500
+    # how often Celery beat folds hot-account balance shards into the main balance
+    LEDGER_SHARD_ROLLUP_SECONDS: float = 60
+    # transaction history pages and statement exports, read from replicas when available
+    LEDGER_HISTORY_PAGE_SIZE: int = 50
+    LEDGER_HISTORY_MAX_PAGE_SIZE: int = 500
+    LEDGER_EXPORT_CHUNK_SIZE: int = 1000
 
 
 settings = Settings()
\ No newline at end of file
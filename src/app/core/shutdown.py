@@ -0,0 +1,78 @@
+import asyncio
+import signal
+from types import FrameType
+from typing import Any, Optional
+
+from core.health import HealthCheck, health_checker
+from core.logger import get_logger
+from core.settings import settings
+
+logger = get_logger()
+
+
+class DrainOnSignal:
+    """Fail readiness on SIGTERM and hold back the server's shutdown.
+
+    uvicorn stops accepting connections as soon as it handles SIGTERM, and
+    only runs lifespan shutdown after that, so draining from the lifespan
+    is too late for a load balancer to notice. Installed from lifespan
+    startup, this handler sits in front of uvicorn's: the first SIGTERM
+    flips ``/readyz`` to draining and passes the signal on after
+    ``drain_seconds``, while the server keeps serving. A second signal is
+    passed on at once.
+    """
+
+    def __init__(
+        self,
+        checker: HealthCheck = health_checker,
+        drain_seconds: float = settings.SHUTDOWN_DRAIN_SECONDS,
+        signum: int = signal.SIGTERM,
+    ):
+        self.checker = checker
+        self.drain_seconds = drain_seconds
+        self.signum = signum
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._previous: Any = None
+        self._signalled = False
+        self._pending: Optional[asyncio.TimerHandle] = None
+
+    def install(self) -> None:
+        """Take over the signal from the running server; call from the event loop."""
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._previous = signal.signal(self.signum, self._handle)
+        except ValueError:
+            # Not on the main thread, e.g. under a test client; nothing to drain for.
+            self._loop = None
+
+    def uninstall(self) -> None:
+        if self._loop is None:
+            return
+        if self._pending is not None:
+            self._pending.cancel()
+        signal.signal(self.signum, self._previous)
+        self._loop = None
+
+    def _handle(self, signum: int, frame: Optional[FrameType]) -> None:
+        # Runs as a signal handler: only set flags and hand over to the loop.
+        if self._signalled or self.drain_seconds <= 0:
+            self.checker.mark_draining()
+            self._forward(signum, frame)
+            return
+        self._signalled = True
+        self.checker.mark_draining()
+        self._loop.call_soon_threadsafe(self._schedule_forward, signum, frame)  # type: ignore[union-attr]
+
+    def _schedule_forward(self, signum: int, frame: Optional[FrameType]) -> None:
+        logger.info(f"Received signal {signum}, draining for {self.drain_seconds}s before shutting down")
+        self._pending = self._loop.call_later(  # type: ignore[union-attr]
+            self.drain_seconds, self._forward, signum, frame
+        )
+
+    def _forward(self, signum: int, frame: Optional[FrameType]) -> None:
+        self._pending = None
+        if callable(self._previous):
+            self._previous(signum, frame)
+        elif self._previous != signal.SIG_IGN:
+            signal.signal(signum, signal.SIG_DFL)
+            signal.raise_signal(signum)
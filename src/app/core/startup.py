@@ -0,0 +1,82 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Iterator, TypeVar
+
+from core.db import prewarm_pool, wait_for_db
+from core.health import health_checker
+from core.logger import get_logger
+from core.model_registry import load_models
+from core.redis import get_redis
+from core.settings import settings
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+
+class StartupTimer:
+    """Record how long each startup phase takes."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T:
+        with self.phase(name):
+            return await awaitable
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 1),
+            "phases_ms": dict(self.phases),
+        }
+
+
+async def _warm_database() -> int:
+    await wait_for_db()
+    return await prewarm_pool(settings.DB_POOL_MIN_CONNECTIONS)
+
+
+async def _warm_redis() -> None:
+    await get_redis().ping()
+
+
+async def _warm_broker() -> None:
+    if not await health_checker.check_broker():
+        raise ConnectionError(f"{settings.RABBITMQ_HOST}:{settings.RABBITMQ_PORT} did not answer")
+
+
+async def warm_up(timer: StartupTimer) -> None:
+    """Load models and connect to the database, Redis and the broker concurrently.
+
+    Only the database is required to start; Redis and broker failures are
+    logged and left to the health checks to report.
+
+    Raises:
+        Exception: If the database cannot be reached after all retries.
+    """
+    with timer.phase("models"):
+        load_models()
+
+    database, redis, broker = await asyncio.gather(
+        timer.timed("database", _warm_database()),
+        timer.timed("redis", _warm_redis()),
+        timer.timed("broker", _warm_broker()),
+        return_exceptions=True,
+    )
+    if isinstance(database, BaseException):
+        logger.critical(f"Database initialization failed: {database}")
+        raise database
+    logger.info(f"Pre-opened {database} pooled database connections")
+    for name, result in (("Redis", redis), ("Broker", broker)):
+        if isinstance(result, BaseException):
+            logger.warning(f"{name} warm-up failed: {result}")
@@ -0,0 +1,149 @@
+"""Tests for the Idempotency-Key middleware."""
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import from core
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError
+
+from core.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def app(store, calls):
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, store=store)
+    release = asyncio.Event()
+    app.state.release = release
+
+    @app.post("/payments")
+    async def create_payment(payload: dict):
+        calls.append(payload)
+        return {"payment": len(calls), **payload}
+
+    @app.post("/slow")
+    async def slow():
+        calls.append("slow")
+        await release.wait()
+        return {"ok": True}
+
+    @app.post("/broken")
+    async def broken():
+        calls.append("broken")
+        raise RuntimeError("boom")
+
+    return app
+
+
+def client_for(app):
+    return AsyncClient(transport=ASGITransport(app=app, raise_app_exceptions=False), base_url="http://test")
+
+
+class TestIdempotencyMiddleware:
+    """Tests for IdempotencyMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_retry_replays_stored_response(self, app, calls):
+        """Test that a repeated key returns the first response without running the route."""
+        async with client_for(app) as client:
+            first = await client.post("/payments", json={"amount": 5}, headers={"Idempotency-Key": "abc"})
+            second = await client.post("/payments", json={"amount": 5}, headers={"Idempotency-Key": "abc"})
+
+        assert len(calls) == 1
+        assert second.status_code == first.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+
+    @pytest.mark.asyncio
+    async def test_requests_without_key_are_not_deduplicated(self, app, calls):
+        """Test that requests without the header run every time."""
+        async with client_for(app) as client:
+            await client.post("/payments", json={"amount": 5})
+            await client.post("/payments", json={"amount": 5})
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_key_reused_with_different_body_conflicts(self, app, calls):
+        """Test that reusing a key for another payload is rejected."""
+        async with client_for(app) as client:
+            await client.post("/payments", json={"amount": 5}, headers={"Idempotency-Key": "abc"})
+            response = await client.post("/payments", json={"amount": 6}, headers={"Idempotency-Key": "abc"})
+
+        assert response.status_code == 409
+        assert response.json()["status"] == "error"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_are_scoped_per_client(self, app, calls):
+        """Test that different credentials do not share idempotency keys."""
+        async with client_for(app) as client:
+            await client.post("/payments", json={"amount": 5}, headers={"Idempotency-Key": "abc", "X-Admin-Token": "a"})
+            await client.post("/payments", json={"amount": 5}, headers={"Idempotency-Key": "abc", "X-Admin-Token": "b"})
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicate_gets_conflict(self, app, calls):
+        """Test that a duplicate arriving mid-request is refused instead of run twice."""
+        async with client_for(app) as client:
+            first = asyncio.create_task(client.post("/slow", headers={"Idempotency-Key": "slow-1"}))
+            while not calls:
+                await asyncio.sleep(0.01)
+            duplicate = await client.post("/slow", headers={"Idempotency-Key": "slow-1"})
+            app.state.release.set()
+            original = await first
+
+        assert duplicate.status_code == 409
+        assert duplicate.headers["retry-after"] == "1"
+        assert original.status_code == 200
+        assert calls == ["slow"]
+
+    @pytest.mark.asyncio
+    async def test_server_errors_release_the_key(self, app, calls):
+        """Test that a 5xx is not stored, so the client can retry."""
+        async with client_for(app) as client:
+            first = await client.post("/broken", headers={"Idempotency-Key": "err"})
+            second = await client.post("/broken", headers={"Idempotency-Key": "err"})
+
+        assert first.status_code == second.status_code == 500
+        assert calls == ["broken", "broken"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_key_rejected(self, app, calls):
+        """Test that malformed keys are refused."""
+        async with client_for(app) as client:
+            response = await client.post("/payments", json={}, headers={"Idempotency-Key": "has space"})
+
+        assert response.status_code == 400
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_fails_open(self, app, store, calls):
+        """Test that requests are still served when Redis is down."""
+        store._redis.set = AsyncMock(side_effect=ConnectionError("down"))
+
+        async with client_for(app) as client:
+            response = await client.post("/payments", json={"amount": 1}, headers={"Idempotency-Key": "abc"})
+
+        assert response.status_code == 200
+        assert len(calls) == 1
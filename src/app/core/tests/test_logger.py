@@ -0,0 +1,100 @@
+"""Tests for the queued logging pipeline."""
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import from core
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from loguru import logger
+
+from core import logger as core_logger
+from core.logger import LogQueueSink, _is_replay, _passes_sampling, log_sampled_var
+
+
+class BlockingEmit:
+    """Emit function that holds the worker until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.records = []
+
+    def __call__(self, record):
+        self.release.wait(5)
+        self.records.append(record["message"])
+
+
+def log_to(sink, emit, *messages, level="INFO"):
+    """Log through ``sink`` while its worker is held, then flush it.
+
+    Returns the sink stats captured before the worker was released.
+    """
+    # Skip records the app's own log queue replays from its worker thread.
+    handler_id = logger.add(sink, format="{message}", level="DEBUG", filter=lambda r: not _is_replay(r))
+    try:
+        for message in messages:
+            logger.log(level, message)
+        return sink.stats()
+    finally:
+        emit.release.set()
+        # loguru calls sink.stop() on removal, which flushes the queue
+        logger.remove(handler_id)
+
+
+class TestLogQueueSink:
+    """Tests for LogQueueSink."""
+
+    def test_records_are_written_by_the_worker(self):
+        """Test that queued records reach the emit function in order."""
+        emit = BlockingEmit()
+        sink = LogQueueSink(emit, max_size=10)
+
+        log_to(sink, emit, "one", "two")
+
+        assert emit.records == ["one", "two"]
+
+    def test_full_queue_drops_and_counts_low_levels(self):
+        """Test that info records are dropped instead of blocking the caller."""
+        emit = BlockingEmit()
+        sink = LogQueueSink(emit, max_size=2)
+
+        # The first record is taken by the worker, two fill the queue.
+        stats = log_to(sink, emit, *(f"message {i}" for i in range(6)))
+
+        assert stats["dropped"] >= 2
+        assert stats["overflows"] == stats["dropped"]
+        assert len(emit.records) + stats["dropped"] == 6
+
+    def test_warnings_wait_before_being_dropped(self):
+        """Test that warnings on a full queue wait and are counted as overflows."""
+        emit = BlockingEmit()
+        sink = LogQueueSink(emit, max_size=1, block_seconds=0.01)
+
+        stats = log_to(sink, emit, "first", "second", "third", level="WARNING")
+
+        assert stats["overflows"] >= 1
+        assert len(emit.records) + stats["dropped"] == 3
+
+
+class TestSampling:
+    """Tests for per-request sampling of DEBUG/INFO records."""
+
+    @pytest.fixture
+    def record(self):
+        return {"level": logger.level("INFO")}
+
+    def test_unsampled_info_kept_while_queue_is_idle(self, record):
+        """Test that sampling only kicks in once the queue is under pressure."""
+        token = log_sampled_var.set(False)
+        try:
+            with patch.object(core_logger, "log_queue", SimpleNamespace(fill_ratio=lambda: 0.0)):
+                assert _passes_sampling(record)
+            with patch.object(core_logger, "log_queue", SimpleNamespace(fill_ratio=lambda: 0.9)):
+                assert not _passes_sampling(record)
+                assert _passes_sampling({"level": logger.level("WARNING")})
+        finally:
+            log_sampled_var.reset(token)
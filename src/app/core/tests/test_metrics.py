@@ -0,0 +1,135 @@
+"""Tests for the Prometheus metrics surface."""
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import from core
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy.pool import QueuePool
+
+from core.celery_app import observe_task_duration, propagate_log_context, start_task_timer
+from core.celery_metrics import CeleryQueueCollector
+from core.db import _instrument_pool, _query_operation
+from core.middleware import MetricsMiddleware
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetricsMiddleware:
+    """Tests for MetricsMiddleware."""
+
+    def test_latency_labelled_by_route_template(self):
+        """Test that path parameters do not create a series per value."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def read_item(item_id: int):
+            return {"id": item_id}
+
+        labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+        before = sample("http_request_duration_seconds_count", **labels)
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+
+        assert sample("http_request_duration_seconds_count", **labels) == before + 2
+        assert sample("http_requests_in_progress", method="GET") == 0
+
+    def test_unmatched_paths_share_one_label(self):
+        """Test that 404s for arbitrary paths are grouped together."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = sample("http_request_duration_seconds_count", **labels)
+
+        TestClient(app).get("/no/such/path")
+
+        assert sample("http_request_duration_seconds_count", **labels) == before + 1
+
+
+class TestDatabaseMetrics:
+    """Tests for the database pool and query instrumentation."""
+
+    def test_query_operation_is_bounded(self):
+        """Test that statements map onto a fixed set of operation labels."""
+        assert _query_operation("  select 1") == "SELECT"
+        assert _query_operation("WITH x AS (SELECT 1) SELECT * FROM x") == "OTHER"
+        assert _query_operation("") == "OTHER"
+
+    def test_pool_gauges_follow_checkouts(self):
+        """Test that pool gauges reflect checked out, idle and overflow connections."""
+        pool = QueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=2)
+        _instrument_pool("test", pool)
+
+        first, second = pool.connect(), pool.connect()
+        assert sample("db_pool_connections", engine="test", state="checked_out") == 2
+        assert sample("db_pool_connections", engine="test", state="overflow") == 1
+
+        first.close()
+        second.close()
+        assert sample("db_pool_connections", engine="test", state="checked_out") == 0
+        assert sample("db_pool_connections", engine="test", state="checked_in") == 1
+        assert sample("db_pool_connections", engine="test", state="overflow") == 0
+
+
+class TestCeleryMetrics:
+    """Tests for Celery task and queue metrics."""
+
+    def test_task_duration_and_queue_wait_are_observed(self):
+        """Test that the publish timestamp header yields a queue wait sample."""
+        headers = {}
+        propagate_log_context(headers=headers)
+        task = SimpleNamespace(name="send_email_task", request=SimpleNamespace(published_at=headers["published_at"]))
+        before = sample("celery_task_duration_seconds_count", task="send_email_task", state="SUCCESS")
+        waits = sample("celery_task_queue_wait_seconds_count", task="send_email_task")
+
+        start_task_timer(task_id="t-1", task=task)
+        observe_task_duration(task_id="t-1", task=task, state="SUCCESS")
+
+        assert sample("celery_task_duration_seconds_count", task="send_email_task", state="SUCCESS") == before + 1
+        assert sample("celery_task_queue_wait_seconds_count", task="send_email_task") == waits + 1
+
+    def test_queue_depth_is_cached(self):
+        """Test that frequent scrapes reuse the last broker lookup."""
+        collector = CeleryQueueCollector(queues=["emails"], cache_seconds=60)
+        with patch.object(collector, "_read_depths", return_value={"emails": 7}) as read:
+            collector.depths()
+            collector.depths()
+
+        assert read.call_count == 1
+        assert collector.registry.get_sample_value("celery_queue_length", {"queue": "emails"}) == 7
+
+    def test_unreachable_broker_reports_no_depth(self):
+        """Test that a broker outage does not break the scrape."""
+        collector = CeleryQueueCollector(queues=["emails"], cache_seconds=0)
+        with patch.object(collector, "_read_depths", side_effect=ConnectionError):
+            assert collector.depths() == {}
+
+
+class TestMetricsRoute:
+    """Tests for the /metrics endpoint."""
+
+    def test_exposes_text_format(self):
+        """Test that the endpoint serves process and queue metrics."""
+        from api.routes import metrics
+
+        app = FastAPI()
+        app.include_router(metrics.metrics_router)
+        with patch.object(metrics._queue_collector, "_read_depths", return_value={"nextgen_queue": 3}):
+            metrics._queue_collector._cached_at = 0.0
+            response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'celery_queue_length{queue="nextgen_queue"} 3.0' in response.text
+        assert "db_query_duration_seconds" in response.text
@@ -0,0 +1,126 @@
+"""Tests for request-scoped log context and its propagation to Celery."""
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import from core
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from loguru import logger
+
+from core.celery_app import bind_task_log_context, propagate_log_context, unbind_task_log_context
+from core.exception_handler import redact_headers
+from core.logger import _is_replay, request_id_var, task_id_var, trace_id_var
+from core.middleware import RequestContextMiddleware, extract_ids
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def records():
+    captured = []
+    handler_id = logger.add(
+        lambda message: captured.append(message.record),
+        filter=lambda r: not _is_replay(r),
+        level="DEBUG",
+    )
+    yield captured
+    logger.remove(handler_id)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/ping")
+    async def ping():
+        logger.info("handling ping")
+        return {"request_id": request_id_var.get()}
+
+    return TestClient(app)
+
+
+class TestExtractIds:
+    """Tests for extract_ids."""
+
+    def test_valid_ids_are_reused(self):
+        """Test that a caller's request id and W3C trace id are kept."""
+        request_id, trace_id = extract_ids({"x-request-id": "abc-12345678", "traceparent": TRACEPARENT})
+
+        assert request_id == "abc-12345678"
+        assert trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    def test_unsafe_request_id_is_replaced(self):
+        """Test that ids which could inject into logs are regenerated."""
+        request_id, trace_id = extract_ids({"x-request-id": "bad id\nforged=1"})
+
+        assert request_id != "bad id\nforged=1"
+        assert len(request_id) == 32
+        assert trace_id == request_id
+
+
+class TestRequestContextMiddleware:
+    """Tests for RequestContextMiddleware."""
+
+    def test_request_id_bound_to_logs_and_echoed(self, client, records):
+        """Test that logs within a request carry its id and the response echoes it."""
+        response = client.get("/ping", headers={"X-Request-ID": "req-12345678", "traceparent": TRACEPARENT})
+
+        assert response.headers["x-request-id"] == "req-12345678"
+        assert response.json() == {"request_id": "req-12345678"}
+        record = next(r for r in records if r["message"] == "handling ping")
+        assert record["extra"]["request_id"] == "req-12345678"
+        assert record["extra"]["trace_id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    def test_context_does_not_leak_after_request(self, client):
+        """Test that the ids are reset once the response is sent."""
+        client.get("/ping")
+
+        assert request_id_var.get() is None
+
+
+class TestCeleryPropagation:
+    """Tests for the Celery publish and prerun signal handlers."""
+
+    def test_publish_adds_request_ids_to_headers(self):
+        """Test that tasks queued during a request carry its ids."""
+        headers = {}
+        tokens = request_id_var.set("req-12345678"), trace_id_var.set("trace-1")
+        try:
+            propagate_log_context(headers=headers)
+        finally:
+            request_id_var.reset(tokens[0])
+            trace_id_var.reset(tokens[1])
+
+        assert headers["request_id"] == "req-12345678"
+        assert headers["trace_id"] == "trace-1"
+
+    def test_worker_binds_and_unbinds_task_context(self, records):
+        """Test that task logs carry the originating request id and the task id."""
+        task = SimpleNamespace(request=SimpleNamespace(request_id="req-12345678", trace_id="trace-1"))
+
+        bind_task_log_context(task_id="task-1", task=task)
+        logger.info("sending email")
+        unbind_task_log_context(task_id="task-1")
+
+        record = next(r for r in records if r["message"] == "sending email")
+        assert record["extra"]["request_id"] == "req-12345678"
+        assert record["extra"]["task_id"] == "task-1"
+        assert task_id_var.get() is None
+
+
+class TestRedactHeaders:
+    """Tests for redact_headers."""
+
+    def test_credentials_are_masked_and_long_values_truncated(self):
+        """Test that secrets never reach the error log verbatim."""
+        headers = redact_headers({"Authorization": "Bearer secret", "Cookie": "session=1", "x-long": "a" * 1000})
+
+        assert headers["Authorization"] == "[REDACTED]"
+        assert headers["Cookie"] == "[REDACTED]"
+        assert len(headers["x-long"]) < 300
@@ -0,0 +1,114 @@
+"""Tests for on-demand request profiling."""
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import from core
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from core.db import build_engine
+from core.profiling import ProfileStore, ProfilingMiddleware
+
+ADMIN_TOKEN = "profiling-admin-token"
+
+
+@pytest.fixture
+def store():
+    return ProfileStore(fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+@pytest.fixture
+def app(store, tmp_path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'profiling.db'}", name="profiling-test")
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, store=store)
+
+    @app.get("/slow")
+    async def slow():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {"ok": True}
+
+    return app
+
+
+async def get(app, headers=None):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get("/slow", headers=headers or {})
+
+
+class TestProfilingMiddleware:
+    """Tests for ProfilingMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_admin_header_captures_profile_with_sql(self, app, store):
+        """Test that an admin-requested profile is stored with its SQL timings."""
+        with patch("core.profiling.settings.ADMIN_API_TOKEN", ADMIN_TOKEN):
+            response = await get(app, {"X-Profile": "1", "X-Admin-Token": ADMIN_TOKEN})
+        await store.wait_for_saves()
+
+        profile_id = response.headers["x-profile-id"]
+        summary = await store.get(profile_id)
+        assert summary["route"] == "/slow"
+        assert summary["status"] == 200
+        assert [q["statement"] for q in summary["queries"]] == ["SELECT 1", "SELECT 2"]
+        assert "<html" in (await store.get_html(profile_id)).lower()
+
+    @pytest.mark.asyncio
+    async def test_profile_header_without_admin_token_is_ignored(self, app, store):
+        """Test that anonymous callers cannot trigger profiling."""
+        with patch("core.profiling.settings.ADMIN_API_TOKEN", ADMIN_TOKEN):
+            response = await get(app, {"X-Profile": "1", "X-Admin-Token": "wrong"})
+
+        assert "x-profile-id" not in response.headers
+        assert await store.recent() == []
+
+    @pytest.mark.asyncio
+    async def test_sampled_requests_are_profiled(self, app, store):
+        """Test that the sample rate profiles requests without any header."""
+        with patch("core.profiling.settings.PROFILING_SAMPLE_RATE", 1.0):
+            await get(app)
+            await get(app)
+        await store.wait_for_saves()
+
+        assert len(await store.recent()) == 2
+
+
+class TestProfileStore:
+    """Tests for ProfileStore."""
+
+    @pytest.mark.asyncio
+    async def test_only_newest_reports_are_kept(self, store):
+        """Test that the index is trimmed to PROFILING_MAX_REPORTS."""
+        with patch("core.profiling.settings.PROFILING_MAX_REPORTS", 2):
+            for profile_id in ("a", "b", "c"):
+                await store.save({"id": profile_id, "queries": []}, "<html></html>")
+
+        assert [summary["id"] for summary in await store.recent()] == ["c", "b"]
+
+    @pytest.mark.asyncio
+    async def test_background_save_renders_off_the_event_loop(self, store):
+        """Test that a slow render neither blocks the loop nor the caller."""
+        rendering = threading.Event()
+
+        def render_html():
+            rendering.wait(timeout=5)
+            return "<html></html>"
+
+        store.save_in_background({"id": "slow", "queries": []}, render_html)
+        await asyncio.sleep(0.05)
+        assert await store.recent() == []
+
+        rendering.set()
+        await store.wait_for_saves()
+        assert [summary["id"] for summary in await store.recent()] == ["slow"]
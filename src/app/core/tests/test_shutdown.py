@@ -0,0 +1,105 @@
+"""Tests for draining on SIGTERM ahead of the server's shutdown."""
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import from core
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import asyncio
+import os
+import signal
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+import pytest_asyncio
+import uvicorn
+from fastapi import FastAPI
+
+from api.routes.health import health_router
+from core.health import HealthCheck, health_checker
+from core.shutdown import DrainOnSignal
+
+
+async def healthy() -> bool:
+    return True
+
+
+@pytest.fixture
+def received_signals():
+    """Stand in for the process's default SIGTERM action, which uvicorn re-raises on exit."""
+    received = []
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+    yield received
+    signal.signal(signal.SIGTERM, previous)
+
+
+@pytest_asyncio.fixture
+async def ready_checker():
+    await health_checker.add_service("database", healthy, retry_delay=0, max_retries=1)
+    await health_checker.run_cycle()
+    yield health_checker
+    await health_checker.cleanup()
+    health_checker.started = False
+    health_checker.draining = False
+
+
+class TestDrainOnSignal:
+    """Tests for DrainOnSignal."""
+
+    @pytest.mark.asyncio
+    async def test_sigterm_drains_before_uvicorn_stops(self, ready_checker, received_signals):
+        """Test that a real uvicorn server keeps answering /readyz with draining after SIGTERM."""
+        @asynccontextmanager
+        async def lifespan(app):
+            ready_checker.mark_started()
+            drain = DrainOnSignal(ready_checker, drain_seconds=0.5)
+            drain.install()
+            yield
+            drain.uninstall()
+
+        app = FastAPI(lifespan=lifespan)
+        app.include_router(health_router)
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", ws="none"))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            assert (await client.get("/readyz")).status_code == 200
+
+            signalled_at = time.monotonic()
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.sleep(0.1)
+
+            response = await client.get("/readyz", headers={"Connection": "close"})
+            assert response.status_code == 503
+            assert response.json()["reason"] == "draining"
+            assert not serving.done()
+
+        await asyncio.wait_for(serving, timeout=5)
+        assert time.monotonic() - signalled_at >= 0.5
+        assert received_signals == [signal.SIGTERM]
+
+    @pytest.mark.asyncio
+    async def test_second_signal_is_passed_on_at_once(self):
+        """Test that a repeated SIGTERM skips the remaining drain time."""
+        forwarded = []
+        previous = signal.signal(signal.SIGTERM, lambda signum, frame: forwarded.append(signum))
+        checker = HealthCheck()
+        drain = DrainOnSignal(checker, drain_seconds=60)
+        drain.install()
+        try:
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.sleep(0)
+            assert checker.draining is True
+            assert forwarded == []
+
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.sleep(0)
+            assert forwarded == [signal.SIGTERM]
+        finally:
+            drain.uninstall()
+            signal.signal(signal.SIGTERM, previous)
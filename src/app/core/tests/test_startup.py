@@ -0,0 +1,121 @@
+"""Tests for the model manifest and startup warm-up."""
+import sys
+from pathlib import Path
+
+# Add the app directory to the path so we can import from core
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from unittest.mock import AsyncMock, patch
+
+import subprocess
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from core import importtime, model_registry, startup
+from core.db import prewarm_pool
+
+
+class TestModelManifest:
+    """Tests for the cached model manifest."""
+
+    def test_committed_manifest_is_current(self):
+        """Test that the checked-in manifest matches a fresh discovery."""
+        assert model_registry.read_manifest() == model_registry.discover_models()
+
+    def test_discovery_skips_excluded_directories(self):
+        """Test that tests and migrations are never reported as model modules."""
+        modules = model_registry.discover_models()
+
+        assert "auth.models" in modules
+        assert not any("tests" in m or "migrations" in m for m in modules)
+
+    def test_write_and_read_round_trip(self, tmp_path):
+        """Test that a regenerated manifest is read back unchanged."""
+        path = tmp_path / "manifest.json"
+
+        modules = model_registry.write_manifest(path)
+
+        assert model_registry.read_manifest(path) == modules
+
+    def test_missing_manifest_reads_as_none(self, tmp_path):
+        """Test that a missing manifest falls back to discovery."""
+        assert model_registry.read_manifest(tmp_path / "missing.json") is None
+
+
+class TestWarmUp:
+    """Tests for the concurrent startup warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_records_each_phase(self):
+        """Test that every warm-up step shows up in the timing report."""
+        timer = startup.StartupTimer()
+        with patch.object(startup, "_warm_database", AsyncMock(return_value=1)), \
+                patch.object(startup, "_warm_redis", AsyncMock()), \
+                patch.object(startup, "_warm_broker", AsyncMock()):
+            await startup.warm_up(timer)
+
+        report = timer.report()
+        assert set(report["phases_ms"]) == {"models", "database", "redis", "broker"}
+        assert report["total_ms"] >= max(report["phases_ms"].values())
+
+    @pytest.mark.asyncio
+    async def test_optional_services_do_not_block_startup(self):
+        """Test that Redis and broker failures are logged, not raised."""
+        with patch.object(startup, "_warm_database", AsyncMock(return_value=1)), \
+                patch.object(startup, "_warm_redis", AsyncMock(side_effect=ConnectionError)), \
+                patch.object(startup, "_warm_broker", AsyncMock(side_effect=ConnectionError)):
+            await startup.warm_up(startup.StartupTimer())
+
+    @pytest.mark.asyncio
+    async def test_database_failure_aborts_startup(self):
+        """Test that an unreachable database fails startup."""
+        with patch.object(startup, "_warm_database", AsyncMock(side_effect=ConnectionError("down"))), \
+                patch.object(startup, "_warm_redis", AsyncMock()), \
+                patch.object(startup, "_warm_broker", AsyncMock()):
+            with pytest.raises(ConnectionError):
+                await startup.warm_up(startup.StartupTimer())
+
+    @pytest.mark.asyncio
+    async def test_prewarm_skipped_without_application_pool(self):
+        """Test that PgBouncer mode opens no connections up front."""
+        engine = create_async_engine("postgresql+asyncpg://u:p@localhost/db", poolclass=NullPool)
+        with patch("core.db._engine", engine):
+            assert await prewarm_pool(5) == 0
+
+
+class TestImportTime:
+    """Tests for the import-time report and lazy heavy imports."""
+
+    def test_parse_importtime_lines(self):
+        """Test that -X importtime output is parsed with nesting depth."""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+            "unrelated line\n"
+        )
+
+        timings = importtime.parse_importtime(output)
+
+        assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+            ("json.decoder", 120, 120, 1),
+            ("json", 300, 420, 0),
+        ]
+
+    def test_worker_imports_skip_mail_templates_and_database(self):
+        """Test that importing the email tasks leaves mail, Jinja and asyncpg unloaded."""
+        code = (
+            "import sys, core.emails.tasks, core.emails.base, core.db; "
+            "print(sorted(m for m in ('fastapi_mail', 'jinja2', 'asyncpg') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=importtime.APP_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
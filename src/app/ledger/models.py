@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, ForeignKey, Index, SmallInteger, event, text
+from sqlalchemy.dialects import postgresql as pg
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+from sqlmodel import Field, Column, SQLModel
+
+from core.domain.data_layers.model_mixins import CreatedAtMixin, TimestampMixin, BaseModelMixin
+from ledger.schema import BaseLedgerAccountSchema
+
+
+class LedgerAccount(BaseLedgerAccountSchema, TimestampMixin, BaseModelMixin, table=True):
+    __tablename__ = "ledger_account"
+
+
+class JournalEntry(CreatedAtMixin, BaseModelMixin, table=True):
+    """A balanced set of postings. Never updated or deleted once written."""
+    __tablename__ = "journal_entry"
+
+    description: str = Field(max_length=255)
+    # Set by clients that may retry; a repeated key returns the original entry.
+    idempotency_key: str | None = Field(default=None, max_length=64, unique=True, index=True)
+
+
+class Posting(CreatedAtMixin, BaseModelMixin, table=True):
+    """One leg of a journal entry, in minor units with debits positive."""
+    __tablename__ = "posting"
+    # Serves keyset pagination of an account's history in either direction.
+    __table_args__ = (Index("ix_posting_account_id_created_at_id", "account_id", "created_at", "id"),)
+
+    entry_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), ForeignKey("journal_entry.id"), nullable=False, index=True)
+    )
+    account_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), ForeignKey("ledger_account.id"), nullable=False)
+    )
+    amount: int = Field(sa_column=Column(BigInteger, nullable=False))
+
+
+class AccountBalance(SQLModel, table=True):
+    """Running balance of one account, kept on the account's normal side.
+
+    Updated in the same transaction as the postings that change it, so a
+    balance read is a primary-key lookup however long the history gets.
+    ``version`` counts the entries applied to the account.
+    """
+    __tablename__ = "account_balance"
+
+    account_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), ForeignKey("ledger_account.id"), primary_key=True)
+    )
+    balance: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0")))
+    version: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0")))
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=False),
+    )
+
+
+class AccountBalanceShard(SQLModel, table=True):
+    """Part of a hot account's balance that has not been rolled up yet.
+
+    Credits to an account with ``balance_shards > 1`` land on one of its
+    shards, picked by hashing the entry id, so concurrent postings lock
+    different rows. Debits always go through ``account_balance``, and
+    shards only grow between roll-ups, so checking a debit against the
+    main balance plus the shards it can see never overdraws the account.
+    """
+    __tablename__ = "account_balance_shard"
+
+    account_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), ForeignKey("ledger_account.id"), primary_key=True)
+    )
+    shard: int = Field(sa_column=Column(SmallInteger, primary_key=True, autoincrement=False))
+    balance: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0")))
+    version: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default=text("0")))
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=False),
+    )
+
+
+APPEND_ONLY_MODELS = (JournalEntry, Posting)
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_ledger_rewrites(session: Session, flush_context, instances) -> None:
+    """Refuse ORM updates and deletes of journal entries and postings.
+
+    Mistakes are corrected with a reversing entry. The migration installs
+    triggers enforcing the same rule for statements that bypass the ORM.
+    """
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, APPEND_ONLY_MODELS) and (
+            instance in session.deleted or session.is_modified(instance)
+        ):
+            raise InvalidRequestError(
+                f"{type(instance).__name__} rows are append-only; post a reversing entry instead."
+            )
@@ -0,0 +1,151 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from pydantic import field_validator, model_validator
+from sqlmodel import SQLModel, Field
+
+from core.domain.exceptions import InvalidJournalEntryException
+from core.settings import settings
+
+
+class AccountTypeSchema(str, Enum):
+    ASSET = "asset"
+    LIABILITY = "liability"
+    EQUITY = "equity"
+    INCOME = "income"
+    EXPENSE = "expense"
+
+    @property
+    def normal_sign(self) -> int:
+        """+1 for debit-normal accounts, -1 for credit-normal ones.
+
+        Postings are signed with debits positive; an account's balance is
+        reported on its normal side, so a funded customer deposit account
+        (a liability) shows a positive balance.
+        """
+        return 1 if self in (AccountTypeSchema.ASSET, AccountTypeSchema.EXPENSE) else -1
+
+
+class BaseLedgerAccountSchema(SQLModel):
+    owner_id: uuid.UUID | None = Field(default=None, foreign_key="user.id", index=True)
+    name: str = Field(max_length=100)
+    currency: str = Field(min_length=3, max_length=3)
+    account_type: AccountTypeSchema
+    allow_negative: bool = False
+    is_active: bool = True
+    # Hot accounts spread credits over this many balance rows.
+    balance_shards: int = Field(default=1, ge=1, le=64)
+
+    @field_validator("currency")
+    def currency_is_iso_code(cls, v):
+        if not v.isalpha():
+            raise ValueError("Currency must be an ISO 4217 code.")
+        return v.upper()
+
+
+class LedgerAccountCreateSchema(BaseLedgerAccountSchema):
+    pass
+
+
+class LedgerAccountReadSchema(BaseLedgerAccountSchema):
+    id: uuid.UUID
+    created_at: datetime
+
+
+class BalanceReadSchema(SQLModel):
+    account_id: uuid.UUID
+    currency: str
+    balance: int
+    version: int
+    updated_at: datetime
+
+
+class PostingCreateSchema(SQLModel):
+    account_id: uuid.UUID
+    # Minor units (cents), debits positive and credits negative.
+    amount: int
+
+    @field_validator("amount")
+    def amount_is_non_zero(cls, v):
+        if v == 0:
+            raise InvalidJournalEntryException("Posting amounts must be non-zero.")
+        return v
+
+
+class PostingReadSchema(SQLModel):
+    id: uuid.UUID
+    account_id: uuid.UUID
+    amount: int
+    created_at: datetime
+
+
+class JournalEntryCreateSchema(SQLModel):
+    description: str = Field(max_length=255)
+    postings: list[PostingCreateSchema]
+
+    @model_validator(mode="after")
+    def postings_balance(self):
+        if len(self.postings) < 2:
+            raise InvalidJournalEntryException("A journal entry needs at least two postings.")
+        if sum(posting.amount for posting in self.postings) != 0:
+            raise InvalidJournalEntryException("Debits and credits must sum to zero.")
+        return self
+
+
+class JournalEntryReadSchema(SQLModel):
+    id: uuid.UUID
+    description: str
+    created_at: datetime
+    postings: list[PostingReadSchema]
+
+
+class TransferStatusSchema(str, Enum):
+    POSTED = "posted"
+    DUPLICATE = "duplicate"
+    REJECTED = "rejected"
+
+
+class TransferCreateSchema(SQLModel):
+    from_account_id: uuid.UUID
+    to_account_id: uuid.UUID
+    # Minor units moved out of from_account into to_account.
+    amount: int = Field(gt=0)
+    description: str = Field(default="Transfer", max_length=255)
+    idempotency_key: str | None = Field(default=None, min_length=1, max_length=64)
+
+    @model_validator(mode="after")
+    def accounts_differ(self):
+        if self.from_account_id == self.to_account_id:
+            raise InvalidJournalEntryException("Cannot transfer to the same account.")
+        return self
+
+
+class TransferBatchCreateSchema(SQLModel):
+    transfers: list[TransferCreateSchema] = Field(min_length=1, max_length=settings.LEDGER_TRANSFER_BATCH_MAX_SIZE)
+
+
+class TransferResultSchema(SQLModel):
+    status: TransferStatusSchema
+    entry_id: uuid.UUID | None = None
+    idempotency_key: str | None = None
+    reason: str | None = None
+
+
+class StatementFormatSchema(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class PostingHistoryItemSchema(SQLModel):
+    id: uuid.UUID
+    entry_id: uuid.UUID
+    description: str
+    amount: int
+    created_at: datetime
+
+
+class PostingHistoryPageSchema(SQLModel):
+    items: list[PostingHistoryItemSchema]
+    # Pass back as ``cursor`` for the next page; None on the last page.
+    next_cursor: str | None = None
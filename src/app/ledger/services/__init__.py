@@ -0,0 +1,4 @@
+from .shards import BalanceShardService, balance_shard_service
+from .posting import LedgerService, ledger_service
+from .transfer import TransferService, transfer_service
+from .history import PostingHistoryService, posting_history_service
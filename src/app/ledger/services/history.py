@@ -0,0 +1,128 @@
+import base64
+import csv
+import io
+import uuid
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import Select, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.domain.exceptions import InvalidCursorException
+from core.settings import settings
+from ledger.models import JournalEntry, LedgerAccount, Posting
+from ledger.schema import PostingHistoryItemSchema, PostingHistoryPageSchema
+
+STATEMENT_COLUMNS = ("created_at", "entry_id", "id", "description", "amount")
+
+
+def encode_cursor(created_at: datetime, posting_id: uuid.UUID) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{posting_id.hex}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        created_at, posting_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(posting_id)
+    except ValueError as e:
+        raise InvalidCursorException() from e
+
+
+class PostingHistoryService:
+    """Page through and export an account's postings without OFFSET.
+
+    Pages are keyset-paginated on ``(created_at, id)``, newest first. The
+    cursor is the last row of the previous page, so every page costs one
+    range scan of ``ix_posting_account_id_created_at_id``, however deep it
+    is. Exports read oldest first in ``LEDGER_EXPORT_CHUNK_SIZE`` batches
+    from a server-side cursor, so memory stays flat however long the
+    history is. Amounts are on the account's normal side: money in is
+    positive for the account holder.
+    """
+
+    @staticmethod
+    def _history(account: LedgerAccount) -> Select:
+        return (
+            select(
+                Posting.id,
+                Posting.entry_id,
+                JournalEntry.description,
+                Posting.amount * account.account_type.normal_sign,
+                Posting.created_at,
+            )
+            .join(JournalEntry, JournalEntry.id == Posting.entry_id)
+            .where(Posting.account_id == account.id)
+        )
+
+    @staticmethod
+    def _item(row) -> PostingHistoryItemSchema:
+        posting_id, entry_id, description, amount, created_at = row
+        return PostingHistoryItemSchema(
+            id=posting_id, entry_id=entry_id, description=description, amount=amount, created_at=created_at
+        )
+
+    async def page(
+        self,
+        session: AsyncSession,
+        account: LedgerAccount,
+        limit: int = settings.LEDGER_HISTORY_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> PostingHistoryPageSchema:
+        statement = (
+            self._history(account)
+            .order_by(Posting.created_at.desc(), Posting.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            created_at, posting_id = decode_cursor(cursor)
+            statement = statement.where(tuple_(Posting.created_at, Posting.id) < tuple_(created_at, posting_id))
+        rows = (await session.exec(statement)).all()
+
+        items = [self._item(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return PostingHistoryPageSchema(items=items, next_cursor=next_cursor)
+
+    async def stream(
+        self,
+        session: AsyncSession,
+        account: LedgerAccount,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        chunk_size: int = settings.LEDGER_EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[list[PostingHistoryItemSchema]]:
+        """Yield the account's postings oldest first, ``chunk_size`` at a time."""
+        statement = self._history(account).order_by(Posting.created_at, Posting.id)
+        if since is not None:
+            statement = statement.where(Posting.created_at >= since)
+        if until is not None:
+            statement = statement.where(Posting.created_at < until)
+        result = await session.stream(statement.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions():
+            yield [self._item(row) for row in rows]
+
+
+async def to_csv(chunks: AsyncIterator[list[PostingHistoryItemSchema]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(STATEMENT_COLUMNS)
+    async for items in chunks:
+        writer.writerows(
+            (item.created_at.isoformat(), item.entry_id, item.id, item.description, item.amount)
+            for item in items
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def to_ndjson(chunks: AsyncIterator[list[PostingHistoryItemSchema]]) -> AsyncIterator[str]:
+    async for items in chunks:
+        yield "".join(f"{item.model_dump_json()}\n" for item in items)
+
+
+posting_history_service = PostingHistoryService()
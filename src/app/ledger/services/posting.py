@@ -0,0 +1,179 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import func, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.domain.exceptions import (
+    InsufficientFundsException,
+    InvalidJournalEntryException,
+    LedgerAccountNotFoundException,
+)
+from core.logger import get_logger
+from ledger.models import AccountBalance, JournalEntry, LedgerAccount, Posting
+from ledger.schema import BalanceReadSchema, JournalEntryCreateSchema, LedgerAccountCreateSchema
+from ledger.services.shards import BalanceShardService, balance_shard_service
+
+logger = get_logger()
+
+
+class LedgerService:
+    """Write balanced journal entries and read materialised balances.
+
+    Postings are only ever inserted. Each account's ``account_balance`` row
+    is moved by the net amount of the entry in the same transaction, with
+    a single ``UPDATE ... RETURNING`` per account, so reading a balance
+    never sums postings.
+
+    Methods flush but do not commit: the caller owns the transaction, so
+    several entries can be posted atomically. Credits to hot accounts go
+    to balance shards instead, see ``BalanceShardService``.
+    """
+
+    def __init__(self, shards: BalanceShardService = balance_shard_service):
+        self.shards = shards
+
+    async def open_account(self, session: AsyncSession, data: LedgerAccountCreateSchema) -> LedgerAccount:
+        """Create an account together with its zero balance row."""
+        account = LedgerAccount.model_validate(data)
+        session.add(account)
+        session.add(AccountBalance(account_id=account.id))
+        self.shards.create_shards(session, account)
+        await session.flush()
+        return account
+
+    async def get_account(self, session: AsyncSession, account_id: uuid.UUID) -> LedgerAccount:
+        account = await session.get(LedgerAccount, account_id)
+        if account is None:
+            raise LedgerAccountNotFoundException()
+        return account
+
+    async def get_balance(self, session: AsyncSession, account_id: uuid.UUID) -> BalanceReadSchema:
+        """Return the account's balance in minor units on its normal side.
+
+        A primary-key lookup, plus at most ``balance_shards`` shard rows for
+        hot accounts.
+        """
+        result = await session.exec(
+            select(LedgerAccount.currency, LedgerAccount.balance_shards, AccountBalance)
+            .join(AccountBalance, AccountBalance.account_id == LedgerAccount.id)
+            .where(LedgerAccount.id == account_id)
+            .execution_options(populate_existing=True)
+        )
+        row = result.first()
+        if row is None:
+            raise LedgerAccountNotFoundException()
+        currency, balance_shards, balance = row
+        pending_balance, pending_entries = 0, 0
+        if balance_shards > 1:
+            pending_balance, pending_entries = (await self.shards.pending(session, [account_id])).get(account_id, (0, 0))
+        return BalanceReadSchema(
+            account_id=account_id,
+            currency=currency,
+            balance=balance.balance + pending_balance,
+            version=balance.version + pending_entries,
+            updated_at=balance.updated_at,
+        )
+
+    async def _load_accounts(
+        self, session: AsyncSession, account_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, LedgerAccount]:
+        result = await session.exec(select(LedgerAccount).where(LedgerAccount.id.in_(account_ids)))
+        accounts = {account.id: account for account in result.all()}
+        if len(accounts) != len(account_ids):
+            raise LedgerAccountNotFoundException()
+        return accounts
+
+    async def post_entry(
+        self, session: AsyncSession, data: JournalEntryCreateSchema
+    ) -> tuple[JournalEntry, list[Posting]]:
+        """Insert a journal entry and its postings, then move the balances.
+
+        Raises:
+            LedgerAccountNotFoundException: A posting targets an unknown account.
+            InvalidJournalEntryException: An account is closed or currencies differ.
+            InsufficientFundsException: An account without ``allow_negative``
+                would go below zero. The caller must roll back.
+        """
+        deltas: dict[uuid.UUID, int] = defaultdict(int)
+        for posting in data.postings:
+            deltas[posting.account_id] += posting.amount
+        # Sorted so concurrent entries and transfers touch balance rows in the same order.
+        account_ids = sorted(deltas)
+        accounts = await self._load_accounts(session, account_ids)
+
+        if any(not account.is_active for account in accounts.values()):
+            raise InvalidJournalEntryException("Postings must target open accounts.")
+        if len({account.currency for account in accounts.values()}) != 1:
+            raise InvalidJournalEntryException("All postings of an entry must share one currency.")
+
+        now = datetime.now(timezone.utc)
+        entry = JournalEntry(description=data.description, created_at=now)
+        postings = [
+            Posting(entry_id=entry.id, account_id=posting.account_id, amount=posting.amount, created_at=now)
+            for posting in data.postings
+        ]
+        session.add(entry)
+        session.add_all(postings)
+        await session.flush()
+
+        for account_id in account_ids:
+            await self._apply_delta(session, accounts[account_id], deltas[account_id], now, shard_key=entry.id)
+        return entry, postings
+
+    async def _apply_delta(
+        self,
+        session: AsyncSession,
+        account: LedgerAccount,
+        delta: int,
+        now: datetime,
+        entries: int = 1,
+        shard_key: uuid.UUID | None = None,
+    ) -> None:
+        """Move an account's balance by the net posting amount of ``entries`` entries.
+
+        ``shard_key`` picks the shard that takes a hot account's credit.
+        """
+        change = delta * account.account_type.normal_sign
+        if change == 0:
+            return
+        if change > 0 and account.balance_shards > 1:
+            await self.shards.credit(session, account, change, shard_key or uuid.uuid4(), now, entries)
+            return
+        result = await session.exec(
+            update(AccountBalance)
+            .where(AccountBalance.account_id == account.id)
+            .values(
+                balance=AccountBalance.balance + change,
+                version=AccountBalance.version + entries,
+                updated_at=now,
+            )
+            .returning(AccountBalance.balance)
+        )
+        balance = result.scalar_one()
+        if balance < 0 and not account.allow_negative and account.balance_shards > 1:
+            balance += (await self.shards.pending(session, [account.id])).get(account.id, (0, 0))[0]
+        if balance < 0 and not account.allow_negative:
+            raise InsufficientFundsException(f"Account {account.id} would be overdrawn by {-balance}.")
+
+    async def audit_balance(self, session: AsyncSession, account_id: uuid.UUID) -> bool:
+        """Compare the stored balance with the sum of the account's postings.
+
+        This is the O(n) query the balance table exists to avoid; it is
+        meant for reconciliation jobs, not request paths.
+        """
+        account = await self.get_account(session, account_id)
+        balance = await self.get_balance(session, account_id)
+        result = await session.exec(
+            select(func.coalesce(func.sum(Posting.amount), 0)).where(Posting.account_id == account_id)
+        )
+        expected = result.one() * account.account_type.normal_sign
+        if expected != balance.balance:
+            logger.error(f"Ledger drift on account {account_id}: stored {balance.balance}, postings {expected}")
+            return False
+        return True
+
+
+ledger_service = LedgerService()
@@ -0,0 +1,142 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.logger import get_logger
+from ledger.models import AccountBalance, AccountBalanceShard, LedgerAccount
+
+logger = get_logger()
+
+
+def shard_for(account: LedgerAccount, key: uuid.UUID) -> int:
+    """Pick the shard of a hot account that a posting keyed by ``key`` lands on."""
+    return key.int % account.balance_shards
+
+
+class BalanceShardService:
+    """Maintain the sub-balances of hot accounts.
+
+    Credits to a sharded account are added to one of its shard rows. They
+    skip the main ``account_balance`` row, which every other posting would
+    otherwise queue on. Reads add the shards to the main balance, which
+    costs ``balance_shards`` rows at most. A roll-up moves the shard totals
+    into the main row so the shard rows stay small; it runs periodically
+    from Celery beat and can be forced for a single account.
+    """
+
+    def create_shards(self, session: AsyncSession, account: LedgerAccount) -> None:
+        if account.balance_shards > 1:
+            session.add_all(
+                AccountBalanceShard(account_id=account.id, shard=shard)
+                for shard in range(account.balance_shards)
+            )
+
+    async def lock(self, session: AsyncSession, account: LedgerAccount, key: uuid.UUID) -> None:
+        """Lock the shard ``key`` hashes to ahead of crediting it."""
+        await session.exec(
+            select(AccountBalanceShard.shard)
+            .where(
+                AccountBalanceShard.account_id == account.id,
+                AccountBalanceShard.shard == shard_for(account, key),
+            )
+            .with_for_update()
+        )
+
+    async def credit(
+        self, session: AsyncSession, account: LedgerAccount, change: int, key: uuid.UUID, now: datetime, entries: int = 1
+    ) -> None:
+        """Add a positive ``change`` to the shard ``key`` hashes to."""
+        await session.exec(
+            update(AccountBalanceShard)
+            .where(
+                AccountBalanceShard.account_id == account.id,
+                AccountBalanceShard.shard == shard_for(account, key),
+            )
+            .values(
+                balance=AccountBalanceShard.balance + change,
+                version=AccountBalanceShard.version + entries,
+                updated_at=now,
+            )
+        )
+
+    async def pending(self, session: AsyncSession, account_ids: list[uuid.UUID]) -> dict[uuid.UUID, tuple[int, int]]:
+        """Return ``(balance, version)`` not yet rolled up, per sharded account."""
+        if not account_ids:
+            return {}
+        result = await session.exec(
+            select(
+                AccountBalanceShard.account_id,
+                func.sum(AccountBalanceShard.balance),
+                func.sum(AccountBalanceShard.version),
+            )
+            .where(AccountBalanceShard.account_id.in_(account_ids))
+            .group_by(AccountBalanceShard.account_id)
+        )
+        return {account_id: (int(balance), int(version)) for account_id, balance, version in result.all()}
+
+    async def roll_up(self, session: AsyncSession, account_id: uuid.UUID) -> int:
+        """Move an account's shard totals into its main balance row.
+
+        The main row is locked before the shards. Postings and transfers
+        that touch both lock the main row first too, so a roll-up cannot
+        deadlock with them. Returns the amount moved.
+        """
+        now = datetime.now(timezone.utc)
+        await session.exec(
+            select(AccountBalance.account_id)
+            .where(AccountBalance.account_id == account_id)
+            .with_for_update()
+        )
+        result = await session.exec(
+            select(AccountBalanceShard)
+            .where(AccountBalanceShard.account_id == account_id, AccountBalanceShard.version > 0)
+            .order_by(AccountBalanceShard.shard)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        shards = result.all()
+        if not shards:
+            return 0
+        moved = sum(shard.balance for shard in shards)
+        entries = sum(shard.version for shard in shards)
+        await session.exec(
+            update(AccountBalanceShard)
+            .where(
+                AccountBalanceShard.account_id == account_id,
+                AccountBalanceShard.shard.in_([shard.shard for shard in shards]),
+            )
+            .values(balance=0, version=0, updated_at=now)
+        )
+        await session.exec(
+            update(AccountBalance)
+            .where(AccountBalance.account_id == account_id)
+            .values(
+                balance=AccountBalance.balance + moved,
+                version=AccountBalance.version + entries,
+                updated_at=now,
+            )
+        )
+        return moved
+
+    async def roll_up_all(self, session: AsyncSession) -> int:
+        """Roll up every sharded account with pending credits, one transaction each.
+
+        Returns the number of accounts rolled up.
+        """
+        result = await session.exec(
+            select(AccountBalanceShard.account_id)
+            .where(AccountBalanceShard.version > 0)
+            .distinct()
+        )
+        account_ids = sorted(result.all())
+        for account_id in account_ids:
+            moved = await self.roll_up(session, account_id)
+            await session.commit()
+            logger.debug(f"Rolled up {moved} into hot account {account_id}")
+        return len(account_ids)
+
+
+balance_shard_service = BalanceShardService()
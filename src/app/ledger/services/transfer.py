@@ -0,0 +1,254 @@
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.domain.exceptions import (
+    IdempotencyKeyConflictException,
+    InsufficientFundsException,
+    InvalidJournalEntryException,
+    LedgerAccountNotFoundException,
+)
+from core.logger import get_logger
+from ledger.models import AccountBalance, JournalEntry, LedgerAccount, Posting
+from ledger.schema import TransferCreateSchema, TransferResultSchema, TransferStatusSchema
+from ledger.services.posting import LedgerService, ledger_service
+
+logger = get_logger()
+
+_TRANSFER_ERRORS = (
+    IdempotencyKeyConflictException,
+    InsufficientFundsException,
+    InvalidJournalEntryException,
+    LedgerAccountNotFoundException,
+)
+
+
+@dataclass
+class TransferOutcome:
+    result: TransferResultSchema
+    error: Exception | None = None
+
+
+def _legs(transfer: TransferCreateSchema) -> frozenset[tuple[uuid.UUID, int]]:
+    """The transfer's balance changes as ``(account_id, amount)`` pairs.
+
+    Amounts are on the accounts' normal side; multiply by the normal sign
+    to get posting amounts.
+    """
+    return frozenset({(transfer.from_account_id, -transfer.amount), (transfer.to_account_id, transfer.amount)})
+
+
+class TransferService:
+    """Post transfers between accounts, singly or many per transaction.
+
+    All balance rows a submission can write are locked up front in account
+    id order, shard rows of hot accounts included, which is the order
+    ``LedgerService.post_entry`` takes them in. Concurrent submissions and
+    entries therefore queue on their first shared row instead of
+    deadlocking. Under the lock each transfer is checked against the
+    running balances in memory. Accepted transfers are inserted together,
+    and every account gets a single balance update for the whole submission.
+
+    Transfers may carry an idempotency key. A repeated key returns the
+    original entry, and a key reused for a different transfer is rejected.
+    Unlike ``LedgerService``, this service commits.
+    """
+
+    def __init__(self, ledger: LedgerService = ledger_service):
+        self.ledger = ledger
+
+    async def transfer(self, session: AsyncSession, data: TransferCreateSchema) -> TransferResultSchema:
+        """Post one transfer, raising the domain exception if it is rejected."""
+        [outcome] = await self._submit(session, [data])
+        if outcome.error is not None:
+            raise outcome.error
+        return outcome.result
+
+    async def transfer_batch(
+        self, session: AsyncSession, transfers: list[TransferCreateSchema]
+    ) -> list[TransferResultSchema]:
+        """Post transfers in one transaction; rejected ones do not affect the rest."""
+        return [outcome.result for outcome in await self._submit(session, transfers)]
+
+    async def _submit(self, session: AsyncSession, transfers: list[TransferCreateSchema]) -> list[TransferOutcome]:
+        try:
+            outcomes = await self._post(session, transfers)
+            await session.commit()
+            return outcomes
+        except IntegrityError:
+            # A concurrent request inserted one of our idempotency keys first;
+            # on the second pass it is found and reported as a duplicate.
+            await session.rollback()
+            logger.info("Idempotency key raced with a concurrent transfer, retrying")
+        outcomes = await self._post(session, transfers)
+        await session.commit()
+        return outcomes
+
+    async def _existing_entries(
+        self, session: AsyncSession, keys: set[str]
+    ) -> dict[str, tuple[uuid.UUID, frozenset[tuple[uuid.UUID, int]]]]:
+        if not keys:
+            return {}
+        result = await session.exec(
+            select(
+                JournalEntry.idempotency_key,
+                Posting.entry_id,
+                Posting.account_id,
+                Posting.amount,
+                LedgerAccount.account_type,
+            )
+            .join(Posting, Posting.entry_id == JournalEntry.id)
+            .join(LedgerAccount, LedgerAccount.id == Posting.account_id)
+            .where(JournalEntry.idempotency_key.in_(keys))
+        )
+        legs: dict[str, tuple[uuid.UUID, set]] = {}
+        for key, entry_id, account_id, amount, account_type in result.all():
+            legs.setdefault(key, (entry_id, set()))[1].add((account_id, amount * account_type.normal_sign))
+        return {key: (entry_id, frozenset(pairs)) for key, (entry_id, pairs) in legs.items()}
+
+    async def _lock_balances(self, session: AsyncSession, account_ids: list[uuid.UUID]) -> dict[uuid.UUID, int]:
+        if not account_ids:
+            return {}
+        result = await session.exec(
+            select(AccountBalance.account_id, AccountBalance.balance)
+            .where(AccountBalance.account_id.in_(account_ids))
+            .order_by(AccountBalance.account_id)
+            .with_for_update()
+        )
+        return dict(result.all())
+
+    async def _lock_accounts(
+        self, session: AsyncSession, transfers: list[TransferCreateSchema]
+    ) -> tuple[dict[uuid.UUID, LedgerAccount], dict[uuid.UUID, int], dict[uuid.UUID, uuid.UUID]]:
+        """Lock every balance row ``transfers`` can write; return accounts, balances and shard keys.
+
+        Rows are locked in account-id order, the order ``LedgerService.post_entry``
+        writes them in, and an account's main row before its shard, as in a
+        roll-up. A hot account's main row is only locked if it is debited;
+        if it is credited, the shard that takes the credit is picked here and
+        locked in the same pass. A hot balance includes the shards, which can
+        only grow while its main row is locked.
+        """
+        debited = {t.from_account_id for t in transfers}
+        credited = {t.to_account_id for t in transfers}
+        if not debited:
+            return {}, {}, {}
+        result = await session.exec(
+            select(LedgerAccount, AccountBalance.balance)
+            .join(AccountBalance, AccountBalance.account_id == LedgerAccount.id)
+            .where(LedgerAccount.id.in_(debited | credited))
+            .execution_options(populate_existing=True)
+        )
+        accounts: dict[uuid.UUID, LedgerAccount] = {}
+        balances: dict[uuid.UUID, int] = {}
+        for account, balance in result.all():
+            accounts[account.id] = account
+            balances[account.id] = balance
+        hot = [account_id for account_id, account in accounts.items() if account.balance_shards > 1]
+        shard_keys = {account_id: uuid.uuid4() for account_id in hot if account_id in credited}
+
+        main_rows: list[uuid.UUID] = []
+        for account_id in sorted(accounts):
+            if account_id not in shard_keys or account_id in debited:
+                main_rows.append(account_id)
+            if account_id in shard_keys:
+                balances.update(await self._lock_balances(session, main_rows))
+                main_rows = []
+                await self.ledger.shards.lock(session, accounts[account_id], shard_keys[account_id])
+        balances.update(await self._lock_balances(session, main_rows))
+
+        pending = await self.ledger.shards.pending(session, hot)
+        for account_id in hot:
+            balances[account_id] += pending.get(account_id, (0, 0))[0]
+        return accounts, balances, shard_keys
+
+    async def _post(self, session: AsyncSession, transfers: list[TransferCreateSchema]) -> list[TransferOutcome]:
+        seen = await self._existing_entries(
+            session, {t.idempotency_key for t in transfers if t.idempotency_key}
+        )
+        locked, balances, shard_keys = await self._lock_accounts(
+            session, [t for t in transfers if t.idempotency_key not in seen]
+        )
+        deltas: dict[uuid.UUID, int] = defaultdict(int)
+        entry_counts: dict[uuid.UUID, int] = defaultdict(int)
+        now = datetime.now(timezone.utc)
+        outcomes = []
+
+        for transfer in transfers:
+            key = transfer.idempotency_key
+            try:
+                if key in seen:
+                    entry_id, legs = seen[key]
+                    if legs != _legs(transfer):
+                        raise IdempotencyKeyConflictException()
+                    outcomes.append(TransferOutcome(TransferResultSchema(
+                        status=TransferStatusSchema.DUPLICATE, entry_id=entry_id, idempotency_key=key,
+                    )))
+                    continue
+
+                source, target = self._check(transfer, locked, balances)
+                sign = source.account_type.normal_sign
+                balances[source.id] -= transfer.amount
+                balances[target.id] += transfer.amount
+                entry = JournalEntry(description=transfer.description, idempotency_key=key, created_at=now)
+                postings = [
+                    Posting(entry_id=entry.id, account_id=account_id, amount=amount * sign, created_at=now)
+                    for account_id, amount in _legs(transfer)
+                ]
+                for posting in postings:
+                    deltas[posting.account_id] += posting.amount
+                    entry_counts[posting.account_id] += 1
+                session.add(entry)
+                session.add_all(postings)
+                if key:
+                    seen[key] = (entry.id, _legs(transfer))
+                outcomes.append(TransferOutcome(TransferResultSchema(
+                    status=TransferStatusSchema.POSTED, entry_id=entry.id, idempotency_key=key,
+                )))
+            except _TRANSFER_ERRORS as e:
+                outcomes.append(TransferOutcome(
+                    TransferResultSchema(status=TransferStatusSchema.REJECTED, idempotency_key=key, reason=str(e)),
+                    error=e,
+                ))
+
+        await session.flush()
+        for account_id in sorted(deltas):
+            await self.ledger._apply_delta(
+                session,
+                locked[account_id],
+                deltas[account_id],
+                now,
+                entries=entry_counts[account_id],
+                shard_key=shard_keys.get(account_id),
+            )
+        return outcomes
+
+    @staticmethod
+    def _check(
+        transfer: TransferCreateSchema,
+        locked: dict[uuid.UUID, LedgerAccount],
+        balances: dict[uuid.UUID, int],
+    ) -> tuple[LedgerAccount, LedgerAccount]:
+        if transfer.from_account_id not in locked or transfer.to_account_id not in locked:
+            raise LedgerAccountNotFoundException()
+        source = locked[transfer.from_account_id]
+        target = locked[transfer.to_account_id]
+        if not (source.is_active and target.is_active):
+            raise InvalidJournalEntryException("Transfers must be between open accounts.")
+        if source.currency != target.currency:
+            raise InvalidJournalEntryException("Transfers must be between accounts in one currency.")
+        if source.account_type.normal_sign != target.account_type.normal_sign:
+            raise InvalidJournalEntryException(
+                "Transfers need accounts with the same normal balance; post a journal entry instead."
+            )
+        if balances[source.id] < transfer.amount and not source.allow_negative:
+            raise InsufficientFundsException(f"Account {source.id} has insufficient funds.")
+        return source, target
+
+
+transfer_service = TransferService()
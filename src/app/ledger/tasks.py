@@ -0,0 +1,27 @@
+import asyncio
+
+from core.celery_app import celery_app
+from core.db import get_db
+from core.logger import get_logger
+from ledger.services import balance_shard_service
+
+logger = get_logger()
+
+
+async def roll_up_balance_shards() -> int:
+    async with get_db() as session:
+        return await balance_shard_service.roll_up_all(session)
+
+
+@celery_app.task(name="roll_up_balance_shards_task", soft_time_limit=50)
+def roll_up_balance_shards_task() -> int:
+    """Fold the balance shards of hot ledger accounts into their main balances.
+
+    Returns:
+        int: Number of accounts rolled up.
+    """
+    loop = asyncio.get_event_loop()
+    rolled_up = loop.run_until_complete(roll_up_balance_shards())
+    if rolled_up:
+        logger.info(f"Rolled up balance shards of {rolled_up} ledger accounts")
+    return rolled_up
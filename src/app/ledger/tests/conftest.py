@@ -0,0 +1,66 @@
+"""Pytest configuration and shared fixtures for ledger tests."""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from ledger
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import auth.models  # noqa: F401  (ledger accounts reference the user table)
+from ledger.schema import AccountTypeSchema, LedgerAccountCreateSchema
+from ledger.services import ledger_service
+
+
+@pytest_asyncio.fixture(name="engine")
+async def engine_fixture():
+    """Create an in-memory SQLite engine for testing."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(name="session")
+async def session_fixture(engine):
+    """Create an async database session for testing."""
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def open_account(session):
+    """Factory fixture to open committed ledger accounts."""
+    async def _open_account(**kwargs):
+        data = {
+            "name": "Customer deposits",
+            "currency": "KES",
+            "account_type": AccountTypeSchema.LIABILITY,
+        }
+        data.update(kwargs)
+        account = await ledger_service.open_account(session, LedgerAccountCreateSchema(**data))
+        await session.commit()
+        return account
+
+    return _open_account
+
+
+@pytest_asyncio.fixture
+async def cash_account(open_account):
+    """Fixture providing a bank cash (asset) account."""
+    return await open_account(name="Cash", account_type=AccountTypeSchema.ASSET)
+
+
+@pytest_asyncio.fixture
+async def customer_account(open_account):
+    """Fixture providing a customer deposit (liability) account."""
+    return await open_account()
@@ -0,0 +1,120 @@
+"""Tests for posting history pagination and statement export."""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from ledger
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import csv
+import io
+import json
+
+import pytest
+import pytest_asyncio
+
+from core.domain.exceptions import InvalidCursorException
+from ledger.schema import AccountTypeSchema, JournalEntryCreateSchema, PostingCreateSchema
+from ledger.services import ledger_service, posting_history_service
+from ledger.services.history import to_csv, to_ndjson
+
+
+@pytest_asyncio.fixture
+async def history(session, open_account):
+    """Fixture providing a customer account with 25 deposits of 1..25."""
+    cash = await open_account(name="Cash", account_type=AccountTypeSchema.ASSET)
+    customer = await open_account(name="Customer")
+    for amount in range(1, 26):
+        await ledger_service.post_entry(session, JournalEntryCreateSchema(
+            description=f"Deposit {amount}",
+            postings=[
+                PostingCreateSchema(account_id=cash.id, amount=amount),
+                PostingCreateSchema(account_id=customer.id, amount=-amount),
+            ],
+        ))
+    await session.commit()
+    return customer
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestPagination:
+    """Tests for PostingHistoryService.page."""
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_history_newest_first(self, session, history):
+        """Test that following cursors visits every posting once, newest first."""
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await posting_history_service.page(session, history, limit=10, cursor=cursor)
+            seen.extend(item.amount for item in page.items)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert seen == list(range(25, 0, -1))
+
+    @pytest.mark.asyncio
+    async def test_amounts_are_on_the_accounts_normal_side(self, session, history):
+        """Test that deposits to a liability account read as positive."""
+        page = await posting_history_service.page(session, history, limit=1)
+
+        assert page.items[0].amount == 25
+        assert page.items[0].description == "Deposit 25"
+
+    @pytest.mark.asyncio
+    async def test_exact_final_page_has_no_cursor(self, session, history):
+        """Test that a page ending on the last posting does not offer another."""
+        page = await posting_history_service.page(session, history, limit=25)
+
+        assert len(page.items) == 25
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self, session, history):
+        """Test that a tampered cursor raises InvalidCursorException."""
+        with pytest.raises(InvalidCursorException):
+            await posting_history_service.page(session, history, cursor="not-a-cursor")
+
+
+class TestStatementExport:
+    """Tests for streaming statement exports."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_chunks_oldest_first(self, session, history):
+        """Test that the export reads in chunks of the requested size."""
+        chunks = await collect(posting_history_service.stream(session, history, chunk_size=10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert [item.amount for chunk in chunks for item in chunk] == list(range(1, 26))
+
+    @pytest.mark.asyncio
+    async def test_csv_export(self, session, history):
+        """Test that the CSV export has a header and one row per posting."""
+        body = "".join(await collect(to_csv(posting_history_service.stream(session, history, chunk_size=7))))
+        rows = list(csv.DictReader(io.StringIO(body)))
+
+        assert len(rows) == 25
+        assert rows[0]["description"] == "Deposit 1"
+        assert rows[-1]["amount"] == "25"
+
+    @pytest.mark.asyncio
+    async def test_ndjson_export(self, session, history):
+        """Test that the NDJSON export has one JSON object per line."""
+        body = "".join(await collect(to_ndjson(posting_history_service.stream(session, history))))
+        lines = [json.loads(line) for line in body.splitlines()]
+
+        assert len(lines) == 25
+        assert lines[0]["amount"] == 1
+
+    @pytest.mark.asyncio
+    async def test_csv_export_of_empty_history_has_header(self, session, open_account):
+        """Test that an account without postings exports just the header."""
+        account = await open_account(name="Empty")
+
+        body = "".join(await collect(to_csv(posting_history_service.stream(session, account))))
+
+        assert body.strip() == "created_at,entry_id,id,description,amount"
@@ -0,0 +1,179 @@
+"""Tests for the ledger API routes."""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from ledger
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from api.routes.ledger import ledger_router
+from core.db import get_db_dependency
+from core.exception_handler import register_exception_handlers
+from core.replicas import get_read_db_dependency
+
+ADMIN_TOKEN = "ledger-admin-token"
+
+
+@pytest_asyncio.fixture
+async def client(session):
+    app = FastAPI()
+    app.include_router(ledger_router)
+    register_exception_handlers(app)
+
+    async def override_db():
+        yield session
+
+    @asynccontextmanager
+    async def read_db():
+        yield session
+
+    app.dependency_overrides[get_db_dependency] = override_db
+    app.dependency_overrides[get_read_db_dependency] = override_db
+    with patch("api.deps.settings.ADMIN_API_TOKEN", ADMIN_TOKEN), patch("api.routes.ledger.get_read_db", read_db):
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+            headers={"X-Admin-Token": ADMIN_TOKEN},
+        ) as client:
+            yield client
+
+
+async def open_account(client, **kwargs):
+    data = {"name": "Deposits", "currency": "kes", "account_type": "liability", **kwargs}
+    response = await client.post("/ledger/accounts", json=data)
+    assert response.status_code == 201
+    return response.json()
+
+
+class TestLedgerRoutes:
+    """Tests for /ledger routes."""
+
+    @pytest.mark.asyncio
+    async def test_requires_admin_token(self, client):
+        """Test that the ledger rejects requests without the admin token."""
+        response = await client.get("/ledger/accounts/00000000-0000-0000-0000-000000000000", headers={"X-Admin-Token": ""})
+
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_post_entry_and_read_balance(self, client):
+        """Test that a posted entry is reflected in the balance endpoint."""
+        cash = await open_account(client, name="Cash", account_type="asset")
+        deposits = await open_account(client)
+        assert deposits["currency"] == "KES"
+
+        response = await client.post("/ledger/entries", json={
+            "description": "Cash deposit",
+            "postings": [
+                {"account_id": cash["id"], "amount": 2_500},
+                {"account_id": deposits["id"], "amount": -2_500},
+            ],
+        })
+        assert response.status_code == 201
+        assert len(response.json()["postings"]) == 2
+
+        balance = (await client.get(f"/ledger/accounts/{deposits['id']}/balance")).json()
+        assert balance["balance"] == 2_500
+        assert balance["currency"] == "KES"
+
+    @pytest.mark.asyncio
+    async def test_overdraft_returns_error_body(self, client):
+        """Test that an overdraft maps to the standard error response."""
+        cash = await open_account(client, name="Cash", account_type="asset")
+        deposits = await open_account(client)
+
+        response = await client.post("/ledger/entries", json={
+            "description": "Withdrawal",
+            "postings": [
+                {"account_id": deposits["id"], "amount": 100},
+                {"account_id": cash["id"], "amount": -100},
+            ],
+        })
+
+        assert response.status_code == 422
+        assert response.json()["status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_unknown_account_returns_404(self, client):
+        """Test that reading a missing account returns 404."""
+        response = await client.get("/ledger/accounts/00000000-0000-0000-0000-000000000000/balance")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_transfer_batch_reports_each_result(self, client):
+        """Test that the batch endpoint returns a result per transfer."""
+        cash = await open_account(client, name="Cash", account_type="asset")
+        alice = await open_account(client, name="Alice")
+        bob = await open_account(client, name="Bob")
+        await client.post("/ledger/entries", json={
+            "description": "Opening deposit",
+            "postings": [
+                {"account_id": cash["id"], "amount": 100},
+                {"account_id": alice["id"], "amount": -100},
+            ],
+        })
+
+        response = await client.post("/ledger/transfers/batch", json={"transfers": [
+            {"from_account_id": alice["id"], "to_account_id": bob["id"], "amount": 60},
+            {"from_account_id": alice["id"], "to_account_id": bob["id"], "amount": 60},
+        ]})
+
+        assert response.status_code == 200
+        assert [r["status"] for r in response.json()] == ["posted", "rejected"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_transfer_returns_200(self, client):
+        """Test that replaying a transfer's idempotency key returns 200 with the same entry."""
+        alice = await open_account(client, name="Alice", allow_negative=True)
+        bob = await open_account(client, name="Bob")
+        data = {"from_account_id": alice["id"], "to_account_id": bob["id"], "amount": 5, "idempotency_key": "k-1"}
+
+        first = await client.post("/ledger/transfers", json=data)
+        second = await client.post("/ledger/transfers", json=data)
+
+        assert first.status_code == 201
+        assert second.status_code == 200
+        assert second.json()["entry_id"] == first.json()["entry_id"]
+
+    @pytest.mark.asyncio
+    async def test_history_pages_and_statement(self, client):
+        """Test that history is paged by cursor and the statement streams as CSV."""
+        cash = await open_account(client, name="Cash", account_type="asset")
+        deposits = await open_account(client)
+        for amount in (10, 20, 30):
+            await client.post("/ledger/entries", json={
+                "description": f"Deposit {amount}",
+                "postings": [
+                    {"account_id": cash["id"], "amount": amount},
+                    {"account_id": deposits["id"], "amount": -amount},
+                ],
+            })
+
+        first = (await client.get(f"/ledger/accounts/{deposits['id']}/postings", params={"limit": 2})).json()
+        second = (await client.get(
+            f"/ledger/accounts/{deposits['id']}/postings",
+            params={"limit": 2, "cursor": first["next_cursor"]},
+        )).json()
+        statement = await client.get(f"/ledger/accounts/{deposits['id']}/statement")
+
+        assert [item["amount"] for item in first["items"] + second["items"]] == [30, 20, 10]
+        assert second["next_cursor"] is None
+        assert statement.headers["content-type"].startswith("text/csv")
+        assert len(statement.text.splitlines()) == 4
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_returns_400(self, client):
+        """Test that a bad cursor maps to the standard error response."""
+        deposits = await open_account(client)
+
+        response = await client.get(f"/ledger/accounts/{deposits['id']}/postings", params={"cursor": "bogus"})
+
+        assert response.status_code == 400
@@ -0,0 +1,159 @@
+"""Tests for the ledger posting service."""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from ledger
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import uuid
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlmodel import select
+
+from core.domain.exceptions import (
+    InsufficientFundsException,
+    InvalidJournalEntryException,
+    LedgerAccountNotFoundException,
+)
+from ledger.models import Posting
+from ledger.schema import JournalEntryCreateSchema, PostingCreateSchema
+from ledger.services import ledger_service
+
+
+def transfer(debit, credit, amount, description="Transfer"):
+    return JournalEntryCreateSchema(
+        description=description,
+        postings=[
+            PostingCreateSchema(account_id=debit.id, amount=amount),
+            PostingCreateSchema(account_id=credit.id, amount=-amount),
+        ],
+    )
+
+
+class TestEntrySchema:
+    """Tests for journal entry validation."""
+
+    def test_unbalanced_entry_rejected(self):
+        """Test that postings which do not sum to zero are rejected."""
+        with pytest.raises(InvalidJournalEntryException):
+            JournalEntryCreateSchema(
+                description="Bad",
+                postings=[
+                    PostingCreateSchema(account_id=uuid.uuid4(), amount=100),
+                    PostingCreateSchema(account_id=uuid.uuid4(), amount=-99),
+                ],
+            )
+
+    def test_single_posting_rejected(self):
+        """Test that an entry needs at least two postings."""
+        with pytest.raises(InvalidJournalEntryException):
+            JournalEntryCreateSchema(
+                description="Bad",
+                postings=[PostingCreateSchema(account_id=uuid.uuid4(), amount=1)],
+            )
+
+    def test_zero_amount_rejected(self):
+        """Test that zero-amount postings are rejected."""
+        with pytest.raises(InvalidJournalEntryException):
+            PostingCreateSchema(account_id=uuid.uuid4(), amount=0)
+
+
+class TestLedgerService:
+    """Tests for LedgerService."""
+
+    @pytest.mark.asyncio
+    async def test_open_account_starts_at_zero(self, session, customer_account):
+        """Test that opening an account creates a zero balance row."""
+        balance = await ledger_service.get_balance(session, customer_account.id)
+
+        assert balance.balance == 0
+        assert balance.version == 0
+
+    @pytest.mark.asyncio
+    async def test_deposit_moves_both_balances(self, session, cash_account, customer_account):
+        """Test that a deposit raises both the cash asset and the customer liability."""
+        await ledger_service.post_entry(session, transfer(cash_account, customer_account, 5_000))
+        await session.commit()
+
+        cash = await ledger_service.get_balance(session, cash_account.id)
+        customer = await ledger_service.get_balance(session, customer_account.id)
+        assert cash.balance == 5_000
+        assert customer.balance == 5_000
+        assert customer.version == 1
+
+    @pytest.mark.asyncio
+    async def test_overdraft_rejected(self, session, cash_account, customer_account):
+        """Test that withdrawing more than the balance raises and can be rolled back."""
+        customer_id = customer_account.id
+        await ledger_service.post_entry(session, transfer(cash_account, customer_account, 1_000))
+        await session.commit()
+
+        with pytest.raises(InsufficientFundsException):
+            await ledger_service.post_entry(session, transfer(customer_account, cash_account, 1_500))
+        await session.rollback()
+
+        customer = await ledger_service.get_balance(session, customer_id)
+        assert customer.balance == 1_000
+        postings = (await session.exec(select(Posting))).all()
+        assert len(postings) == 2
+
+    @pytest.mark.asyncio
+    async def test_allow_negative_account_can_go_below_zero(self, session, open_account, customer_account):
+        """Test that accounts flagged allow_negative are not limited by their balance."""
+        settlement = await open_account(name="Settlement", allow_negative=True)
+
+        await ledger_service.post_entry(session, transfer(settlement, customer_account, 700))
+        await session.commit()
+
+        assert (await ledger_service.get_balance(session, settlement.id)).balance == -700
+
+    @pytest.mark.asyncio
+    async def test_unknown_account_rejected(self, session, cash_account):
+        """Test that posting to a missing account raises not found."""
+        missing = type("Missing", (), {"id": uuid.uuid4()})()
+
+        with pytest.raises(LedgerAccountNotFoundException):
+            await ledger_service.post_entry(session, transfer(cash_account, missing, 100))
+
+    @pytest.mark.asyncio
+    async def test_mixed_currencies_rejected(self, session, cash_account, open_account):
+        """Test that an entry cannot span currencies."""
+        dollars = await open_account(name="USD deposits", currency="usd")
+
+        with pytest.raises(InvalidJournalEntryException):
+            await ledger_service.post_entry(session, transfer(cash_account, dollars, 100))
+
+    @pytest.mark.asyncio
+    async def test_closed_account_rejected(self, session, cash_account, open_account):
+        """Test that postings to inactive accounts are rejected."""
+        closed = await open_account(name="Closed", is_active=False)
+
+        with pytest.raises(InvalidJournalEntryException):
+            await ledger_service.post_entry(session, transfer(cash_account, closed, 100))
+
+    @pytest.mark.asyncio
+    async def test_audit_matches_postings(self, session, cash_account, customer_account):
+        """Test that the stored balance agrees with the sum of postings."""
+        for amount in (100, 250, 75):
+            await ledger_service.post_entry(session, transfer(cash_account, customer_account, amount))
+        await ledger_service.post_entry(session, transfer(customer_account, cash_account, 50))
+        await session.commit()
+
+        assert await ledger_service.audit_balance(session, customer_account.id)
+        assert (await ledger_service.get_balance(session, customer_account.id)).balance == 375
+
+    @pytest.mark.asyncio
+    async def test_postings_are_append_only(self, session, cash_account, customer_account):
+        """Test that the ORM refuses to update or delete postings."""
+        _, postings = await ledger_service.post_entry(session, transfer(cash_account, customer_account, 100))
+        await session.commit()
+
+        postings[0].amount = 1
+        with pytest.raises(InvalidRequestError):
+            await session.flush()
+        await session.rollback()
+
+        await session.delete(postings[1])
+        with pytest.raises(InvalidRequestError):
+            await session.flush()
@@ -0,0 +1,171 @@
+"""Tests for hot-account balance shards."""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from ledger
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlmodel import select
+
+from core.domain.exceptions import InsufficientFundsException
+from ledger.models import AccountBalance, AccountBalanceShard
+from ledger.schema import AccountTypeSchema, JournalEntryCreateSchema, PostingCreateSchema, TransferCreateSchema
+from ledger.services import balance_shard_service, ledger_service, transfer_service
+from ledger.services.shards import shard_for
+
+
+def entry(debit, credit, amount):
+    return JournalEntryCreateSchema(
+        description="Fee",
+        postings=[
+            PostingCreateSchema(account_id=debit.id, amount=amount),
+            PostingCreateSchema(account_id=credit.id, amount=-amount),
+        ],
+    )
+
+
+async def shard_rows(session, account):
+    result = await session.exec(
+        select(AccountBalanceShard)
+        .where(AccountBalanceShard.account_id == account.id)
+        .order_by(AccountBalanceShard.shard)
+        .execution_options(populate_existing=True)
+    )
+    return result.all()
+
+
+@pytest_asyncio.fixture
+async def fees(open_account):
+    """Fixture providing a hot fee income account with four shards."""
+    return await open_account(name="Fee income", account_type=AccountTypeSchema.INCOME, balance_shards=4)
+
+
+@pytest_asyncio.fixture
+async def payer(open_account):
+    """Fixture providing an expense account that pays fees."""
+    return await open_account(name="Fees paid", account_type=AccountTypeSchema.EXPENSE)
+
+
+class TestShardSelection:
+    """Tests for shard_for."""
+
+    def test_shard_is_stable_and_in_range(self, fees):
+        """Test that a key always maps to the same shard within range."""
+        key = uuid.uuid4()
+
+        assert shard_for(fees, key) == shard_for(fees, key)
+        assert {shard_for(fees, uuid.uuid4()) for _ in range(200)} == {0, 1, 2, 3}
+
+
+class TestShardedBalances:
+    """Tests for postings to sharded accounts."""
+
+    @pytest.mark.asyncio
+    async def test_open_account_creates_shards(self, session, fees):
+        """Test that a hot account gets one row per shard."""
+        assert [row.shard for row in await shard_rows(session, fees)] == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_credits_land_on_shards_not_main_row(self, session, fees, payer):
+        """Test that credits to a hot account leave its main row untouched."""
+        for _ in range(12):
+            await ledger_service.post_entry(session, entry(payer, fees, 10))
+        await session.commit()
+
+        main = await session.get(AccountBalance, fees.id, populate_existing=True)
+        shards = await shard_rows(session, fees)
+        assert main.balance == 0
+        assert sum(row.balance for row in shards) == 120
+        assert sum(row.version for row in shards) == 12
+
+    @pytest.mark.asyncio
+    async def test_balance_read_includes_shards(self, session, fees, payer):
+        """Test that reading a hot account's balance adds its shards."""
+        for _ in range(5):
+            await ledger_service.post_entry(session, entry(payer, fees, 10))
+        await session.commit()
+
+        balance = await ledger_service.get_balance(session, fees.id)
+        assert balance.balance == 50
+        assert balance.version == 5
+        assert await ledger_service.audit_balance(session, fees.id)
+
+    @pytest.mark.asyncio
+    async def test_roll_up_moves_shards_into_main_row(self, session, fees, payer):
+        """Test that a roll-up empties the shards without changing the balance."""
+        for _ in range(6):
+            await ledger_service.post_entry(session, entry(payer, fees, 25))
+        await session.commit()
+
+        rolled_up = await balance_shard_service.roll_up_all(session)
+
+        assert rolled_up == 1
+        main = await session.get(AccountBalance, fees.id, populate_existing=True)
+        assert main.balance == 150
+        assert main.version == 6
+        assert all(row.balance == 0 and row.version == 0 for row in await shard_rows(session, fees))
+        assert (await ledger_service.get_balance(session, fees.id)).balance == 150
+        assert await balance_shard_service.roll_up_all(session) == 0
+
+    @pytest.mark.asyncio
+    async def test_debit_checks_main_row_plus_shards(self, session, fees, payer):
+        """Test that a hot account can spend shard credits but not overdraw."""
+        await ledger_service.post_entry(session, entry(payer, fees, 100))
+        await session.commit()
+
+        await ledger_service.post_entry(session, entry(fees, payer, 60))
+        await session.commit()
+        assert (await ledger_service.get_balance(session, fees.id)).balance == 40
+
+        with pytest.raises(InsufficientFundsException):
+            await ledger_service.post_entry(session, entry(fees, payer, 41))
+
+    @pytest.mark.asyncio
+    async def test_transfers_into_hot_account(self, session, open_account):
+        """Test that batched transfers into a hot account are credited to a shard."""
+        settlement = await open_account(name="Settlement", balance_shards=8, allow_negative=True)
+        customer = await open_account(name="Customer", allow_negative=True)
+
+        await transfer_service.transfer_batch(session, [
+            TransferCreateSchema(from_account_id=customer.id, to_account_id=settlement.id, amount=5)
+            for _ in range(10)
+        ])
+
+        main = await session.get(AccountBalance, settlement.id, populate_existing=True)
+        assert main.balance == 0
+        assert (await ledger_service.get_balance(session, settlement.id)).balance == 50
+
+    @pytest.mark.asyncio
+    async def test_transfers_lock_shards_in_account_order(self, session, open_account):
+        """Test that transfers lock the shard they credit in account-id order with the main rows."""
+        settlement = await open_account(name="Settlement", balance_shards=8, allow_negative=True)
+        customers = [await open_account(name=f"Customer {i}", allow_negative=True) for i in range(4)]
+        locked, shard_keys = [], []
+        lock_balances, lock_shard = transfer_service._lock_balances, balance_shard_service.lock
+
+        async def record_balances(session, account_ids):
+            locked.extend(account_ids)
+            return await lock_balances(session, account_ids)
+
+        async def record_shard(session, account, key):
+            locked.append(account.id)
+            shard_keys.append(key)
+            await lock_shard(session, account, key)
+
+        with (
+            patch.object(transfer_service, "_lock_balances", record_balances),
+            patch.object(balance_shard_service, "lock", record_shard),
+            patch.object(balance_shard_service, "credit", wraps=balance_shard_service.credit) as credit,
+        ):
+            await transfer_service.transfer_batch(session, [
+                TransferCreateSchema(from_account_id=customer.id, to_account_id=settlement.id, amount=5)
+                for customer in customers
+            ])
+
+        assert locked == sorted(account.id for account in [settlement, *customers])
+        assert credit.call_args.args[3] == shard_keys[0]
@@ -0,0 +1,204 @@
+"""Tests for the ledger transfer service."""
+import sys
+from pathlib import Path
+
+# Add the parent directory to the path so we can import from ledger
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlmodel import func, select
+
+from core.domain.exceptions import (
+    IdempotencyKeyConflictException,
+    InsufficientFundsException,
+    InvalidJournalEntryException,
+)
+from ledger.models import JournalEntry
+from ledger.schema import (
+    AccountTypeSchema,
+    JournalEntryCreateSchema,
+    PostingCreateSchema,
+    TransferCreateSchema,
+    TransferStatusSchema,
+)
+from ledger.services import ledger_service, transfer_service
+
+
+@pytest_asyncio.fixture
+async def funded(session, open_account):
+    """Fixture providing two customer accounts, the first holding 1,000."""
+    cash = await open_account(name="Cash", account_type=AccountTypeSchema.ASSET)
+    alice = await open_account(name="Alice")
+    bob = await open_account(name="Bob")
+    await ledger_service.post_entry(session, JournalEntryCreateSchema(
+        description="Opening deposit",
+        postings=[
+            PostingCreateSchema(account_id=cash.id, amount=1_000),
+            PostingCreateSchema(account_id=alice.id, amount=-1_000),
+        ],
+    ))
+    await session.commit()
+    return alice, bob
+
+
+async def balance_of(session, account):
+    return (await ledger_service.get_balance(session, account.id)).balance
+
+
+class TestTransfer:
+    """Tests for TransferService.transfer."""
+
+    @pytest.mark.asyncio
+    async def test_transfer_moves_funds(self, session, funded):
+        """Test that a transfer debits the source and credits the target."""
+        alice, bob = funded
+
+        result = await transfer_service.transfer(
+            session, TransferCreateSchema(from_account_id=alice.id, to_account_id=bob.id, amount=400)
+        )
+
+        assert result.status == TransferStatusSchema.POSTED
+        assert await balance_of(session, alice) == 600
+        assert await balance_of(session, bob) == 400
+        assert await ledger_service.audit_balance(session, bob.id)
+
+    @pytest.mark.asyncio
+    async def test_insufficient_funds_raises(self, session, funded):
+        """Test that overdrawing transfers raise and write nothing."""
+        alice, bob = funded
+
+        with pytest.raises(InsufficientFundsException):
+            await transfer_service.transfer(
+                session, TransferCreateSchema(from_account_id=bob.id, to_account_id=alice.id, amount=1)
+            )
+
+        assert await balance_of(session, bob) == 0
+
+    @pytest.mark.asyncio
+    async def test_same_account_rejected(self, funded):
+        """Test that a transfer to the source account is invalid."""
+        alice, _ = funded
+
+        with pytest.raises(InvalidJournalEntryException):
+            TransferCreateSchema(from_account_id=alice.id, to_account_id=alice.id, amount=1)
+
+    @pytest.mark.asyncio
+    async def test_mixed_normal_sides_rejected(self, session, funded, open_account):
+        """Test that transfers between asset and liability accounts are refused."""
+        alice, _ = funded
+        fees = await open_account(name="Fees receivable", account_type=AccountTypeSchema.ASSET)
+
+        with pytest.raises(InvalidJournalEntryException):
+            await transfer_service.transfer(
+                session, TransferCreateSchema(from_account_id=alice.id, to_account_id=fees.id, amount=1)
+            )
+
+
+class TestIdempotency:
+    """Tests for transfer idempotency keys."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_key_returns_original_entry(self, session, funded):
+        """Test that a retried transfer is not applied twice."""
+        alice, bob = funded
+        data = TransferCreateSchema(from_account_id=alice.id, to_account_id=bob.id, amount=100, idempotency_key="t-1")
+
+        first = await transfer_service.transfer(session, data)
+        second = await transfer_service.transfer(session, data)
+
+        assert second.status == TransferStatusSchema.DUPLICATE
+        assert second.entry_id == first.entry_id
+        assert await balance_of(session, bob) == 100
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_other_transfer_conflicts(self, session, funded):
+        """Test that a key cannot be reused with different parameters."""
+        alice, bob = funded
+        await transfer_service.transfer(session, TransferCreateSchema(
+            from_account_id=alice.id, to_account_id=bob.id, amount=100, idempotency_key="t-1",
+        ))
+
+        with pytest.raises(IdempotencyKeyConflictException):
+            await transfer_service.transfer(session, TransferCreateSchema(
+                from_account_id=alice.id, to_account_id=bob.id, amount=200, idempotency_key="t-1",
+            ))
+
+    @pytest.mark.asyncio
+    async def test_concurrent_insert_of_key_is_reported_as_duplicate(self, session, funded):
+        """Test that losing the unique-key race retries and returns the winner's entry."""
+        alice, bob = funded
+        bob_id = bob.id
+        data = TransferCreateSchema(from_account_id=alice.id, to_account_id=bob.id, amount=100, idempotency_key="t-1")
+        winner = await transfer_service.transfer(session, data)
+        real_lookup = transfer_service._existing_entries
+        calls = []
+
+        async def miss_first_lookup(session, keys):
+            calls.append(keys)
+            return {} if len(calls) == 1 else await real_lookup(session, keys)
+
+        with patch.object(transfer_service, "_existing_entries", miss_first_lookup):
+            result = await transfer_service.transfer(session, data)
+
+        assert len(calls) == 2
+        assert result.status == TransferStatusSchema.DUPLICATE
+        assert result.entry_id == winner.entry_id
+        assert (await ledger_service.get_balance(session, bob_id)).balance == 100
+
+
+class TestTransferBatch:
+    """Tests for TransferService.transfer_batch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_applies_running_balances(self, session, funded):
+        """Test that each transfer in a batch sees the effect of earlier ones."""
+        alice, bob = funded
+
+        results = await transfer_service.transfer_batch(session, [
+            TransferCreateSchema(from_account_id=alice.id, to_account_id=bob.id, amount=700),
+            TransferCreateSchema(from_account_id=alice.id, to_account_id=bob.id, amount=700),
+            TransferCreateSchema(from_account_id=bob.id, to_account_id=alice.id, amount=200),
+        ])
+
+        assert [r.status for r in results] == [
+            TransferStatusSchema.POSTED,
+            TransferStatusSchema.REJECTED,
+            TransferStatusSchema.POSTED,
+        ]
+        assert "insufficient" in results[1].reason
+        assert await balance_of(session, alice) == 500
+        assert await balance_of(session, bob) == 500
+        assert await ledger_service.audit_balance(session, alice.id)
+
+    @pytest.mark.asyncio
+    async def test_batch_updates_each_balance_once(self, session, funded):
+        """Test that a batch issues one balance update per account."""
+        alice, bob = funded
+        transfers = [
+            TransferCreateSchema(from_account_id=alice.id, to_account_id=bob.id, amount=10, idempotency_key=f"b-{i}")
+            for i in range(20)
+        ]
+
+        with patch.object(ledger_service, "_apply_delta", wraps=ledger_service._apply_delta) as apply_delta:
+            await transfer_service.transfer_batch(session, transfers)
+
+        assert apply_delta.call_count == 2
+        bob_balance = await ledger_service.get_balance(session, bob.id)
+        assert bob_balance.balance == 200
+        assert bob_balance.version == 20
+        entries = (await session.exec(select(func.count()).select_from(JournalEntry))).one()
+        assert entries == 21
+
+    @pytest.mark.asyncio
+    async def test_duplicate_key_within_batch_posts_once(self, session, funded):
+        """Test that a key repeated inside one batch is applied once."""
+        alice, bob = funded
+        data = TransferCreateSchema(from_account_id=alice.id, to_account_id=bob.id, amount=50, idempotency_key="dup")
+
+        results = await transfer_service.transfer_batch(session, [data, data])
+
+        assert [r.status for r in results] == [TransferStatusSchema.POSTED, TransferStatusSchema.DUPLICATE]
+        assert await balance_of(session, bob) == 50
@@ -1,17 +1,67 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-from core.db import init_db
+from auth.utils import password_hashing_pool
+from core.db import dispose_engine, run_pool_validation
+from core.health import health_checker, register_services
+from core.redis import close_redis
+from core.replicas import replica_router
 from core.settings import settings
+from core.shutdown import DrainOnSignal
+from core.startup import StartupTimer, warm_up
 from core.exception_handler import register_exception_handlers
+from core.logger import get_logger
+from core.metrics import mark_process_dead
+from core.middleware import MetricsMiddleware, RequestContextMiddleware
+from core.idempotency import IdempotencyMiddleware
+from core.profiling import ProfilingMiddleware
 from api.main import api_router
+from api.routes.health import health_router
+from api.routes.metrics import metrics_router
+
+logger = get_logger()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """ Lifespan context manager for FastAPI application. """
-    await init_db()
+    timer = StartupTimer()
+    await warm_up(timer)
+    pool_validation = None
+    if not settings.DB_POOL_PRE_PING and settings.DB_POOL_VALIDATION_INTERVAL_SECONDS > 0:
+        pool_validation = asyncio.create_task(
+            run_pool_validation(settings.DB_POOL_VALIDATION_INTERVAL_SECONDS)
+        )
+    replica_monitor = None
+    if replica_router.replicas:
+        await replica_router.refresh()
+        replica_monitor = asyncio.create_task(
+            replica_router.run(settings.DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+        )
+    with timer.phase("health_checks"):
+        await register_services(health_checker)
+        health_checker.start(settings.HEALTH_CHECK_INTERVAL_SECONDS)
+    app.state.startup_report = timer.report()
+    logger.info(f"Startup completed: {app.state.startup_report}")
+    health_checker.mark_started()
+    # Draining has to start before uvicorn closes its sockets, so it is
+    # driven by SIGTERM rather than by lifespan shutdown.
+    drain = DrainOnSignal(health_checker, settings.SHUTDOWN_DRAIN_SECONDS)
+    drain.install()
     yield
+    drain.uninstall()
+    health_checker.mark_draining()
+    await health_checker.cleanup()
+    if pool_validation is not None:
+        pool_validation.cancel()
+    if replica_monitor is not None:
+        replica_monitor.cancel()
+        await replica_router.dispose()
+    password_hashing_pool.shutdown(wait=False)
+    await close_redis()
+    await dispose_engine()
+    mark_process_dead()
 
 def create_app() -> FastAPI:
     """ Create and configure the FastAPI application. """
@@ -24,7 +74,15 @@ def create_app() -> FastAPI:
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
     )
     register_exception_handlers(app)
+    if settings.IDEMPOTENCY_ENABLED:
+        app.add_middleware(IdempotencyMiddleware)
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(RequestContextMiddleware)
 
+    app.include_router(health_router)
+    app.include_router(metrics_router)
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
     return app
@@ -10,7 +10,7 @@ from sqlmodel import SQLModel
 from core.settings import settings
 from core.model_registry import load_models
 
-load_models()
+load_models(use_manifest=False)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
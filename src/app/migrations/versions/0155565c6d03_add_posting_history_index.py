@@ -0,0 +1,38 @@
+"""add_posting_history_index
+
+Revision ID: 0155565c6d03
+Revises: f2c25f59714e
+Create Date: 2026-10-17 15:21:48.730116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0155565c6d03'
+down_revision: Union[str, Sequence[str], None] = 'f2c25f59714e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so posting writes are not blocked on a large table.
+    # The new index leads with account_id, which makes the old one redundant.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posting_account_id_created_at_id',
+            'posting',
+            ['account_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(op.f('ix_posting_account_id'), table_name='posting', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_posting_account_id'), 'posting', ['account_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_posting_account_id_created_at_id', table_name='posting', postgresql_concurrently=True)